@@ -0,0 +1,235 @@
+"""
+Rank uncovered code by production hotness: join a sampled CPU profile from a load run with a
+Cobertura report, so testing effort goes to code that actually carries load.
+
+Profile inputs:
+- speedscope JSON (e.g. `dotnet-trace convert --format speedscope` of a trace captured during a
+  locust run); sampled and evented profiles are supported. Frames are matched to coverage methods
+  by name (module prefix, parameters, async state machines and lambdas are normalized), or by
+  file/line when the frames carry them.
+- CSV with a header of either `file,line,hits` or `method,hits`.
+
+Each uncovered line is weighted by the inclusive share of samples of its method (or by its own
+line hits for file/line input); methods are ranked by the summed weight of their uncovered lines.
+
+Usage:
+    python scripts/coverage_hotspots.py coverage.cobertura.xml --profile locust.speedscope.json
+    python scripts/coverage_hotspots.py coverage.cobertura.xml --profile hits.csv --include "*BobCrm.Api*" --top 30
+"""
+import xml.etree.ElementTree as ET
+import argparse
+import csv
+import json
+import os
+import re
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from parse_coverage import DEFAULT_EXCLUDE, DEFAULT_INCLUDE, _ranges, is_included, normalize_path  # noqa: E402
+
+_ASYNC_RE = re.compile(r"<([^>]+)>d__\d+")
+_LAMBDA_RE = re.compile(r"<([^>]+)>b__[\w]+")
+
+
+def method_key(type_name, method):
+    """
+    Normalize (type, method) from coverage or a profiler frame to (outer type, logical method):
+    Svc/<QueryAsync>d__12 + MoveNext -> (Svc, QueryAsync); Svc+<>c + <Load>b__3_0 -> (Svc, Load).
+    """
+    type_name = (type_name or "").replace("+", "/")
+    outer, _, nested = type_name.partition("/")
+    async_match = _ASYNC_RE.search(nested) if nested else None
+    if async_match and method in ("MoveNext", ""):
+        method = async_match.group(1)
+    lambda_match = _LAMBDA_RE.search(method or "")
+    if lambda_match:
+        method = lambda_match.group(1)
+    return outer, (method or "").split("(", 1)[0]
+
+
+def split_frame_name(name):
+    """'BobCrm.Api!BobCrm.Api.Services.Svc+<Q>d__3.MoveNext(...)' -> (type, method)"""
+    name = name.split("!", 1)[-1].split("(", 1)[0].strip()
+    # The method follows the last '.' outside <...> (compiler-generated async/lambda names).
+    depth = 0
+    for i in range(len(name) - 1, -1, -1):
+        ch = name[i]
+        if ch == ">":
+            depth += 1
+        elif ch == "<":
+            depth -= 1
+        elif ch == "." and depth == 0:
+            return name[:i], name[i + 1:]
+    return "", name
+
+
+def iter_coverage_methods(file_path):
+    """Stream (filename, class name, method name, {line: hits}) for every <method> of a Cobertura report."""
+    stack = []
+    cls = None
+    for event, elem in ET.iterparse(file_path, events=("start", "end")):
+        if event == "start":
+            stack.append(elem)
+            if elem.tag == "class":
+                cls = (elem.get("filename"), elem.get("name"))
+            continue
+        stack.pop()
+        if elem.tag == "method" and cls is not None:
+            hits = {}
+            for line in elem.iter("line"):
+                number = int(line.get("number", 0))
+                hits[number] = max(hits.get(number, 0), int(line.get("hits", 0)))
+            yield cls[0], cls[1], elem.get("name"), hits
+            elem.clear()
+        elif elem.tag in ("class", "package"):
+            elem.clear()
+            if stack:
+                stack[-1].remove(elem)
+
+
+def load_speedscope(path):
+    """Inclusive weight per (type, method) and per (file, line) from a speedscope export."""
+    with open(path, encoding="utf-8") as f:
+        doc = json.load(f)
+    frames = doc.get("shared", {}).get("frames", [])
+    by_method, by_line = {}, {}
+    total = 0.0
+
+    def _credit(indices, weight):
+        seen_methods, seen_lines = set(), set()
+        for idx in indices:
+            frame = frames[idx]
+            key = method_key(*split_frame_name(frame.get("name", "")))
+            if key not in seen_methods:
+                seen_methods.add(key)
+                by_method[key] = by_method.get(key, 0.0) + weight
+            if frame.get("file") and frame.get("line"):
+                lkey = (normalize_path(frame["file"]), int(frame["line"]))
+                if lkey not in seen_lines:
+                    seen_lines.add(lkey)
+                    by_line[lkey] = by_line.get(lkey, 0.0) + weight
+
+    for profile in doc.get("profiles", []):
+        if profile.get("type") == "sampled":
+            weights = profile.get("weights") or [1] * len(profile.get("samples", []))
+            for stack, weight in zip(profile.get("samples", []), weights):
+                _credit(stack, float(weight))
+                total += float(weight)
+        elif profile.get("type") == "evented":
+            # Inclusive time: the open stack is credited for each interval between events.
+            open_stack, last_at = [], None
+            for event in profile.get("events", []):
+                at = float(event["at"])
+                if last_at is not None and open_stack:
+                    _credit(open_stack, at - last_at)
+                    total += at - last_at
+                last_at = at
+                if event["type"] == "O":
+                    open_stack.append(event["frame"])
+                elif event["type"] == "C" and open_stack:
+                    if event["frame"] in open_stack:
+                        open_stack.remove(event["frame"])
+                    else:
+                        open_stack.pop()
+    return by_method, by_line, total
+
+
+def load_csv(path):
+    by_method, by_line = {}, {}
+    with open(path, encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f):
+            hits = float(row.get("hits") or 0)
+            if row.get("file"):
+                key = (normalize_path(row["file"]), int(row["line"]))
+                by_line[key] = by_line.get(key, 0.0) + hits
+            elif row.get("method"):
+                key = method_key(*split_frame_name(row["method"]))
+                by_method[key] = by_method.get(key, 0.0) + hits
+    total = max(sum(by_method.values()), sum(by_line.values()), 1.0)
+    return by_method, by_line, total
+
+
+def _line_weight(by_line, filename, number):
+    weight = by_line.get((filename, number))
+    if weight is not None:
+        return weight
+    # Profiles usually carry build-machine paths: match on the path suffix.
+    for (path, line), w in by_line.items():
+        if line == number and (filename.endswith("/" + path.lstrip("/")) or path.endswith("/" + filename.lstrip("/"))):
+            return w
+    return 0.0
+
+
+def rank(coverage_path, by_method, by_line, total, include, exclude):
+    methods = {}
+    for filename, class_name, method, hits in iter_coverage_methods(coverage_path):
+        if not filename:
+            continue
+        filename = normalize_path(filename)
+        if not is_included(filename, include, exclude):
+            continue
+        key = method_key(class_name, method)
+        entry = methods.setdefault(key, {"file": filename, "type": key[0], "method": key[1], "hits": {}})
+        for number, h in hits.items():
+            entry["hits"][number] = max(entry["hits"].get(number, 0), h)
+
+    rows = []
+    for key, entry in methods.items():
+        uncovered = [n for n, h in entry["hits"].items() if h == 0]
+        if not uncovered:
+            continue
+        method_share = by_method.get(key, 0.0) / total if total else 0.0
+        if by_line:
+            line_share = sum(_line_weight(by_line, entry["file"], n) for n in uncovered) / total
+        else:
+            line_share = 0.0
+        score = method_share * len(uncovered) + line_share
+        if score <= 0:
+            continue
+        rows.append({
+            "file": entry["file"],
+            "method": f"{entry['type'].rsplit('.', 1)[-1]}.{entry['method']}",
+            "hot_pct": method_share * 100,
+            "uncovered": len(uncovered),
+            "lines": len(entry["hits"]),
+            "uncovered_ranges": _ranges(uncovered),
+            "score": score,
+        })
+    return sorted(rows, key=lambda r: r["score"], reverse=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rank uncovered code by runtime hotness")
+    parser.add_argument("coverage", help="Cobertura report")
+    parser.add_argument("--profile", required=True, help="speedscope JSON or CSV (file,line,hits | method,hits)")
+    parser.add_argument("--include", action="append", help=f"filename glob to include (default {DEFAULT_INCLUDE})")
+    parser.add_argument("--exclude", action="append", help=f"filename glob to exclude (default {DEFAULT_EXCLUDE})")
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--json", help="write the full ranking to this path")
+    args = parser.parse_args(argv)
+
+    if args.profile.lower().endswith(".csv"):
+        by_method, by_line, total = load_csv(args.profile)
+    else:
+        by_method, by_line, total = load_speedscope(args.profile)
+    rows = rank(args.coverage, by_method, by_line, total,
+                args.include or DEFAULT_INCLUDE, args.exclude or DEFAULT_EXCLUDE)
+
+    print(f"{'Method':<48} | {'Hot %':<7} | {'Uncovered':<9} | {'Score':<8} | Lines")
+    print("-" * 100)
+    for r in rows[:args.top]:
+        label = r["method"] if len(r["method"]) <= 48 else "..." + r["method"][-45:]
+        print(f"{label:<48} | {r['hot_pct']:<7.2f} | {r['uncovered']:<9} | {r['score']:<8.3f} | {r['uncovered_ranges']}")
+    if not rows:
+        print("No uncovered code on the profiled hot path")
+
+    if args.json:
+        os.makedirs(os.path.dirname(args.json) or ".", exist_ok=True)
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(rows, f, ensure_ascii=False, indent=2)
+        print(f"Ranking written: {args.json}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
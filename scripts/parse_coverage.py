@@ -1,71 +1,559 @@
-
 import xml.etree.ElementTree as ET
+import argparse
+import fnmatch
+import glob
+import hashlib
+import json
+import sqlite3
+import subprocess
 import sys
 import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
 
-def parse_cobertura(file_path):
+_CONDITION_RE = re.compile(r"\((\d+)/(\d+)\)")
+_HUNK_RE = re.compile(r"^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@")
+
+DEFAULT_INCLUDE = ["*"]
+DEFAULT_EXCLUDE = ["*Tests*"]
+DEFAULT_CACHE = os.path.join("coverage-results", "parse_coverage_cache.sqlite")
+# Bump when the filename keys parse_report produces change, so cached reports are parsed again.
+KEY_LAYOUT = 2
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB (None when the platform offers no cheap way)."""
     try:
-        tree = ET.parse(file_path)
-        root = tree.getroot()
-    except Exception as e:
-        print(f"Error parsing XML: {e}")
-        return
+        import resource
 
-    # Calculate overall coverage
-    total_lines = 0
-    covered_lines = 0
-    
-    file_stats = []
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports KB, macOS bytes.
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    except ImportError:
+        pass
+    try:
+        import psutil  # optional, Windows
 
-    packages = root.find('packages')
-    if packages is None:
-        return
+        info = psutil.Process().memory_info()
+        return getattr(info, "peak_wset", info.rss) / (1024 * 1024)
+    except Exception:
+        return None
+
+
+def iter_classes(file_path):
+    """
+    Stream <class> elements of a Cobertura report with iterparse and yield per-class data:
+    {"filename", "sources", "package", "name", "hits": {line: hits}, "branches": {line: (covered, total)}}.
+    "sources" lists the report's <source> roots that filename is relative to.
+
+    Only the class-level <lines> are counted (method-level <lines> repeat them). Each class is
+    cleared and detached once aggregated, so memory stays bounded regardless of report size.
+    """
+    stack = []
+    sources = []
+    package = None
+    current = None
+
+    for event, elem in ET.iterparse(file_path, events=("start", "end")):
+        if event == "start":
+            stack.append(elem)
+            if elem.tag == "package":
+                package = elem.get("name")
+            elif elem.tag == "class":
+                current = {
+                    "filename": elem.get("filename"),
+                    "sources": sources,
+                    "package": package,
+                    "name": elem.get("name"),
+                    "hits": {},
+                    "branches": {},
+                }
+            continue
+
+        stack.pop()
+        tag = elem.tag
+        if tag == "source":
+            if (elem.text or "").strip():
+                sources.append(elem.text.strip())
+            elem.clear()
+        elif tag == "line":
+            # class > lines > line (skip class > methods > method > lines > line)
+            if current is not None and len(stack) >= 2 and stack[-2].tag == "class":
+                number = int(elem.get("number", 0))
+                current["hits"][number] = max(current["hits"].get(number, 0), int(elem.get("hits", 0)))
+                if (elem.get("branch") or "").lower() == "true":
+                    match = _CONDITION_RE.search(elem.get("condition-coverage") or "")
+                    if match:
+                        current["branches"][number] = (int(match.group(1)), int(match.group(2)))
+            elem.clear()
+        elif tag == "class":
+            if current is not None:
+                yield current
+            current = None
+            elem.clear()
+            if stack:
+                stack[-1].remove(elem)
+        elif tag in ("method", "package"):
+            elem.clear()
+            if stack:
+                stack[-1].remove(elem)
+
+
+def normalize_path(filename):
+    return filename.replace("\\", "/")
+
+
+def _path_parts(path):
+    """Normalized path components without the drive letter: C:\\a\\b\\ -> ["a", "b"]"""
+    return [p for p in normalize_path(path).split("/") if p and not (len(p) == 2 and p[1] == ":")]
+
+
+def _repo_suffix(path, root, exists):
+    """Longest trailing part of a path from the machine that ran the tests that exists under root."""
+    parts = _path_parts(path)
+    for i in range(len(parts)):
+        if exists(os.path.join(root, *parts[i:])):
+            return "/".join(parts[i:])
+    return None
+
+
+def source_prefix(source, root="."):
+    """
+    Repo-relative prefix for a report <source> root (C:\\ci\\bobcrm\\src\\BobCrm.Api\\ ->
+    "src/BobCrm.Api/"); its last directory name when not found under root, which still keeps
+    projects apart.
+    """
+    suffix = _repo_suffix(source, root, os.path.isdir)
+    if suffix is None:
+        parts = _path_parts(source)
+        suffix = parts[-1] if parts else ""
+    return suffix + "/" if suffix else ""
+
+
+def resolve_filename(filename, sources, prefixes, root="."):
+    """
+    Key of a report filename: source root + relative path (src/BobCrm.Api/Program.cs), so files with
+    the same project-relative path in different projects stay apart. With several roots the first
+    one under which the file exists wins. prefixes caches source_prefix per source.
+    """
+    filename = normalize_path(filename)
+    if os.path.isabs(filename) or re.match(r"^[A-Za-z]:/", filename):
+        # Without a common root coverlet writes absolute paths.
+        return _repo_suffix(filename, root, os.path.isfile) or filename
+    if not sources:
+        return filename
+    keys = []
+    for source in sources:
+        if source not in prefixes:
+            prefixes[source] = source_prefix(source, root)
+        keys.append(prefixes[source] + filename)
+    return next((k for k in keys if os.path.isfile(os.path.join(root, k))), keys[0])
+
+
+def is_included(filename, include, exclude):
+    return any(fnmatch.fnmatch(filename, p) for p in include) and not any(fnmatch.fnmatch(filename, p) for p in exclude)
+
+
+def namespace_of(class_name):
+    """BobCrm.Api.Services.DynamicEntityService/<Query>d__3 -> BobCrm.Api.Services"""
+    name = (class_name or "").split("/", 1)[0]
+    return name.rsplit(".", 1)[0] if "." in name else "(global)"
+
+
+def parse_report(file_path, include=None, exclude=None):
+    """
+    Parse one report into per-file line data (runs in a worker process):
+    {filename: {"project", "namespace", "hits": {line: hits}, "branches": {line: (covered, total)}}}
+    filename is resolved against the report's <source> roots relative to the working directory
+    (the repo root), e.g. src/BobCrm.Api/Program.cs.
+    """
+    include = DEFAULT_INCLUDE if include is None else include
+    exclude = DEFAULT_EXCLUDE if exclude is None else exclude
+    files = {}
+    prefixes = {}
+    for cls in iter_classes(file_path):
+        if not cls["filename"]:
+            continue
+        filename = resolve_filename(cls["filename"], cls["sources"], prefixes)
+        if not is_included(filename, include, exclude):
+            continue
+        entry = files.setdefault(
+            filename,
+            {"project": cls["package"] or "(unknown)", "namespace": namespace_of(cls["name"]), "hits": {}, "branches": {}},
+        )
+        merge_lines(entry, cls)
+    return files
+
+
+def filter_files(files, include, exclude):
+    return {f: e for f, e in files.items() if is_included(f, include, exclude)}
+
+
+def merge_lines(target, source):
+    """Union of lines; a line's hits is the max over sources, branch coverage the best observed."""
+    hits = target["hits"]
+    for number, h in source["hits"].items():
+        hits[number] = max(hits.get(number, 0), h)
+    branches = target["branches"]
+    for number, (covered, total) in source["branches"].items():
+        prev = branches.get(number)
+        if prev is None or covered > prev[0] or total > prev[1]:
+            branches[number] = (max(covered, prev[0] if prev else 0), max(total, prev[1] if prev else 0))
+
+
+def merge_reports(parsed):
+    merged = {}
+    for files in parsed:
+        for filename, entry in files.items():
+            if filename not in merged:
+                merged[filename] = {"project": entry["project"], "namespace": entry["namespace"], "hits": {}, "branches": {}}
+            merge_lines(merged[filename], entry)
+    return merged
+
+
+def file_totals(entry):
+    lines = len(entry["hits"])
+    covered = sum(1 for h in entry["hits"].values() if h > 0)
+    branches = sum(t for _, t in entry["branches"].values())
+    branches_covered = sum(c for c, _ in entry["branches"].values())
+    return {"lines": lines, "covered": covered, "branches": branches, "branches_covered": branches_covered}
+
+
+def group_totals(merged, key):
+    groups = {}
+    for entry in merged.values():
+        totals = file_totals(entry)
+        group = groups.setdefault(entry[key], {"lines": 0, "covered": 0, "branches": 0, "branches_covered": 0, "files": 0})
+        for k, v in totals.items():
+            group[k] += v
+        group["files"] += 1
+    return groups
+
+
+def expand_reports(paths):
+    """Files, globs and directories (searched for coverage.cobertura.xml)."""
+    reports = []
+    for path in paths:
+        if os.path.isdir(path):
+            reports += glob.glob(os.path.join(path, "**", "coverage.cobertura.xml"), recursive=True)
+        elif any(ch in path for ch in "*?["):
+            reports += glob.glob(path, recursive=True)
+        else:
+            reports.append(path)
+    return sorted(set(reports))
+
+
+def report_hash(path):
+    """Cache key: report content plus the key layout and the directory filenames are resolved against."""
+    digest = hashlib.sha256(f"{KEY_LAYOUT}:{os.getcwd()}:".encode("utf-8"))
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class CoverageCache:
+    """
+    Parsed reports keyed by content hash (SQLite). Files are stored unfiltered with their totals and
+    compact line data, so include/exclude changes and repeat queries never re-parse the XML.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS reports (
+        hash TEXT PRIMARY KEY,
+        path TEXT NOT NULL,
+        parsed_at REAL NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS files (
+        report_hash TEXT NOT NULL REFERENCES reports(hash),
+        filename TEXT NOT NULL,
+        project TEXT,
+        namespace TEXT,
+        lines INTEGER NOT NULL,
+        covered INTEGER NOT NULL,
+        branches INTEGER NOT NULL,
+        branches_covered INTEGER NOT NULL,
+        line_data TEXT NOT NULL,
+        PRIMARY KEY (report_hash, filename)
+    );
+    """
+
+    def __init__(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(self.SCHEMA)
+
+    def close(self):
+        self.conn.close()
 
-    for package in packages.findall('package'):
-        for classes in package.findall('classes'):
-            for cls in classes.findall('class'):
-                filename = cls.get('filename')
-                if not filename or "BobCrm.Api" not in filename or "Tests" in filename:
-                    continue
-                
-                lines = cls.find('lines')
-                if lines is None:
-                    continue
-                
-                l_total = 0
-                l_covered = 0
-                
-                for line in lines.findall('line'):
-                    l_total += 1
-                    if int(line.get('hits', 0)) > 0:
-                        l_covered += 1
-                
-                total_lines += l_total
-                covered_lines += l_covered
-                
-                if l_total > 0:
-                    coverage = (l_covered / l_total) * 100
-                    file_stats.append({
-                        'file': os.path.basename(filename),
-                        'total': l_total,
-                        'covered': l_covered,
-                        'uncovered': l_total - l_covered,
-                        'percent': coverage
-                    })
-
-    # Sort by uncovered lines desc
-    file_stats.sort(key=lambda x: x['uncovered'], reverse=True)
-
-    print(f"Overall Line Coverage: {((covered_lines/total_lines)*100):.2f}% ({covered_lines}/{total_lines})")
+    def get(self, digest):
+        if self.conn.execute("SELECT 1 FROM reports WHERE hash = ?", (digest,)).fetchone() is None:
+            return None
+        files = {}
+        for filename, project, namespace, line_data in self.conn.execute(
+            "SELECT filename, project, namespace, line_data FROM files WHERE report_hash = ?", (digest,)
+        ):
+            data = json.loads(line_data)
+            files[filename] = {
+                "project": project,
+                "namespace": namespace,
+                "hits": {n: h for n, h in data["h"]},
+                "branches": {n: (c, t) for n, c, t in data["b"]},
+            }
+        return files
+
+    def put(self, digest, path, files):
+        with self.conn:
+            self.conn.execute("DELETE FROM files WHERE report_hash = ?", (digest,))
+            self.conn.execute(
+                "INSERT OR REPLACE INTO reports(hash, path, parsed_at) VALUES (?, ?, ?)", (digest, path, time.time())
+            )
+            rows = []
+            for filename, entry in files.items():
+                totals = file_totals(entry)
+                line_data = {
+                    "h": sorted(entry["hits"].items()),
+                    "b": sorted([n, c, t] for n, (c, t) in entry["branches"].items()),
+                }
+                rows.append((
+                    digest, filename, entry["project"], entry["namespace"], totals["lines"], totals["covered"],
+                    totals["branches"], totals["branches_covered"], json.dumps(line_data, separators=(",", ":")),
+                ))
+            self.conn.executemany("INSERT INTO files VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+
+
+def load_reports(reports, include, exclude, workers, cache=None):
+    """Parse reports (cache misses in parallel worker processes) and apply include/exclude."""
+    parsed = {}
+    digests = {}
+    if cache is not None:
+        for r in reports:
+            digests[r] = report_hash(r)
+            cached = cache.get(digests[r])
+            if cached is not None:
+                parsed[r] = cached
+
+    misses = [r for r in reports if r not in parsed]
+    # Cached data is stored unfiltered; without a cache filter while parsing.
+    parse_include, parse_exclude = (["*"], []) if cache is not None else (include, exclude)
+    if len(misses) <= 1 or workers <= 1:
+        fresh = [parse_report(r, parse_include, parse_exclude) for r in misses]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(misses))) as pool:
+            fresh = list(pool.map(parse_report, misses, [parse_include] * len(misses), [parse_exclude] * len(misses)))
+    for r, files in zip(misses, fresh):
+        parsed[r] = files
+        if cache is not None:
+            cache.put(digests[r], r, files)
+
+    if cache is not None:
+        print(f"Coverage cache: {len(reports) - len(misses)} hit(s), {len(misses)} parsed")
+    return [filter_files(parsed[r], include, exclude) for r in reports]
+
+
+def git_changed_lines(base):
+    """{path: {new line numbers}} added or modified since base (git diff -U0 against the working tree)."""
+    out = subprocess.run(
+        ["git", "diff", "-U0", "--no-color", "--no-ext-diff", base, "--"],
+        capture_output=True, text=True, check=True,
+    ).stdout
+    changed = {}
+    current = None
+    for line in out.splitlines():
+        if line.startswith("+++ "):
+            path = line[4:].strip()
+            current = None if path == "/dev/null" else (path[2:] if path.startswith("b/") else path)
+        elif line.startswith("@@") and current:
+            match = _HUNK_RE.match(line)
+            if match:
+                start, count = int(match.group(1)), int(match.group(2) or 1)
+                changed.setdefault(current, set()).update(range(start, start + count))
+    return changed
+
+
+def _ranges(numbers):
+    numbers = sorted(numbers)
+    out = []
+    for n in numbers:
+        if out and n == out[-1][1] + 1:
+            out[-1][1] = n
+        else:
+            out.append([n, n])
+    return ",".join(str(a) if a == b else f"{a}-{b}" for a, b in out)
+
+
+def _match_report_file(merged, repo_path):
+    """
+    Report key for a git path. Keys are repo-relative when the report's source root exists locally;
+    otherwise they are a shorter tail (BobCrm.Api/Program.cs) or carry a longer prefix. The longest
+    key that lines up with the path on "/" boundaries wins.
+    """
+    if repo_path in merged:
+        return repo_path
+    matches = [f for f in merged if f.endswith("/" + repo_path) or repo_path.endswith("/" + f)]
+    return max(matches, key=len) if matches else None
+
+
+def changed_lines_coverage(merged, changed):
+    """Coverage of changed, coverable lines per file (lines absent from the report are not coverable)."""
+    rows = []
+    for repo_path, numbers in sorted(changed.items()):
+        filename = _match_report_file(merged, repo_path)
+        if filename is None:
+            continue
+        hits = merged[filename]["hits"]
+        coverable = [n for n in sorted(numbers) if n in hits]
+        if not coverable:
+            continue
+        uncovered = [n for n in coverable if hits[n] == 0]
+        rows.append({"file": repo_path, "lines": len(coverable), "covered": len(coverable) - len(uncovered), "uncovered": uncovered})
+    return rows
+
+
+def print_changed(rows, base):
+    total = sum(r["lines"] for r in rows)
+    covered = sum(r["covered"] for r in rows)
     print("-" * 60)
-    print(f"{'File':<40} | {'Uncovered':<10} | {'Coverage':<10}")
+    print(f"Changed-line Coverage vs {base}: {_pct(covered, total):.2f}% ({covered}/{total})")
     print("-" * 60)
-    
-    for stat in file_stats[:15]:
-        print(f"{stat['file']:<40} | {stat['uncovered']:<10} | {stat['percent']:.1f}%")
+    for r in sorted(rows, key=lambda r: len(r["uncovered"]), reverse=True):
+        label = r["file"] if len(r["file"]) <= 40 else "..." + r["file"][-37:]
+        missing = f"  uncovered: {_ranges(r['uncovered'])}" if r["uncovered"] else ""
+        print(f"{label:<40} | {r['covered']}/{r['lines']:<8} | {_pct(r['covered'], r['lines']):.1f}%{missing}")
 
-if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Usage: python parse_coverage.py <path_to_xml>")
+
+def compare_runs(baseline, current, min_drop=0.1):
+    """Files whose line coverage dropped by more than min_drop percentage points (or lost covered lines)."""
+    drops = []
+    for filename, entry in current.items():
+        if filename not in baseline:
+            continue
+        before, after = file_totals(baseline[filename]), file_totals(entry)
+        pct_before, pct_after = _pct(before["covered"], before["lines"]), _pct(after["covered"], after["lines"])
+        lost = [n for n, h in entry["hits"].items() if h == 0 and baseline[filename]["hits"].get(n, 0) > 0]
+        if pct_before - pct_after > min_drop or lost:
+            drops.append({"file": filename, "before": pct_before, "after": pct_after, "lost": lost})
+    return sorted(drops, key=lambda d: d["before"] - d["after"], reverse=True)
+
+
+def print_drops(drops, top):
+    print("-" * 60)
+    print(f"{'Coverage dropped':<40} | {'Before':<10} | {'After':<10}")
+    print("-" * 60)
+    for d in drops[:top]:
+        label = d["file"] if len(d["file"]) <= 40 else "..." + d["file"][-37:]
+        lost = f"  newly uncovered: {_ranges(d['lost'])}" if d["lost"] else ""
+        before = f"{d['before']:.1f}%"
+        print(f"{label:<40} | {before:<10} | {d['after']:.1f}%{lost}")
+    if not drops:
+        print("No file lost coverage")
+
+
+def print_file_detail(merged, pattern):
+    for filename in sorted(f for f in merged if fnmatch.fnmatch(f, pattern)):
+        entry = merged[filename]
+        totals = file_totals(entry)
+        uncovered = [n for n, h in entry["hits"].items() if h == 0]
+        print(f"{filename}: {_pct(totals['covered'], totals['lines']):.1f}% ({totals['covered']}/{totals['lines']}), "
+              f"branches {totals['branches_covered']}/{totals['branches']}")
+        if uncovered:
+            print(f"  uncovered: {_ranges(uncovered)}")
+
+
+def _pct(covered, total):
+    return (covered / total) * 100 if total else 0.0
+
+
+def print_groups(title, groups, top):
+    print("-" * 60)
+    print(f"{title:<40} | {'Uncovered':<10} | {'Coverage':<10}")
+    print("-" * 60)
+    rows = sorted(groups.items(), key=lambda kv: kv[1]["lines"] - kv[1]["covered"], reverse=True)
+    for name, g in rows[:top]:
+        label = name if len(name) <= 40 else "..." + name[-37:]
+        print(f"{label:<40} | {g['lines'] - g['covered']:<10} | {_pct(g['covered'], g['lines']):.1f}%")
+
+
+def summarize(merged, top=15, by=("project", "namespace", "file")):
+    lines = sum(len(e["hits"]) for e in merged.values())
+    if lines == 0:
+        print("No matching classes found")
+        return
+    totals = group_totals(merged, "project")
+    covered = sum(g["covered"] for g in totals.values())
+    branches = sum(g["branches"] for g in totals.values())
+    branches_covered = sum(g["branches_covered"] for g in totals.values())
+
+    print(f"Overall Line Coverage: {_pct(covered, lines):.2f}% ({covered}/{lines})")
+    if branches:
+        print(f"Overall Branch Coverage: {_pct(branches_covered, branches):.2f}% ({branches_covered}/{branches})")
+
+    if "project" in by:
+        print_groups("Project", totals, top)
+    if "namespace" in by:
+        print_groups("Namespace", group_totals(merged, "namespace"), top)
+    if "file" in by:
+        print_groups("File", {name: file_totals(e) for name, e in merged.items()}, top)
+
+
+def parse_cobertura(file_path):
+    """Single-report summary (kept for existing callers)."""
+    summarize(merge_reports([parse_report(file_path)]), by=("file",))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Summarize and merge Cobertura coverage reports")
+    parser.add_argument("reports", nargs="+", help="report files, globs, or directories containing coverage.cobertura.xml")
+    parser.add_argument("--include", action="append", help=f"filename glob to include (repeatable, default {DEFAULT_INCLUDE})")
+    parser.add_argument("--exclude", action="append", help=f"filename glob to exclude (repeatable, default {DEFAULT_EXCLUDE})")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="parallel parser processes")
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--by", default="project,namespace,file", help="breakdowns to print: project,namespace,file")
+    parser.add_argument("--cache", default=DEFAULT_CACHE, help="SQLite cache of parsed reports keyed by content hash")
+    parser.add_argument("--no-cache", action="store_true")
+    parser.add_argument("--file", help="per-file detail (uncovered line ranges) for filenames matching this glob")
+    parser.add_argument("--changed", metavar="GIT_REF", help="coverage of lines changed since GIT_REF (git diff)")
+    parser.add_argument("--baseline", action="append", help="baseline report(s) to diff against: list files whose coverage dropped")
+    parser.add_argument("--min-drop", type=float, default=0.1, help="percentage points a file must lose to be listed")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    reports = expand_reports(args.reports)
+    if not reports:
+        print("No coverage reports found")
+        return 1
+    include, exclude = args.include or DEFAULT_INCLUDE, args.exclude or DEFAULT_EXCLUDE
+    cache = None if args.no_cache else CoverageCache(args.cache)
+    try:
+        merged = merge_reports(load_reports(reports, include, exclude, args.workers, cache))
+        baseline = None
+        if args.baseline:
+            baseline = merge_reports(load_reports(expand_reports(args.baseline), include, exclude, args.workers, cache))
+    except ET.ParseError as e:
+        print(f"Error parsing XML: {e}")
+        return 1
+    except OSError as e:
+        print(f"Error reading report: {e}")
+        return 1
+    finally:
+        if cache is not None:
+            cache.close()
+
+    if args.file:
+        print_file_detail(merged, args.file)
+    elif args.changed:
+        print_changed(changed_lines_coverage(merged, git_changed_lines(args.changed)), args.changed)
+    elif baseline is not None:
+        print_drops(compare_runs(baseline, merged, args.min_drop), args.top)
     else:
-        parse_cobertura(sys.argv[1])
+        summarize(merged, args.top, tuple(b.strip() for b in args.by.split(",")))
+
+    peak = peak_rss_mb()
+    print("-" * 60)
+    print(f"Parsed {len(reports)} report(s) in {time.perf_counter() - started:.2f}s, "
+          f"peak RSS {'n/a' if peak is None else f'{peak:.1f} MB'} (main process)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
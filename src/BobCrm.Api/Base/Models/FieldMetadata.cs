@@ -108,6 +108,16 @@ public class FieldMetadata
 
     public ForeignKeyAction ForeignKeyAction { get; set; } = ForeignKeyAction.Restrict;
 
+    /// <summary>
+    /// 是否为该列创建索引（发布时生成 IX_{表名}_{字段}，已有表使用 CREATE INDEX CONCURRENTLY）
+    /// </summary>
+    public bool IsIndexed { get; set; } = false;
+
+    /// <summary>
+    /// 是否唯一（发布时生成唯一索引 UX_{表名}_{字段}，隐含 IsIndexed）
+    /// </summary>
+    public bool IsUnique { get; set; } = false;
+
     /// <summary>
     /// 物理表名（发布后填充，发布后不可修改）
     /// </summary>
@@ -25,6 +25,12 @@ public record CreateFieldMetadataDto
     public string? LookupEntityName { get; init; }
     public string? LookupDisplayField { get; init; }
     public ForeignKeyAction ForeignKeyAction { get; init; } = ForeignKeyAction.Restrict;
+
+    /// <summary>
+    /// 是否为该列创建索引 / 唯一索引（发布时由 DDL 生成器创建）
+    /// </summary>
+    public bool IsIndexed { get; init; }
+    public bool IsUnique { get; init; }
     public int SortOrder { get; init; }
     public string? DefaultValue { get; init; }
     public string? ValidationRules { get; init; }
@@ -26,6 +26,12 @@ public record UpdateFieldMetadataDto
     public string? LookupEntityName { get; init; }
     public string? LookupDisplayField { get; init; }
     public ForeignKeyAction? ForeignKeyAction { get; init; }
+
+    /// <summary>
+    /// 是否为该列创建索引 / 唯一索引（发布变更时增删索引）
+    /// </summary>
+    public bool? IsIndexed { get; init; }
+    public bool? IsUnique { get; init; }
     public int? SortOrder { get; init; }
     public string? DefaultValue { get; init; }
     public string? ValidationRules { get; init; }
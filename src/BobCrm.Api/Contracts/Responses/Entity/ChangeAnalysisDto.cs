@@ -7,5 +7,7 @@ public class ChangeAnalysisDto
 {
     public int NewFieldsCount { get; set; }
     public int LengthIncreasesCount { get; set; }
+    public int NewIndexesCount { get; set; }
+    public int DroppedIndexesCount { get; set; }
     public bool HasDestructiveChanges { get; set; }
 }
@@ -35,6 +35,8 @@ public class FieldMetadataDto
     public string? LookupEntityName { get; set; }
     public string? LookupDisplayField { get; set; }
     public ForeignKeyAction ForeignKeyAction { get; set; }
+    public bool IsIndexed { get; set; }
+    public bool IsUnique { get; set; }
     public string? TableName { get; set; }
     public int SortOrder { get; set; }
     public string? DefaultValue { get; set; }
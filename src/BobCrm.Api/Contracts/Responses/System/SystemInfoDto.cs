@@ -15,6 +15,26 @@ public class SystemInfoDto
     /// </summary>
     public long WorkingSetBytes { get; set; }
 
+    /// <summary>
+    /// 托管堆大小（字节，取自最近一次 GC）。
+    /// </summary>
+    public long GcHeapSizeBytes { get; set; }
+
+    /// <summary>
+    /// 进程启动以来第 0 代 GC 次数。
+    /// </summary>
+    public int Gen0Collections { get; set; }
+
+    /// <summary>
+    /// 进程启动以来第 1 代 GC 次数。
+    /// </summary>
+    public int Gen1Collections { get; set; }
+
+    /// <summary>
+    /// 进程启动以来第 2 代 GC 次数。
+    /// </summary>
+    public int Gen2Collections { get; set; }
+
     /// <summary>
     /// 主程序版本号。
     /// </summary>
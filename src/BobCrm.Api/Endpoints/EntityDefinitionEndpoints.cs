@@ -633,6 +633,8 @@ public static class EntityDefinitionEndpoints
                 {
                     NewFieldsCount = result.ChangeAnalysis?.NewFields.Count ?? 0,
                     LengthIncreasesCount = result.ChangeAnalysis?.LengthIncreases.Count ?? 0,
+                    NewIndexesCount = result.ChangeAnalysis?.NewIndexes.Count ?? 0,
+                    DroppedIndexesCount = result.ChangeAnalysis?.DroppedIndexes.Count ?? 0,
                     HasDestructiveChanges = result.ChangeAnalysis?.HasDestructiveChanges ?? false
                 },
                 Templates = result.Templates.Select(t => new TemplateInfoDto
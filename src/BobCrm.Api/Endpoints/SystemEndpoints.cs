@@ -203,6 +203,10 @@ public static class SystemEndpoints
             {
                 StartedAtUtc = runtimeInfo.StartedAtUtc,
                 WorkingSetBytes = workingSet,
+                GcHeapSizeBytes = GC.GetGCMemoryInfo().HeapSizeBytes,
+                Gen0Collections = GC.CollectionCount(0),
+                Gen1Collections = GC.CollectionCount(1),
+                Gen2Collections = GC.CollectionCount(2),
                 Version = version,
                 DbProvider = provider
             };
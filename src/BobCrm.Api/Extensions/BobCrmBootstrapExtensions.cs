@@ -6,6 +6,9 @@ using Microsoft.Extensions.Configuration;
 using Microsoft.Extensions.DependencyInjection;
 using Microsoft.Extensions.Hosting;
 using Microsoft.IdentityModel.Tokens;
+using OpenTelemetry.Exporter;
+using OpenTelemetry.Resources;
+using OpenTelemetry.Trace;
 
 namespace BobCrm.Api.Extensions;
 
@@ -102,4 +105,33 @@ public static class BobCrmBootstrapExtensions
 
         return services;
     }
+
+    /// <summary>
+    /// 可选的 OpenTelemetry 链路追踪：仅在配置 Telemetry:OtlpEndpoint（如 http://127.0.0.1:4318/v1/traces）时启用，
+    /// 导出 ASP.NET Core 请求、Npgsql 命令以及 <see cref="BobCrmTelemetry"/> 中的自定义 span。
+    /// 入站请求的 traceparent 会被沿用，便于测试工具把服务端耗时归属到具体用例。
+    /// </summary>
+    public static IServiceCollection AddBobCrmTelemetry(
+        this IServiceCollection services,
+        IConfiguration configuration)
+    {
+        var endpoint = configuration["Telemetry:OtlpEndpoint"];
+        if (string.IsNullOrWhiteSpace(endpoint))
+        {
+            return services;
+        }
+
+        services.AddOpenTelemetry()
+            .ConfigureResource(resource => resource.AddService(configuration["Telemetry:ServiceName"] ?? "BobCrm.Api"))
+            .WithTracing(tracing => tracing
+                .AddSource(BobCrmTelemetry.SourceName, "Npgsql")
+                .AddAspNetCoreInstrumentation()
+                .AddOtlpExporter(options =>
+                {
+                    options.Endpoint = new Uri(endpoint);
+                    options.Protocol = OtlpExportProtocol.HttpProtobuf;
+                }));
+
+        return services;
+    }
 }
@@ -88,6 +88,8 @@ public static class DtoExtensions
             LookupEntityName = field.LookupEntityName,
             LookupDisplayField = field.LookupDisplayField,
             ForeignKeyAction = field.ForeignKeyAction,
+            IsIndexed = field.IsIndexed,
+            IsUnique = field.IsUnique,
             TableName = field.TableName,
             SortOrder = field.SortOrder,
             DefaultValue = field.DefaultValue,
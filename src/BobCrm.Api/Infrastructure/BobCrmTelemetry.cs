@@ -0,0 +1,14 @@
+using System.Diagnostics;
+
+namespace BobCrm.Api.Infrastructure;
+
+/// <summary>
+/// 应用自定义链路追踪源（Roslyn 编译、DDL 执行、模板生成等服务端耗时步骤）。
+/// 仅在配置 Telemetry:OtlpEndpoint 时才会被导出，未配置时 StartActivity 返回 null，开销可忽略。
+/// </summary>
+public static class BobCrmTelemetry
+{
+    public const string SourceName = "BobCrm.Api";
+
+    public static readonly ActivitySource Source = new(SourceName);
+}
@@ -0,0 +1,40 @@
+﻿using Microsoft.EntityFrameworkCore.Migrations;
+
+#nullable disable
+
+namespace BobCrm.Api.Migrations
+{
+    /// <inheritdoc />
+    public partial class AddIndexFlagsToFieldMetadata : Migration
+    {
+        /// <inheritdoc />
+        protected override void Up(MigrationBuilder migrationBuilder)
+        {
+            migrationBuilder.AddColumn<bool>(
+                name: "IsIndexed",
+                table: "FieldMetadatas",
+                type: "boolean",
+                nullable: false,
+                defaultValue: false);
+
+            migrationBuilder.AddColumn<bool>(
+                name: "IsUnique",
+                table: "FieldMetadatas",
+                type: "boolean",
+                nullable: false,
+                defaultValue: false);
+        }
+
+        /// <inheritdoc />
+        protected override void Down(MigrationBuilder migrationBuilder)
+        {
+            migrationBuilder.DropColumn(
+                name: "IsIndexed",
+                table: "FieldMetadatas");
+
+            migrationBuilder.DropColumn(
+                name: "IsUnique",
+                table: "FieldMetadatas");
+        }
+    }
+}
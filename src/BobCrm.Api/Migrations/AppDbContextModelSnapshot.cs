@@ -851,12 +851,18 @@ namespace BobCrm.Api.Migrations
                     b.Property<bool>("IsEntityRef")
                         .HasColumnType("boolean");
 
+                    b.Property<bool>("IsIndexed")
+                        .HasColumnType("boolean");
+
                     b.Property<bool>("IsMultiSelect")
                         .HasColumnType("boolean");
 
                     b.Property<bool>("IsRequired")
                         .HasColumnType("boolean");
 
+                    b.Property<bool>("IsUnique")
+                        .HasColumnType("boolean");
+
                     b.Property<int?>("Length")
                         .HasColumnType("integer");
 
@@ -59,6 +59,7 @@ builder.Logging.AddFilter("Microsoft", LogLevel.Warning);
 builder.Logging.AddFilter("System", LogLevel.Warning);
 
 builder.Services.AddBobCrmDatabase(builder.Configuration);
+builder.Services.AddBobCrmTelemetry(builder.Configuration);
 
 builder.Services.AddIdentity<IdentityUser, IdentityRole>(options =>
 {
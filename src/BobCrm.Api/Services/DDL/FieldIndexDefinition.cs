@@ -0,0 +1,6 @@
+namespace BobCrm.Api.Services;
+
+/// <summary>
+/// 字段级索引定义（由 FieldMetadata.IsIndexed / IsUnique 声明）
+/// </summary>
+public record FieldIndexDefinition(string IndexName, string ColumnName, bool IsUnique);
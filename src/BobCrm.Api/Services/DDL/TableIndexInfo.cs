@@ -0,0 +1,15 @@
+namespace BobCrm.Api.Services;
+
+/// <summary>
+/// 表索引信息
+/// </summary>
+public class TableIndexInfo
+{
+    public string IndexName { get; set; } = string.Empty;
+    public bool IsUnique { get; set; }
+
+    /// <summary>
+    /// CREATE INDEX CONCURRENTLY 失败后会留下无效索引（indisvalid = false），需要删除重建
+    /// </summary>
+    public bool IsValid { get; set; } = true;
+}
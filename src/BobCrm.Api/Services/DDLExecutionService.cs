@@ -2,6 +2,7 @@ using System.Data;
 using System.Data.Common;
 using System.Linq;
 using System.Text;
+using System.Text.RegularExpressions;
 using BobCrm.Api.Base.Models;
 using BobCrm.Api.Infrastructure;
 using Microsoft.EntityFrameworkCore;
@@ -15,6 +16,8 @@ namespace BobCrm.Api.Services;
 /// </summary>
 public class DDLExecutionService
 {
+    private static readonly Regex ConcurrentlyRegex = new(@"\s+CONCURRENTLY\s+", RegexOptions.IgnoreCase | RegexOptions.Compiled);
+
     protected readonly AppDbContext _db;
     protected readonly ILogger<DDLExecutionService> _logger;
 
@@ -231,6 +234,41 @@ public class DDLExecutionService
             .ToListAsync();
     }
 
+    /// <summary>
+    /// 获取表的索引信息（不含主键）
+    /// </summary>
+    public virtual async Task<List<TableIndexInfo>> GetTableIndexesAsync(string tableName)
+    {
+        if (string.IsNullOrWhiteSpace(tableName) || !_db.Database.IsNpgsql())
+        {
+            return new List<TableIndexInfo>();
+        }
+
+        var effectiveTableName = await ResolveExistingTableNameAsync(tableName);
+        if (effectiveTableName == null)
+        {
+            return new List<TableIndexInfo>();
+        }
+
+        var sql = @"
+            SELECT
+                i.relname AS ""IndexName"",
+                ix.indisunique AS ""IsUnique"",
+                ix.indisvalid AS ""IsValid""
+            FROM pg_index ix
+            JOIN pg_class i ON i.oid = ix.indexrelid
+            JOIN pg_class t ON t.oid = ix.indrelid
+            JOIN pg_namespace n ON n.oid = t.relnamespace
+            WHERE n.nspname = 'public'
+            AND t.relname = {0}
+            AND NOT ix.indisprimary
+            ORDER BY i.relname";
+
+        return await _db.Database
+            .SqlQueryRaw<TableIndexInfo>(sql, effectiveTableName)
+            .ToListAsync();
+    }
+
     private async Task<string?> ResolveExistingTableNameAsync(string tableName)
     {
         var qualifiedExact = ToPublicQualifiedName(tableName, quoted: true);
@@ -280,18 +318,29 @@ public class DDLExecutionService
         // so execute them sequentially.
         var statements = SplitSqlStatements(sqlScript).ToList();
         _logger.LogInformation("[DDL] Split into {Count} statement(s).", statements.Count);
+
+        using var activity = BobCrmTelemetry.Source.StartActivity("ddl.execute");
+        activity?.SetTag("bobcrm.ddl.statements", statements.Count);
         for (var index = 0; index < statements.Count; index++)
         {
             var statement = statements[index];
             await using var command = connection.CreateCommand();
-            command.CommandText = statement;
 
             var activeTransaction = _db.Database.CurrentTransaction?.GetDbTransaction();
             if (activeTransaction != null)
             {
                 command.Transaction = activeTransaction;
+
+                // CREATE/DROP INDEX CONCURRENTLY cannot run inside a transaction block.
+                if (ConcurrentlyRegex.IsMatch(statement))
+                {
+                    _logger.LogWarning("[DDL] Running index statement without CONCURRENTLY inside an active transaction.");
+                    statement = ConcurrentlyRegex.Replace(statement, " ");
+                }
             }
 
+            command.CommandText = statement;
+
             await command.ExecuteNonQueryAsync();
         }
     }
@@ -129,6 +129,9 @@ public class DefaultTemplateGenerator : IDefaultTemplateGenerator
         }
 
         var entityType = entity.EntityRoute;
+        using var activity = BobCrmTelemetry.Source.StartActivity("template.ensure_defaults");
+        activity?.SetTag("bobcrm.entity_type", entityType);
+
         var fields = PrepareFields(entity);
 
         if (fields.Count == 0)
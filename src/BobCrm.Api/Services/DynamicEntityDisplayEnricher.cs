@@ -46,13 +46,15 @@ public sealed class DynamicEntityDisplayEnricher
             return entities.ToList();
         }
 
+        // 每行只序列化一次：收集外键与渲染显示值共用同一个 JsonObject
+        var nodes = entities.Select(ToJsonObject).ToList();
         var enumDisplay = await LoadEnumDisplayMapsAsync(fields, lang, ct);
-        var lookupDisplay = await LoadLookupDisplayMapsAsync(fields, entities, ct);
+        var lookupDisplay = await LoadLookupDisplayMapsAsync(fields, nodes, ct);
 
-        var result = new List<object>(entities.Count);
-        foreach (var entity in entities)
+        var result = new List<object>(nodes.Count);
+        foreach (var node in nodes)
         {
-            result.Add(EnrichEntity(entity, fields, enumDisplay, lookupDisplay));
+            result.Add(EnrichEntity(node, fields, enumDisplay, lookupDisplay));
         }
 
         return result;
@@ -71,18 +73,21 @@ public sealed class DynamicEntityDisplayEnricher
             return entity;
         }
 
+        var node = ToJsonObject(entity);
         var enumDisplay = await LoadEnumDisplayMapsAsync(fields, lang, ct);
-        var lookupDisplay = await LoadLookupDisplayMapsAsync(fields, [entity], ct);
-        return EnrichEntity(entity, fields, enumDisplay, lookupDisplay);
+        var lookupDisplay = await LoadLookupDisplayMapsAsync(fields, [node], ct);
+        return EnrichEntity(node, fields, enumDisplay, lookupDisplay);
     }
 
+    private static JsonObject ToJsonObject(object entity)
+        => JsonSerializer.SerializeToNode(entity, WebJson) as JsonObject ?? new JsonObject();
+
     private static JsonObject EnrichEntity(
-        object entity,
+        JsonObject node,
         IReadOnlyList<FieldMetadataDto> fields,
         Dictionary<Guid, Dictionary<string, string>> enumDisplayByDefinition,
         Dictionary<string, Dictionary<string, string>> lookupDisplayByTarget)
     {
-        var node = JsonSerializer.SerializeToNode(entity, WebJson) as JsonObject ?? new JsonObject();
         var display = new JsonObject();
 
         foreach (var field in fields)
@@ -136,15 +141,19 @@ public sealed class DynamicEntityDisplayEnricher
 
     private static string BuildLookupTargetKey(FieldMetadataDto field)
     {
+        // 同一目标 + 同一显示字段的多个外键字段共用一次解析；显示字段不同则分开，避免标签串用
+        var displayField = field.LookupDisplayField?.Trim();
+        var suffix = string.IsNullOrWhiteSpace(displayField) ? string.Empty : $"#{displayField}";
+
         var target = field.LookupEntityName?.Trim();
         if (!string.IsNullOrWhiteSpace(target))
         {
-            return $"name:{target}";
+            return $"name:{target}{suffix}";
         }
 
         if (field.ReferencedEntityId.HasValue)
         {
-            return $"id:{field.ReferencedEntityId.Value:D}";
+            return $"id:{field.ReferencedEntityId.Value:D}{suffix}";
         }
 
         return "unknown";
@@ -349,7 +358,7 @@ public sealed class DynamicEntityDisplayEnricher
 
     private async Task<Dictionary<string, Dictionary<string, string>>> LoadLookupDisplayMapsAsync(
         IReadOnlyList<FieldMetadataDto> fields,
-        IReadOnlyList<object> entities,
+        IReadOnlyList<JsonObject> nodes,
         CancellationToken ct)
     {
         var lookupFields = fields
@@ -364,14 +373,8 @@ public sealed class DynamicEntityDisplayEnricher
         var idsByTarget = new Dictionary<string, HashSet<string>>(StringComparer.OrdinalIgnoreCase);
         var displayFieldByTarget = new Dictionary<string, string?>(StringComparer.OrdinalIgnoreCase);
 
-        foreach (var entity in entities)
+        foreach (var node in nodes)
         {
-            var node = JsonSerializer.SerializeToNode(entity, WebJson) as JsonObject;
-            if (node == null)
-            {
-                continue;
-            }
-
             foreach (var field in lookupFields)
             {
                 if (!TryGetValueNode(node, field.PropertyName, out var valueNode, out _))
@@ -430,13 +433,14 @@ public sealed class DynamicEntityDisplayEnricher
 
             try
             {
+                var baseKey = targetKey.Split('#', 2)[0];
                 string target;
-                if (targetKey.StartsWith("name:", StringComparison.OrdinalIgnoreCase))
+                if (baseKey.StartsWith("name:", StringComparison.OrdinalIgnoreCase))
                 {
-                    target = targetKey["name:".Length..];
+                    target = baseKey["name:".Length..];
                 }
-                else if (targetKey.StartsWith("id:", StringComparison.OrdinalIgnoreCase) &&
-                         Guid.TryParse(targetKey["id:".Length..], out var id) &&
+                else if (baseKey.StartsWith("id:", StringComparison.OrdinalIgnoreCase) &&
+                         Guid.TryParse(baseKey["id:".Length..], out var id) &&
                          resolvedTypeNameById.TryGetValue(id, out var fullType))
                 {
                     target = fullType;
@@ -106,6 +106,8 @@ public class EntityDefinitionAppService : IEntityDefinitionAppService
                     LookupEntityName = fieldDto.LookupEntityName,
                     LookupDisplayField = fieldDto.LookupDisplayField,
                     ForeignKeyAction = fieldDto.ForeignKeyAction,
+                    IsIndexed = fieldDto.IsIndexed,
+                    IsUnique = fieldDto.IsUnique,
                     SortOrder = fieldDto.SortOrder,
                     DefaultValue = fieldDto.DefaultValue,
                     ValidationRules = fieldDto.ValidationRules,
@@ -363,6 +365,8 @@ public class EntityDefinitionAppService : IEntityDefinitionAppService
                         if (fieldDto.LookupEntityName != null) existingField.LookupEntityName = fieldDto.LookupEntityName;
                         if (fieldDto.LookupDisplayField != null) existingField.LookupDisplayField = fieldDto.LookupDisplayField;
                         if (fieldDto.ForeignKeyAction.HasValue) existingField.ForeignKeyAction = fieldDto.ForeignKeyAction.Value;
+                        if (fieldDto.IsIndexed.HasValue) existingField.IsIndexed = fieldDto.IsIndexed.Value;
+                        if (fieldDto.IsUnique.HasValue) existingField.IsUnique = fieldDto.IsUnique.Value;
                         if (fieldDto.SortOrder.HasValue) existingField.SortOrder = fieldDto.SortOrder.Value;
                         existingField.DefaultValue = fieldDto.DefaultValue;
                         existingField.ValidationRules = fieldDto.ValidationRules;
@@ -388,6 +392,8 @@ public class EntityDefinitionAppService : IEntityDefinitionAppService
                         LookupEntityName = fieldDto.LookupEntityName,
                         LookupDisplayField = fieldDto.LookupDisplayField,
                         ForeignKeyAction = fieldDto.ForeignKeyAction ?? ForeignKeyAction.Restrict,
+                        IsIndexed = fieldDto.IsIndexed ?? false,
+                        IsUnique = fieldDto.IsUnique ?? false,
                         SortOrder = fieldDto.SortOrder ?? 0,
                         DefaultValue = fieldDto.DefaultValue,
                         ValidationRules = fieldDto.ValidationRules,
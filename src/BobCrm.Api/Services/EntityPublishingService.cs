@@ -780,6 +780,42 @@ public class EntityPublishingService : IEntityPublishingService
             }
         }
 
+        // 分析字段索引变更（IsIndexed / IsUnique）
+        var currentIndexes = await _ddlExecutor.GetTableIndexesAsync(tableName) ?? new List<TableIndexInfo>();
+        var validIndexNames = currentIndexes.Where(i => i.IsValid).Select(i => i.IndexName).ToHashSet(StringComparer.Ordinal);
+        foreach (var index in _ddlGenerator.GetDeclaredFieldIndexes(entity))
+        {
+            if (validIndexNames.Contains(index.IndexName))
+            {
+                continue;
+            }
+
+            // 上次 CONCURRENTLY 创建失败留下的无效索引需先删除，否则 IF NOT EXISTS 会跳过重建
+            if (currentIndexes.Any(i => i.IndexName == index.IndexName))
+            {
+                analysis.DroppedIndexes.Add(index.IndexName);
+            }
+            analysis.NewIndexes.Add(index);
+        }
+
+        // 只删除本生成器命名规则（IX_/UX_{表名}_{字段}）下、且不再需要的索引
+        var managedIndexNames = _ddlGenerator.GetManagedIndexNames(entity);
+        var generatorNamedIndexes = entity.Fields
+            .Where(f => !f.IsDeleted)
+            .SelectMany(f => new[]
+            {
+                PostgreSQLDDLGenerator.BuildIndexName("IX", tableName, f.PropertyName),
+                PostgreSQLDDLGenerator.BuildIndexName("UX", tableName, f.PropertyName)
+            })
+            .ToHashSet(StringComparer.Ordinal);
+        foreach (var index in currentIndexes)
+        {
+            if (generatorNamedIndexes.Contains(index.IndexName) && !managedIndexNames.Contains(index.IndexName))
+            {
+                analysis.DroppedIndexes.Add(index.IndexName);
+            }
+        }
+
         return analysis;
     }
 
@@ -804,6 +840,13 @@ public class EntityPublishingService : IEntityPublishingService
             scripts.Add(modifyScript);
         }
 
+        // 字段索引（CONCURRENTLY，放在列变更之后）
+        if (analysis.NewIndexes.Any() || analysis.DroppedIndexes.Any())
+        {
+            var indexScript = _ddlGenerator.GenerateAlterTableIndexes(entity, analysis.NewIndexes, analysis.DroppedIndexes);
+            scripts.Add(indexScript);
+        }
+
         // 删除字段（ENT-02）
         if (analysis.RemovedFields.Any())
         {
@@ -9,6 +9,11 @@ namespace BobCrm.Api.Services;
 /// </summary>
 public class PostgreSQLDDLGenerator
 {
+    /// <summary>
+    /// PostgreSQL 标识符最大长度（超出部分会被截断）
+    /// </summary>
+    private const int MaxIdentifierLength = 63;
+
     /// <summary>
     /// 生成CREATE TABLE语句
     /// </summary>
@@ -99,6 +104,91 @@ public class PostgreSQLDDLGenerator
         return sb.ToString();
     }
 
+    /// <summary>
+    /// 生成字段索引变更语句（已有表）
+    /// 使用 CONCURRENTLY 避免长时间锁表，因此这些语句不能在事务中执行
+    /// </summary>
+    public string GenerateAlterTableIndexes(
+        EntityDefinition entity,
+        IReadOnlyCollection<FieldIndexDefinition> addedIndexes,
+        IReadOnlyCollection<string> droppedIndexes)
+    {
+        var tableName = entity.DefaultTableName;
+        var sb = new StringBuilder();
+
+        var displayName = MultilingualTextHelper.Resolve(entity.DisplayName, entity.EntityName);
+        sb.AppendLine($"-- 修改表：{displayName} - 字段索引");
+
+        foreach (var indexName in droppedIndexes.Distinct(StringComparer.Ordinal).OrderBy(x => x, StringComparer.Ordinal))
+        {
+            sb.AppendLine($"DROP INDEX CONCURRENTLY IF EXISTS \"{indexName}\";");
+        }
+
+        foreach (var index in addedIndexes.OrderBy(x => x.IndexName, StringComparer.Ordinal))
+        {
+            var unique = index.IsUnique ? "UNIQUE " : string.Empty;
+            sb.AppendLine($"CREATE {unique}INDEX CONCURRENTLY IF NOT EXISTS \"{index.IndexName}\" ON \"{tableName}\" (\"{index.ColumnName}\");");
+        }
+
+        return sb.ToString();
+    }
+
+    /// <summary>
+    /// 获取字段声明的索引（IsIndexed / IsUnique）
+    /// </summary>
+    public IReadOnlyList<FieldIndexDefinition> GetDeclaredFieldIndexes(EntityDefinition entity)
+    {
+        var tableName = entity.DefaultTableName;
+        return entity.Fields
+            .Where(f => !f.IsDeleted && (f.IsIndexed || f.IsUnique))
+            .OrderBy(f => f.SortOrder)
+            .Select(f => new FieldIndexDefinition(
+                BuildIndexName(f.IsUnique ? "UX" : "IX", tableName, f.PropertyName),
+                f.PropertyName,
+                f.IsUnique))
+            .ToList();
+    }
+
+    /// <summary>
+    /// 获取 DDL 生成器为该实体维护的全部索引名（实体引用、Code、OrganizationId 以及字段声明的索引）
+    /// </summary>
+    public HashSet<string> GetManagedIndexNames(EntityDefinition entity)
+    {
+        var tableName = entity.DefaultTableName;
+        var names = new HashSet<string>(StringComparer.Ordinal);
+
+        foreach (var field in entity.Fields.Where(f => f.IsEntityRef && f.ReferencedEntityId.HasValue))
+        {
+            names.Add(BuildIndexName("IX", tableName, field.PropertyName));
+        }
+
+        if (entity.Interfaces.Any(i => i.InterfaceType == EntityInterfaceType.Archive && i.IsEnabled))
+        {
+            names.Add(BuildIndexName("UX", tableName, "Code"));
+        }
+
+        if (entity.Interfaces.Any(i => i.InterfaceType == EntityInterfaceType.Organization && i.IsEnabled))
+        {
+            names.Add(BuildIndexName("IX", tableName, "OrganizationId"));
+        }
+
+        foreach (var index in GetDeclaredFieldIndexes(entity))
+        {
+            names.Add(index.IndexName);
+        }
+
+        return names;
+    }
+
+    /// <summary>
+    /// 生成索引名 {前缀}_{表名}_{字段}，与 PostgreSQL 一样截断到 63 个字符，便于与 pg_index 中的名称比较
+    /// </summary>
+    public static string BuildIndexName(string prefix, string tableName, string columnName)
+    {
+        var name = $"{prefix}_{tableName}_{columnName}";
+        return name.Length <= MaxIdentifierLength ? name : name[..MaxIdentifierLength];
+    }
+
     /// <summary>
     /// 生成ALTER TABLE语句（删除字段）
     /// </summary>
@@ -267,6 +357,13 @@ public class PostgreSQLDDLGenerator
             sb.AppendLine($"CREATE INDEX IF NOT EXISTS \"{indexName}\" ON \"{tableName}\" (\"{field.PropertyName}\");");
         }
 
+        // 字段声明的索引 / 唯一索引（新表为空，无需 CONCURRENTLY）
+        foreach (var index in GetDeclaredFieldIndexes(entity))
+        {
+            var unique = index.IsUnique ? "UNIQUE " : string.Empty;
+            sb.AppendLine($"CREATE {unique}INDEX IF NOT EXISTS \"{index.IndexName}\" ON \"{tableName}\" (\"{index.ColumnName}\");");
+        }
+
         // 为Code字段创建唯一索引（如果有Archive接口）
         var hasArchive = entity.Interfaces.Any(i => i.InterfaceType == EntityInterfaceType.Archive && i.IsEnabled);
         if (hasArchive)
@@ -11,6 +11,8 @@ public class ChangeAnalysis
     public Dictionary<FieldMetadata, int> LengthIncreases { get; set; } = new();
     public Dictionary<FieldMetadata, int> LengthDecreases { get; set; } = new();
     public List<string> RemovedFields { get; set; } = new();
+    public List<FieldIndexDefinition> NewIndexes { get; set; } = new();
+    public List<string> DroppedIndexes { get; set; } = new();
     public bool HasDestructiveChanges { get; set; }
 }
 
@@ -1,4 +1,5 @@
 using System.Reflection;
+using BobCrm.Api.Infrastructure;
 using System.Runtime.Loader;
 using Microsoft.CodeAnalysis;
 using Microsoft.CodeAnalysis.CSharp;
@@ -35,6 +36,9 @@ public class RoslynCompiler
             AssemblyName = assemblyName
         };
 
+        using var activity = BobCrmTelemetry.Source.StartActivity("roslyn.compile");
+        activity?.SetTag("bobcrm.assembly", assemblyName);
+
         try
         {
             _logger.LogInformation("[Roslyn] Compiling assembly: {AssemblyName}", assemblyName);
@@ -141,6 +145,10 @@ public class RoslynCompiler
             AssemblyName = assemblyName
         };
 
+        using var activity = BobCrmTelemetry.Source.StartActivity("roslyn.compile");
+        activity?.SetTag("bobcrm.assembly", assemblyName);
+        activity?.SetTag("bobcrm.source_files", sources.Count);
+
         try
         {
             _logger.LogInformation("[Roslyn] Compiling {Count} source files into assembly: {AssemblyName}",
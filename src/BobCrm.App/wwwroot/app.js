@@ -56,6 +56,16 @@ window.bobcrm = {
   removeLocalStorageItem: function (key) {
     try { window.localStorage.removeItem(key); } catch (e) { }
   },
+  // 电路可交互信号：Routes.razor 在 splash 移除后调用一次，供 E2E/性能测试等待并计时
+  markCircuitReady: function () {
+    try {
+      if (window.bobcrm.circuitReadyAt) return;
+      const at = performance.now();
+      window.bobcrm.circuitReadyAt = at;
+      document.documentElement.setAttribute('data-circuit', 'ready');
+      window.dispatchEvent(new CustomEvent('bobcrm:circuit-ready', { detail: { at: at, path: window.location.pathname } }));
+    } catch (e) { }
+  },
   setCookie: function (name, value, days) {
     try {
       let expires = '';
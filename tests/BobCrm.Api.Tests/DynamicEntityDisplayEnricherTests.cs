@@ -0,0 +1,91 @@
+using System;
+using System.Collections.Generic;
+using System.Linq;
+using System.Text.Json.Nodes;
+using System.Threading;
+using System.Threading.Tasks;
+using BobCrm.Api.Base;
+using BobCrm.Api.Base.Models;
+using BobCrm.Api.Contracts.Responses.Entity;
+using BobCrm.Api.Infrastructure;
+using BobCrm.Api.Services;
+using FluentAssertions;
+using Microsoft.EntityFrameworkCore;
+using Microsoft.Extensions.Logging.Abstractions;
+using Moq;
+
+namespace BobCrm.Api.Tests;
+
+public class DynamicEntityDisplayEnricherTests
+{
+    private const string AccountType = "BobCrm.Tests.Dynamic.Account";
+
+    [Fact]
+    public async Task EnrichListAsync_ShouldResolveLookupLabels_PerFieldDisplayField()
+    {
+        await using var db = CreateContext();
+        db.EntityDefinitions.Add(new EntityDefinition
+        {
+            EntityRoute = "customer",
+            EntityName = "Customer",
+            FullTypeName = typeof(Customer).FullName!,
+            Status = EntityStatus.Published,
+            Source = EntitySource.System,
+            StructureType = EntityStructureType.Single,
+            IsEnabled = true
+        });
+        db.Customers.AddRange(
+            new Customer { Id = 1, Code = "C1", Name = "Alice" },
+            new Customer { Id = 2, Code = "C2", Name = "Bob" });
+        await db.SaveChangesAsync();
+
+        var enricher = CreateEnricher(db, new List<FieldMetadataDto>
+        {
+            new() { PropertyName = "OwnerId", DataType = FieldDataType.Integer, IsEntityRef = true, LookupEntityName = "customer", LookupDisplayField = "Name" },
+            new() { PropertyName = "PayerId", DataType = FieldDataType.Integer, IsEntityRef = true, LookupEntityName = "customer", LookupDisplayField = "Name" },
+            new() { PropertyName = "BillToId", DataType = FieldDataType.Integer, IsEntityRef = true, LookupEntityName = "customer", LookupDisplayField = "Code" }
+        });
+
+        var rows = new object[]
+        {
+            new { Id = 10, OwnerId = 1, PayerId = 2, BillToId = 1 },
+            new { Id = 11, OwnerId = 2, PayerId = 2, BillToId = 2 }
+        };
+
+        var result = await enricher.EnrichListAsync(AccountType, rows, Mock.Of<ILocalization>(), "en", CancellationToken.None);
+
+        var displays = result.Cast<JsonObject>().Select(n => n["__display"]!.AsObject()).ToList();
+        displays[0]["ownerId"]!.GetValue<string>().Should().Be("Alice");
+        displays[0]["payerId"]!.GetValue<string>().Should().Be("Bob");
+        displays[0]["billToId"]!.GetValue<string>().Should().Be("C1");
+        displays[1]["ownerId"]!.GetValue<string>().Should().Be("Bob");
+        displays[1]["billToId"]!.GetValue<string>().Should().Be("C2");
+    }
+
+    private static DynamicEntityDisplayEnricher CreateEnricher(AppDbContext db, IReadOnlyList<FieldMetadataDto> fields)
+    {
+        var cache = new Mock<IFieldMetadataCache>();
+        cache.Setup(c => c.GetFieldsAsync(AccountType, It.IsAny<ILocalization>(), It.IsAny<string?>(), It.IsAny<CancellationToken>()))
+            .ReturnsAsync(fields);
+
+        var dynamicEntityService = new DynamicEntityService(
+            db,
+            new CSharpCodeGenerator(),
+            new RoslynCompiler(NullLogger<RoslynCompiler>.Instance),
+            NullLogger<DynamicEntityService>.Instance);
+
+        return new DynamicEntityDisplayEnricher(
+            db,
+            cache.Object,
+            new LookupResolveService(db, dynamicEntityService),
+            NullLogger<DynamicEntityDisplayEnricher>.Instance);
+    }
+
+    private static AppDbContext CreateContext()
+    {
+        var options = new DbContextOptionsBuilder<AppDbContext>()
+            .UseInMemoryDatabase(Guid.NewGuid().ToString())
+            .Options;
+        return new AppDbContext(options);
+    }
+}
@@ -1,5 +1,6 @@
 using System;
 using System.Collections.Generic;
+using System.Linq;
 using System.Threading;
 using System.Threading.Tasks;
 using BobCrm.Api.Base;
@@ -357,6 +358,51 @@ public class EntityPublishingServiceTests
         ddl.ExecuteCount.Should().Be(0);
     }
 
+    [Fact]
+    public async Task PublishEntityChangesAsync_WhenFieldIndexFlagsChange_ShouldAlterIndexesConcurrently()
+    {
+        await using var db = CreateInMemoryContext();
+        var ddl = new StubDdlExecutionService(db)
+        {
+            TableExists = true,
+            AlwaysSucceed = true,
+            Columns =
+            [
+                new TableColumnInfo { ColumnName = "Id", DataType = "integer" },
+                new TableColumnInfo { ColumnName = "TierId", DataType = "integer" },
+                new TableColumnInfo { ColumnName = "Email", DataType = "text" },
+                new TableColumnInfo { ColumnName = "Note", DataType = "text" }
+            ],
+            Indexes =
+            [
+                new TableIndexInfo { IndexName = "IX_Orders_Note", IsUnique = false, IsValid = true },
+                new TableIndexInfo { IndexName = "UX_Orders_Email", IsUnique = true, IsValid = false },
+                new TableIndexInfo { IndexName = "ix_orders_manual", IsUnique = false, IsValid = true }
+            ]
+        };
+        var service = CreateService(db, ddl);
+
+        var entity = NewDraftEntity("Order", "order");
+        entity.Status = EntityStatus.Modified;
+        entity.IsLocked = true;
+        entity.Fields.Add(new FieldMetadata { EntityDefinitionId = entity.Id, PropertyName = "TierId", DataType = FieldDataType.Integer, IsIndexed = true, SortOrder = 1 });
+        entity.Fields.Add(new FieldMetadata { EntityDefinitionId = entity.Id, PropertyName = "Email", DataType = FieldDataType.String, IsUnique = true, SortOrder = 2 });
+        entity.Fields.Add(new FieldMetadata { EntityDefinitionId = entity.Id, PropertyName = "Note", DataType = FieldDataType.String, SortOrder = 3 });
+        db.EntityDefinitions.Add(entity);
+        await db.SaveChangesAsync();
+
+        var result = await service.PublishEntityChangesAsync(entity.Id, "tester");
+
+        ddl.ExecuteCount.Should().Be(1);
+        result.ChangeAnalysis!.HasDestructiveChanges.Should().BeFalse();
+        result.ChangeAnalysis.NewIndexes.Select(i => i.IndexName).Should().BeEquivalentTo(new[] { "IX_Orders_TierId", "UX_Orders_Email" });
+        result.ChangeAnalysis.DroppedIndexes.Should().BeEquivalentTo(new[] { "IX_Orders_Note", "UX_Orders_Email" });
+        result.DDLScript.Should().Contain("CREATE INDEX CONCURRENTLY IF NOT EXISTS \"IX_Orders_TierId\" ON \"Orders\" (\"TierId\");");
+        result.DDLScript.Should().Contain("CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS \"UX_Orders_Email\" ON \"Orders\" (\"Email\");");
+        result.DDLScript.Should().Contain("DROP INDEX CONCURRENTLY IF EXISTS \"IX_Orders_Note\";");
+        result.DDLScript.Should().NotContain("ix_orders_manual");
+    }
+
     private static EntityPublishingService CreateService(
         AppDbContext db,
         DDLExecutionService ddl,
@@ -447,6 +493,7 @@ public class EntityPublishingServiceTests
         public bool AlwaysSucceed { get; set; } = true;
         public int ExecuteCount { get; private set; }
         public List<TableColumnInfo> Columns { get; set; } = new();
+        public List<TableIndexInfo> Indexes { get; set; } = new();
 
         public StubDdlExecutionService(AppDbContext db)
             : base(db, NullLogger<DDLExecutionService>.Instance)
@@ -458,6 +505,9 @@ public class EntityPublishingServiceTests
         public override Task<List<TableColumnInfo>> GetTableColumnsAsync(string tableName)
             => Task.FromResult(Columns);
 
+        public override Task<List<TableIndexInfo>> GetTableIndexesAsync(string tableName)
+            => Task.FromResult(Indexes);
+
         public override async Task<DDLScript> ExecuteDDLAsync(Guid entityDefinitionId, string scriptType, string sqlScript, string? createdBy = null)
         {
             ExecuteCount++;
@@ -681,4 +681,85 @@ public class PostgreSQLDDLGeneratorTests
         fields.Should().Contain(f => f.PropertyName == "Code" && f.DataType == FieldDataType.String && f.Length == 64);
         fields.Should().Contain(f => f.PropertyName == "Name" && f.DataType == FieldDataType.String && f.Length == 256);
     }
+
+    [Fact]
+    public void GenerateCreateTableScript_ShouldCreateDeclaredFieldIndexes()
+    {
+        var entity = new EntityDefinition
+        {
+            Id = Guid.NewGuid(),
+            Namespace = "BobCrm.Test",
+            EntityName = "Customer",
+            Fields = new List<FieldMetadata>
+            {
+                new() { PropertyName = "TierId", DataType = FieldDataType.Integer, IsIndexed = true, SortOrder = 1 },
+                new() { PropertyName = "Email", DataType = FieldDataType.String, Length = 200, IsUnique = true, SortOrder = 2 },
+                new() { PropertyName = "Note", DataType = FieldDataType.String, SortOrder = 3 },
+                new() { PropertyName = "Legacy", DataType = FieldDataType.String, IsIndexed = true, IsDeleted = true, SortOrder = 4 }
+            },
+            Interfaces = new List<EntityInterface>()
+        };
+
+        var ddl = _generator.GenerateCreateTableScript(entity);
+
+        ddl.Should().Contain("CREATE INDEX IF NOT EXISTS \"IX_Customers_TierId\" ON \"Customers\" (\"TierId\");");
+        ddl.Should().Contain("CREATE UNIQUE INDEX IF NOT EXISTS \"UX_Customers_Email\" ON \"Customers\" (\"Email\");");
+        ddl.Should().NotContain("\"IX_Customers_Note\"");
+        ddl.Should().NotContain("\"IX_Customers_Legacy\"");
+        ddl.Should().NotContain("CONCURRENTLY");
+    }
+
+    [Fact]
+    public void GenerateAlterTableIndexes_ShouldUseConcurrently_ForExistingTables()
+    {
+        var entity = new EntityDefinition
+        {
+            Id = Guid.NewGuid(),
+            Namespace = "BobCrm.Test",
+            EntityName = "Customer",
+            Interfaces = new List<EntityInterface>()
+        };
+
+        var ddl = _generator.GenerateAlterTableIndexes(
+            entity,
+            new[] { new FieldIndexDefinition("UX_Customers_Email", "Email", true) },
+            new[] { "IX_Customers_Note" });
+
+        ddl.Should().Contain("DROP INDEX CONCURRENTLY IF EXISTS \"IX_Customers_Note\";");
+        ddl.Should().Contain("CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS \"UX_Customers_Email\" ON \"Customers\" (\"Email\");");
+        ddl.IndexOf("DROP INDEX", StringComparison.Ordinal).Should().BeLessThan(ddl.IndexOf("CREATE UNIQUE INDEX", StringComparison.Ordinal));
+    }
+
+    [Fact]
+    public void GetManagedIndexNames_ShouldIncludeInterfaceAndDeclaredIndexes()
+    {
+        var entity = new EntityDefinition
+        {
+            Id = Guid.NewGuid(),
+            Namespace = "BobCrm.Test",
+            EntityName = "Customer",
+            Fields = new List<FieldMetadata>
+            {
+                new() { PropertyName = "Code", DataType = FieldDataType.String, SortOrder = 1 },
+                new() { PropertyName = "TierId", DataType = FieldDataType.Integer, IsIndexed = true, SortOrder = 2 }
+            },
+            Interfaces = new List<EntityInterface>
+            {
+                new() { InterfaceType = EntityInterfaceType.Archive, IsEnabled = true }
+            }
+        };
+
+        var names = _generator.GetManagedIndexNames(entity);
+
+        names.Should().BeEquivalentTo(new[] { "UX_Customers_Code", "IX_Customers_TierId" });
+    }
+
+    [Fact]
+    public void BuildIndexName_ShouldTruncateToPostgreSqlIdentifierLength()
+    {
+        var name = PostgreSQLDDLGenerator.BuildIndexName("IX", "Test_Account_" + new string('a', 40) + "s", "SomeLongPropertyName");
+
+        name.Should().HaveLength(63);
+        name.Should().StartWith("IX_Test_Account_");
+    }
 }
@@ -37,6 +37,9 @@ public class SystemEndpointsTests : IClassFixture<TestWebAppFactory>
         var client = await GetAuthenticatedClientAsync();
         var resp = await client.GetAsync("/api/system/info");
         Assert.Equal(HttpStatusCode.OK, resp.StatusCode);
+        var data = (await resp.ReadAsJsonAsync()).GetProperty("data");
+        Assert.True(data.GetProperty("gcHeapSizeBytes").GetInt64() >= 0);
+        Assert.True(data.GetProperty("gen0Collections").GetInt32() >= data.GetProperty("gen2Collections").GetInt32());
     }
 
     [Fact]
@@ -11,8 +11,8 @@ def test_auth_004_logout(auth_admin: Page):
     page = auth_admin
     
     # A1: Verify dashboard
+    page.goto(f"{BASE_URL}/")
     expect(page).to_have_url(f"{BASE_URL}/")
-    page.wait_for_timeout(1000)
 
     # Sanity: ensure we're actually logged in (token present).
     has_token = page.evaluate("localStorage.getItem('accessToken') != null")
@@ -45,10 +45,9 @@ def test_org_001_structure(auth_admin: Page, cleanup_org):
     ).click()
     
     # Wait for save to complete and tree to update
-    # Wait for API call and UI update (LoadTree selects persisted node, enabling "Add Child").
-    page.wait_for_timeout(800)
+    # (LoadTree selects persisted node, enabling "Add Child"); expect() polls instead of a fixed sleep.
     # Verify root appears in tree (format: "HQ - 总公司")
-    expect(page.locator("button.org-tree-node:has-text('HQ - 总公司')")).to_be_visible(timeout=5000)
+    expect(page.locator("button.org-tree-node:has-text('HQ - 总公司')")).to_be_visible(timeout=8000)
     
     # C1: Create Child Organization
     # Wait for children panel "Add" button to be enabled (parent must be persisted, not Guid.Empty).
@@ -74,15 +73,12 @@ def test_org_001_structure(auth_admin: Page, cleanup_org):
         name=re.compile(r"保存|Save|BTN_SAVE"),
     ).click()
     
-    # Wait for save to complete and UI to update
-    page.wait_for_timeout(1500)
-    
     # Verify child appears - it should be in the children table or tree
-    # Check both table and tree
+    # Check both table and tree (expect() polls until the save has updated the UI)
     child_in_table = page.locator(".org-table tbody tr:has-text('技术部')")
     child_in_tree = page.locator("button.org-tree-node:has-text('技术部')")
     
     # At least one should be visible
-    expect(child_in_table.or_(child_in_tree)).to_be_visible(timeout=5000)
+    expect(child_in_table.or_(child_in_tree)).to_be_visible(timeout=8000)
     
     page.screenshot(path="tests/e2e/screenshots/TC-ORG-001-structure.png")
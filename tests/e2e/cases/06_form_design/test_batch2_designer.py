@@ -1,6 +1,7 @@
 import os
 import json
 import uuid
+import pytest
 import requests
 
 from utils.api import api_helper
@@ -159,6 +160,7 @@ def _ensure_price_in_tabbox(layout: list[dict]) -> list[dict]:
     return next_layout
 
 
+@pytest.mark.api_only
 def test_batch2_002_designer_payload_update_persists(standard_product):
     entity_type = standard_product["entity_route"]
     tpl = _ensure_editable_detail_binding_template(entity_type)
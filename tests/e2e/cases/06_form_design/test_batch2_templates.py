@@ -1,5 +1,6 @@
 import os
 import json
+import pytest
 import requests
 
 from utils.api import api_helper
@@ -30,6 +31,7 @@ def _get_template_detail(template_id: int) -> dict:
     return resp.json()["data"]
 
 
+@pytest.mark.api_only
 def test_batch2_001_default_templates_generated(standard_product):
     entity_type = standard_product["entity_route"]
 
@@ -73,19 +73,16 @@ def ensure_test_product_ready():
     )
     assert compile_resp.status_code == 200, compile_resp.text
 
-def test_data_001_dynamic_crud(auth_admin, page: Page):
-    page = auth_admin
+@pytest.mark.api_only
+def test_data_001_dynamic_crud(api_admin):
     # Pre-req: TestProduct entity exists and is published (created in entity lifecycle test).
     ensure_test_product_ready()
-    page.goto(f"{BASE_URL}/dynamic-entity/{TEST_PRODUCT_FULL_TYPE}")
-    
+
     # Create via API (UI save can be blocked by validation rules not represented in the modal yet).
     assert api_helper.login_as_admin()
     resp = api_helper.post(f"/api/dynamic-entities/{TEST_PRODUCT_FULL_TYPE}", {"ProductName": "AutoTest Product"})
     assert resp.status_code in (200, 201), resp.text
 
-    page.screenshot(path="tests/e2e/screenshots/TC-DATA-001-created.png")
-
     found = False
     for _ in range(20):
         val = db_helper.execute_scalar('SELECT COUNT(*) FROM "TestProducts" WHERE "ProductName" = \'AutoTest Product\'')
@@ -111,10 +108,8 @@ END $$;
         """.strip()
     )
 
-def test_crm_001_customer(auth_admin, page: Page):
-    page = auth_admin
-    page.goto(f"{BASE_URL}/customers")
-
+@pytest.mark.api_only
+def test_crm_001_customer(api_admin, lazy_page):
     assert api_helper.login_as_admin()
     suffix = str(int(time.time()))
     code = f"AUTO_TEST_{suffix}"
@@ -137,7 +132,10 @@ def test_crm_001_customer(auth_admin, page: Page):
                 break
             time.sleep(0.5)
         assert found, "Expected customer row to be created in Customers"
-    page.screenshot(path="tests/e2e/screenshots/TC-CRM-001-customer.png")
+    else:
+        # No Customers table to verify against: fall back to the UI as evidence (launches the browser).
+        lazy_page.goto(f"{BASE_URL}/customers")
+        lazy_page.screenshot(path="tests/e2e/screenshots/TC-CRM-001-customer.png")
     
     if db_helper.table_exists("Customers"):
         db_helper.execute_query(f'DELETE FROM "Customers" WHERE "Code" = \'{code}\' OR "Name" = \'{name}\'')
@@ -0,0 +1,97 @@
+import os
+
+import pytest
+import requests
+from playwright.sync_api import Page, expect
+
+from utils.api import api_helper
+from utils.db import db_helper
+
+BASE_URL = os.getenv("BASE_URL", "http://localhost:3000").rstrip("/")
+API_BASE = os.getenv("API_BASE", "http://localhost:5200").rstrip("/")
+ROW_PREFIX = "CircuitTraffic"
+
+# TC-PERF-002 Blazor Server 电路流量（SignalR 消息数 / 字节数 / 往返延迟，按用户操作统计）
+# 结果汇总在 reports/circuit_traffic_latest.json，终端输出最重的交互。
+
+
+def _designer_template_id(product) -> int:
+    assert api_helper.login_as_admin()
+    binding = requests.get(
+        f"{API_BASE}/api/templates/bindings/{product['entity_route']}",
+        params={"usageType": "Detail"},
+        headers=api_helper.get_headers(),
+        timeout=30,
+    )
+    assert binding.status_code == 200, binding.text
+    return binding.json()["data"]["templateId"]
+
+
+def _assert_round_trips(actions: list[dict], names: list[str]):
+    by_name = {a["name"]: a for a in actions}
+    for name in names:
+        assert by_name[name]["messages_received"] > 0, f"No circuit traffic recorded for '{name}'"
+
+
+def test_perf_002_designer_circuit_traffic(auth_admin: Page, standard_product, circuit_traffic):
+    page = auth_admin
+    template_id = _designer_template_id(standard_product)
+
+    with circuit_traffic.action("open designer"):
+        page.goto(f"{BASE_URL}/designer/{template_id}")
+        expect(page.locator(".designer-canvas")).to_be_visible(timeout=15000)
+
+    cards = page.locator(".designer-canvas .card")
+    expect(cards.first).to_be_visible(timeout=8000)
+    with circuit_traffic.action("select widget"):
+        cards.first.click()
+        expect(page.locator(".designer-canvas .selected-widget")).to_be_visible(timeout=8000)
+
+    if cards.count() > 1:
+        with circuit_traffic.action("switch selected widget"):
+            cards.nth(1).click()
+
+    widgets_before = cards.count()
+    with circuit_traffic.action("drop palette widget"):
+        page.locator(".designer-palette-item").first.drag_to(
+            page.locator(".frame-drop-zone[data-container-id='root']").first
+        )
+        expect(cards).to_have_count(widgets_before + 1, timeout=8000)
+
+    _assert_round_trips(circuit_traffic.actions, ["select widget", "drop palette widget"])
+
+
+@pytest.fixture
+def product_rows(standard_product):
+    assert api_helper.login_as_admin()
+    for i in range(5):
+        resp = api_helper.post(
+            f"/api/dynamic-entities/{standard_product['full_type_name']}",
+            {"Name": f"{ROW_PREFIX} {i}", "Price": 10 + i, "IsActive": True},
+        )
+        assert resp.status_code in (200, 201), resp.text
+    yield standard_product
+    db_helper.execute_query(f'DELETE FROM "Products" WHERE "Name" LIKE \'{ROW_PREFIX}%\'')
+
+
+def test_perf_002_dynamic_list_circuit_traffic(auth_admin: Page, product_rows, circuit_traffic):
+    page = auth_admin
+    url = f"{BASE_URL}/dynamic-entity/{product_rows['full_type_name']}"
+    edit_buttons = page.locator("[data-testid='dynamic-entity-edit']")
+
+    # 列表页当前没有分页控件：用重复加载列表 + 打开/关闭编辑弹窗衡量每次交互的电路流量。
+    for i in range(3):
+        with circuit_traffic.action(f"load list #{i + 1}"):
+            page.goto(url)
+            expect(edit_buttons.first).to_be_visible(timeout=15000)
+
+    for i in range(3):
+        modal = page.locator(".ant-modal:visible")
+        with circuit_traffic.action(f"open edit modal #{i + 1}"):
+            edit_buttons.nth(i).click()
+            expect(modal).to_be_visible(timeout=8000)
+        with circuit_traffic.action(f"close edit modal #{i + 1}"):
+            page.keyboard.press("Escape")
+            expect(modal).to_have_count(0, timeout=8000)
+
+    _assert_round_trips(circuit_traffic.actions, ["open edit modal #1", "close edit modal #1"])
@@ -0,0 +1,69 @@
+import json
+import os
+from datetime import datetime, timezone
+
+import pytest
+import requests
+from playwright.sync_api import Page
+
+from utils.api import api_helper
+from utils.page_metrics import PERF_OBSERVER_INIT_SCRIPT, check_budgets, collect_page_metrics, load_budgets
+
+BASE_URL = os.getenv("BASE_URL", "http://localhost:3000").rstrip("/")
+API_BASE = os.getenv("API_BASE", "http://localhost:5200").rstrip("/")
+BUDGETS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "page_budgets.json")
+BUDGETS = load_budgets(BUDGETS_PATH)
+REPORT_PATH = os.path.join("tests", "e2e", "reports", "page_budgets_latest.json")
+
+# TC-PERF-001 前端页面性能预算（Navigation Timing / LCP / Long Task / JS Heap / 电路就绪）
+
+
+@pytest.fixture(scope="module")
+def budget_results():
+    results = []
+    yield results
+    os.makedirs(os.path.dirname(REPORT_PATH), exist_ok=True)
+    with open(REPORT_PATH, "w", encoding="utf-8") as f:
+        json.dump(
+            {"generated_at_utc": datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ"), "results": results},
+            f,
+            ensure_ascii=False,
+            indent=2,
+        )
+
+
+def _resolve_route(route: str, request) -> str:
+    """Fill route parameters from the standard Product entity (published + default templates)."""
+    if "{" not in route:
+        return route
+    product = request.getfixturevalue("standard_product")
+    if route == "/dynamic-entity/{fullTypeName}":
+        return f"/dynamic-entity/{product['full_type_name']}"
+    if route == "/designer/{id}":
+        assert api_helper.login_as_admin()
+        binding = requests.get(
+            f"{API_BASE}/api/templates/bindings/{product['entity_route']}",
+            params={"usageType": "Detail"},
+            headers=api_helper.get_headers(),
+            timeout=30,
+        )
+        assert binding.status_code == 200, binding.text
+        return f"/designer/{binding.json()['data']['templateId']}"
+    pytest.skip(f"No resolver for route parameters: {route}")
+
+
+@pytest.mark.parametrize("route", sorted(BUDGETS["routes"]))
+def test_perf_001_page_budget(auth_admin: Page, request, budget_results, route):
+    page = auth_admin
+    budget = {**BUDGETS.get("defaults", {}), **BUDGETS["routes"][route]}
+    target = _resolve_route(route, request)
+
+    page.context.add_init_script(PERF_OBSERVER_INIT_SCRIPT)
+    page.goto(f"{BASE_URL}{target}")
+    page.wait_for_load_state("load")
+
+    metrics = collect_page_metrics(page)
+    violations = check_budgets(metrics, budget)
+    budget_results.append({"route": route, "url": target, "metrics": metrics, "budget": budget, "violations": violations})
+
+    assert not violations, f"{route} exceeded budget: {', '.join(violations)}"
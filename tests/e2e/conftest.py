@@ -1,21 +1,70 @@
 import pytest
 import os
-from playwright.sync_api import sync_playwright, expect
+from playwright.sync_api import sync_playwright
 import time
 import json
+import re
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from utils.db import db_helper, drop_all_dynamic_content
-from utils.api import api_helper
+from utils.api import api_helper, ApiHelper
+from utils.pg_activity import PgActivitySampler
+from utils.page_metrics import CIRCUIT_READY_JS
+from utils.network import ApiRecordingProxy, BrowserRequestRecorder, build_waterfall, write_waterfall
+from utils.auth_state import build_storage_state
+from utils.fixture_timing import FixtureTimingPlugin, note_cache
+from utils.duration_history import DEFAULT_DB_PATH, DurationHistory, estimate_durations, schedule
+from utils.tracing import SpanCollector, new_trace_id, slowest_spans, span_category
+from utils.circuit_traffic import CircuitTrafficRecorder, heaviest_actions, write_traffic_report
+from utils.harness_profile import HarnessProfilePlugin
 import requests
 from datetime import datetime, timezone
+from urllib.parse import urlsplit
 
 # Config
 BASE_URL = os.getenv("BASE_URL", "http://localhost:3000").rstrip("/")
 API_BASE = os.getenv("API_BASE", "http://localhost:5200").rstrip("/")
 E2E_LANG = os.getenv("E2E_LANG", "en").strip() or "en"
+E2E_WATERFALL = os.getenv("E2E_WATERFALL", "").strip().lower() in ("1", "true", "yes")
+E2E_CIRCUIT_TRAFFIC = os.getenv("E2E_CIRCUIT_TRAFFIC", "").strip().lower() in ("1", "true", "yes")
+# Trace-context propagation (opt-in): API calls carry a per-test traceparent and the API exports its
+# spans to the local collector (run the API with Telemetry__OtlpEndpoint=<collector endpoint>).
+E2E_OTEL = os.getenv("E2E_OTEL", "").strip().lower() in ("1", "true", "yes")
+E2E_OTEL_FLUSH_S = float(os.getenv("E2E_OTEL_FLUSH_S", "6"))
+E2E_PG_WATCHDOG = os.getenv("E2E_PG_WATCHDOG", "").strip().lower() in ("1", "true", "yes")
+# Duration history (SQLite, appended every run; "off" disables) and runtime-aware scheduling:
+# E2E_SCHEDULE=longest-first reorders by history, E2E_SHARD=i/N runs only bin i of N (LPT bin packing),
+# under pytest-xdist (--dist loadgroup) each bin becomes an xdist_group.
+E2E_DURATION_DB = os.getenv("E2E_DURATION_DB", DEFAULT_DB_PATH).strip()
+E2E_FIXTURE_TIMING = os.getenv("E2E_FIXTURE_TIMING", "1").strip().lower() not in ("0", "false", "no", "off")
+E2E_HARNESS_PROFILE = os.getenv("E2E_HARNESS_PROFILE", "").strip().lower() in ("1", "true", "yes")
+E2E_SCHEDULE = os.getenv("E2E_SCHEDULE", "").strip().lower()
+E2E_SHARD = os.getenv("E2E_SHARD", "").strip()
 VIDEO_DIR = "tests/e2e/videos"
+TRACE_DIR = "tests/e2e/traces"
 SCREENSHOT_DIR = "tests/e2e/screenshots"
+# Artifact policy: "retain-on-failure" (default) keeps video/trace only for failed or retried tests,
+# "on" keeps everything, "off" does not record at all.
+E2E_VIDEO = os.getenv("E2E_VIDEO", "retain-on-failure").strip().lower()
+E2E_TRACING = os.getenv("E2E_TRACING", "retain-on-failure").strip().lower()
+VIDEO_SIZE = {"width": 1280, "height": 720}
+# Session storage states are rebuilt after this age so the shared access token never expires mid-run.
+E2E_STORAGE_STATE_TTL_S = float(os.getenv("E2E_STORAGE_STATE_TTL_S", "1800"))
+ADMIN_CREDENTIALS = ("admin", "Admin@12345")
+_ROUTE_ID_SEGMENT = re.compile(r"^(\d+|[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12})$")
 _STANDARD_PRODUCT_CACHE = None
 _E2E_DURATIONS = []  # list[dict]
+_E2E_PHASES = {}  # nodeid -> {"setup_s", "call_s", "teardown_s", "outcome"} for the duration history
+_E2E_PAGE_READINESS = []  # list[dict]: time-to-interactive per navigation
+_E2E_WATERFALLS = []  # list[dict]: per-test request counts / over-fetching findings
+_API_PROXY = None  # ApiRecordingProxy when E2E_WATERFALL is on
+_SPAN_COLLECTOR = None  # SpanCollector when E2E_OTEL is on
+_E2E_TRACE_IDS = {}  # nodeid -> trace id sent in traceparent
+_E2E_CIRCUIT_TRAFFIC = []  # list[dict]: per-test SignalR circuit traffic, grouped by user action
+_CIRCUIT_RECORDERS = {}  # nodeid -> CircuitTrafficRecorder for the running test
+_ARTIFACT_STATS = {"videos_kept": 0, "videos_discarded": 0, "bytes_discarded": 0, "traces_kept": 0, "finalize_s": 0.0}
+_ARTIFACT_CLEANER = ThreadPoolExecutor(max_workers=1, thread_name_prefix="e2e-artifact-cleaner")
 
 @pytest.fixture(scope="session", autouse=True)
 def ensure_admin_exists():
@@ -67,6 +116,85 @@ def ensure_admin_exists():
     except Exception as ex:
         pytest.fail(f"Global cleanup failed after E2E session: {ex}")
 
+@pytest.fixture(scope="session", autouse=True)
+def pg_connection_watchdog():
+    """
+    FIX-05: opt-in (E2E_PG_WATCHDOG=1) pg_stat_activity sampler for the whole session.
+
+    Fails the session when connections grow monotonically or idle-in-transaction sessions
+    outlive the threshold (E2E_PG_IDLE_TX_THRESHOLD_S, default 30s).
+    """
+    if not E2E_PG_WATCHDOG:
+        yield None
+        return
+
+    sampler = PgActivitySampler(
+        interval_s=float(os.getenv("E2E_PG_INTERVAL_S", "2")),
+        idle_in_tx_threshold_s=float(os.getenv("E2E_PG_IDLE_TX_THRESHOLD_S", "30")),
+    ).start()
+    yield sampler
+    sampler.stop()
+
+    out_path = sampler.write_timeseries(os.path.join("tests", "e2e", "reports", "pg_activity_latest.json"))
+    print(f"[E2E] pg_stat_activity time series written: {out_path}")
+    problems = sampler.problems()
+    if problems:
+        pytest.fail("SQL connection watchdog: " + "; ".join(problems))
+
+@pytest.fixture(scope="session", autouse=True)
+def api_recording_proxy():
+    """
+    Opt-in (E2E_WATERFALL=1): forward the App's API calls through a recording proxy.
+
+    Blazor Server calls the API from the App process, so browser network events never see them;
+    contexts get apiBase pointed at this proxy instead (see _client_api_base).
+    """
+    global _API_PROXY
+    if not E2E_WATERFALL:
+        yield None
+        return
+
+    _API_PROXY = ApiRecordingProxy(
+        API_BASE,
+        host=os.getenv("E2E_API_PROXY_HOST", "127.0.0.1"),
+        port=int(os.getenv("E2E_API_PROXY_PORT", "0")),
+    ).start()
+    print(f"[E2E] API recording proxy: {_API_PROXY.url} -> {API_BASE}")
+    yield _API_PROXY
+    _API_PROXY.stop()
+    _API_PROXY = None
+
+@pytest.fixture(scope="session", autouse=True)
+def otel_span_collector():
+    """
+    Opt-in (E2E_OTEL=1): local OTLP/HTTP receiver for the API's spans. It stays up until the
+    terminal summary so the exporter's last batch is still received.
+    """
+    global _SPAN_COLLECTOR
+    if E2E_OTEL and _SPAN_COLLECTOR is None:
+        _SPAN_COLLECTOR = SpanCollector(
+            host=os.getenv("E2E_OTEL_HOST", "127.0.0.1"),
+            port=int(os.getenv("E2E_OTEL_PORT", "4318")),
+        ).start()
+        print(f"[E2E] OTLP span collector: {_SPAN_COLLECTOR.endpoint} (API: Telemetry__OtlpEndpoint)")
+    yield _SPAN_COLLECTOR
+
+@pytest.fixture(autouse=True)
+def _test_trace_context(request, otel_span_collector):
+    """One trace per test: api_helper calls carry a traceparent whose trace id maps back to the nodeid."""
+    if otel_span_collector is None:
+        yield
+        return
+    trace_id = new_trace_id()
+    _E2E_TRACE_IDS[request.node.nodeid] = trace_id
+    api_helper.trace_id, api_helper.trace_label = trace_id, request.node.nodeid
+    yield
+    api_helper.trace_id = api_helper.trace_label = None
+
+def _client_api_base() -> str:
+    """apiBase handed to the browser/App: the recording proxy when active, the API otherwise."""
+    return _API_PROXY.url if _API_PROXY is not None else API_BASE
+
 @pytest.fixture
 def clean_platform():
     """
@@ -100,44 +228,152 @@ def clean_platform():
 
 @pytest.fixture(scope="session")
 def browser_context_args(browser_context_args):
+    # Video recording is owned by the `context` fixture (retention policy), not the plugin default.
     return {
         **browser_context_args,
-        "record_video_dir": VIDEO_DIR,
-        "record_video_size": {"width": 1280, "height": 720}
+        "viewport": VIDEO_SIZE,
     }
 
-@pytest.fixture(scope="function")
-def context(browser):
-    # Create distinct context for each test to ensure isolation
-    context = browser.new_context(
-        record_video_dir=VIDEO_DIR,
-        record_video_size={"width": 1280, "height": 720},
-        viewport={"width": 1280, "height": 720}
+@pytest.fixture(scope="session")
+def auth_storage_state(api_recording_proxy):
+    """
+    Session-level Playwright storage states, built once per identity via API login.
+
+    Returns a getter: (username, password) -> {"state", "access_token", "refresh_token"}, where
+    "state" (cookies + localStorage for BASE_URL) is passed to browser.new_context(storage_state=...),
+    so pages start authenticated without a /login round trip.
+    """
+    cache = {}
+
+    def _get(username: str, password: str) -> dict:
+        cached = cache.get(username)
+        if cached and time.monotonic() - cached["built_at"] < E2E_STORAGE_STATE_TTL_S:
+            note_cache("auth_storage_state", hit=True)
+            return cached
+        note_cache("auth_storage_state", hit=False)
+
+        helper = ApiHelper()
+        if not helper.login(username, password):
+            pytest.fail(f"Failed to login via API for storage state: {username}")
+
+        state = build_storage_state(helper, BASE_URL, E2E_LANG, _client_api_base())
+        cache[username] = {
+            "state": state,
+            "access_token": helper.token,
+            "refresh_token": helper.refresh_token,
+            "built_at": time.monotonic(),
+        }
+        return cache[username]
+
+    return _get
+
+def _artifact_name(node) -> str:
+    return "".join(c if c.isalnum() or c in "-_." else "_" for c in node.name)
+
+def _should_retain(node, policy: str) -> bool:
+    if policy == "on":
+        return True
+    failed = any(
+        getattr(getattr(node, f"rep_{when}", None), "failed", False) for when in ("setup", "call", "teardown")
     )
+    retried = getattr(node, "execution_count", 1) > 1
+    return failed or retried
+
+def _discard_dir(path: str):
+    size = 0
+    for root, _, files in os.walk(path):
+        for f in files:
+            try:
+                size += os.path.getsize(os.path.join(root, f))
+            except OSError:
+                pass
+    shutil.rmtree(path, ignore_errors=True)
+    _ARTIFACT_STATS["bytes_discarded"] += size
+
+@pytest.fixture(scope="function")
+def context(browser, request):
+    # Create distinct context for each test to ensure isolation.
+    # Video goes to a per-test temp dir; only failed/retried tests keep it (see E2E_VIDEO).
+    record_dir = tempfile.mkdtemp(prefix="bobcrm-e2e-video-") if E2E_VIDEO != "off" else None
+    context_args = {"viewport": VIDEO_SIZE}
+    if "auth_admin" in request.fixturenames or "lazy_page" in request.fixturenames:
+        # Start already authenticated from the session storage state (see auth_admin).
+        context_args["storage_state"] = request.getfixturevalue("auth_storage_state")(*ADMIN_CREDENTIALS)["state"]
+    if record_dir:
+        context_args.update(record_video_dir=record_dir, record_video_size=VIDEO_SIZE)
+    context = browser.new_context(**context_args)
+    # `page` closes its page before this teardown runs, so track videos as pages open.
+    videos = []
+    context.on("page", lambda p: videos.append(p.video) if p.video else None)
+
+    if E2E_TRACING != "off":
+        context.tracing.start(screenshots=True, snapshots=True, sources=False)
 
     # Ensure required client-side config exists for each isolated context.
     context.add_cookies(
         [
             {"name": "lang", "value": E2E_LANG.lower(), "url": BASE_URL},
-            {"name": "apiBase", "value": API_BASE, "url": BASE_URL},
+            {"name": "apiBase", "value": _client_api_base(), "url": BASE_URL},
         ]
     )
     context.add_init_script(
         f"""
         try {{
             localStorage.setItem('lang', '{E2E_LANG.lower()}');
-            localStorage.setItem('apiBase', '{API_BASE}');
+            localStorage.setItem('apiBase', '{_client_api_base()}');
             localStorage.setItem('configured', 'true');
         }} catch (e) {{}}
         """
     )
 
     yield context
+
+    name = _artifact_name(request.node)
+    if E2E_TRACING != "off":
+        try:
+            if _should_retain(request.node, E2E_TRACING):
+                os.makedirs(TRACE_DIR, exist_ok=True)
+                context.tracing.stop(path=os.path.join(TRACE_DIR, f"{name}.zip"))
+                _ARTIFACT_STATS["traces_kept"] += 1
+            else:
+                context.tracing.stop()
+        except Exception as ex:
+            print(f"[E2E] Failed to stop tracing: {ex}")
+
+    # Closing the context flushes and finalizes the video encoding.
+    t0 = time.perf_counter()
     context.close()
+    _ARTIFACT_STATS["finalize_s"] += time.perf_counter() - t0
+
+    if not record_dir:
+        return
+    if _should_retain(request.node, E2E_VIDEO):
+        os.makedirs(VIDEO_DIR, exist_ok=True)
+        for i, video in enumerate(videos):
+            try:
+                suffix = f"_{i}" if i else ""
+                shutil.move(video.path(), os.path.join(VIDEO_DIR, f"{name}{suffix}.webm"))
+                _ARTIFACT_STATS["videos_kept"] += 1
+            except Exception as ex:
+                print(f"[E2E] Failed to keep video: {ex}")
+        _ARTIFACT_CLEANER.submit(shutil.rmtree, record_dir, True)
+    else:
+        _ARTIFACT_STATS["videos_discarded"] += len(videos)
+        _ARTIFACT_CLEANER.submit(_discard_dir, record_dir)
+
+def _route_key(url: str) -> str:
+    """Normalize a URL to a route pattern (ids -> {id}) for per-route readiness stats."""
+    path = urlsplit(url).path or "/"
+    return "/".join("{id}" if _ROUTE_ID_SEGMENT.match(seg) else seg for seg in path.split("/")) or "/"
 
 @pytest.fixture(scope="function")
-def page(context):
+def page(context, request):
     page = context.new_page()
+    recorder = BrowserRequestRecorder(page) if E2E_WATERFALL else None
+    if E2E_CIRCUIT_TRAFFIC and context.browser and context.browser.browser_type.name == "chromium":
+        _CIRCUIT_RECORDERS[request.node.nodeid] = CircuitTrafficRecorder(page)
+    if _API_PROXY is not None:
+        _API_PROXY.current_test = request.node.nodeid
 
     # Make page.goto resilient for Blazor Server prerendering:
     # wait until app.js is loaded so event handlers & JS helpers exist.
@@ -158,19 +394,21 @@ def page(context):
             result = None
 
         if isinstance(url, str) and url.startswith(BASE_URL) and "/api/" not in url:
-            # Optional: wait for bobcrm helpers (may not be available during prerender).
+            # Required: wait for the circuit readiness signal, then record time-to-interactive.
+            t0 = time.perf_counter()
+            page.wait_for_function(CIRCUIT_READY_JS, timeout=15000)
+            wait_ms = (time.perf_counter() - t0) * 1000
             try:
-                page.wait_for_function(
-                    "() => typeof window !== 'undefined' && window.bobcrm && typeof window.bobcrm.getCookie === 'function'",
-                    timeout=15000,
-                )
+                tti_ms = page.evaluate("() => (window.bobcrm && window.bobcrm.circuitReadyAt) || null")
             except Exception:
-                pass
-
-            # Required: ensure the circuit is interactive (splash removed or stage ready).
-            page.wait_for_function(
-                "() => !document.querySelector('.app-splash') || document.querySelector('.app-stage.ready')",
-                timeout=15000,
+                tti_ms = None
+            _E2E_PAGE_READINESS.append(
+                {
+                    "nodeid": request.node.nodeid,
+                    "route": _route_key(url),
+                    "tti_ms": tti_ms,
+                    "ready_wait_ms": wait_ms,
+                }
             )
 
         return result
@@ -178,51 +416,104 @@ def page(context):
     page.goto = _goto_and_wait  # type: ignore[assignment]
 
     yield page
+    traffic = _CIRCUIT_RECORDERS.pop(request.node.nodeid, None)
+    if traffic is not None:
+        traffic.detach()
+        _E2E_CIRCUIT_TRAFFIC.append(
+            {"nodeid": request.node.nodeid, "totals": traffic.totals(), "actions": list(traffic.actions) or [traffic.unattributed()]}
+        )
     page.close()
 
+    if recorder is not None:
+        nodeid = request.node.nodeid
+        entries = list(recorder.entries)
+        if _API_PROXY is not None:
+            _API_PROXY.current_test = None
+            entries += _API_PROXY.entries_for(nodeid)
+        waterfall = build_waterfall(nodeid, entries)
+        path = write_waterfall(os.path.join("tests", "e2e", "reports", "waterfall"), _artifact_name(request.node), waterfall)
+        _E2E_WATERFALLS.append(
+            {
+                "nodeid": nodeid,
+                "path": path,
+                "requests": waterfall["requests"],
+                "by_source": waterfall["by_source"],
+                "duplicate_gets": sum(d["count"] - 1 for d in waterfall["duplicate_gets"]),
+                "serial_chains": len(waterfall["serial_chains"]),
+            }
+        )
+
 @pytest.fixture(scope="function")
-def auth_admin(page):
-    """Fixture to log in as admin via API and inject tokens into localStorage."""
-    if not api_helper.login_as_admin():
-        pytest.fail("Failed to login via API in auth_admin fixture")
+def circuit_traffic(page, request):
+    """
+    SignalR circuit traffic recorder for the current page (Chromium only, via CDP).
+    Always on for tests that request it; E2E_CIRCUIT_TRAFFIC=1 attaches it to every page.
+    """
+    nodeid = request.node.nodeid
+    if nodeid not in _CIRCUIT_RECORDERS:
+        if page.context.browser is None or page.context.browser.browser_type.name != "chromium":
+            pytest.skip("Circuit traffic capture needs Chromium (CDP websocket events)")
+        _CIRCUIT_RECORDERS[nodeid] = CircuitTrafficRecorder(page)
+    return _CIRCUIT_RECORDERS[nodeid]
 
-    page.goto(f"{BASE_URL}/login")
-    page.evaluate(
-        """
-        (tokens) => {
-            localStorage.setItem('accessToken', tokens.accessToken);
-            if (tokens.refreshToken) localStorage.setItem('refreshToken', tokens.refreshToken);
-            localStorage.setItem('lang', tokens.lang);
-            localStorage.setItem('apiBase', tokens.apiBase);
-            localStorage.setItem('configured', 'true');
-        }
-        """,
-        {
-            "accessToken": api_helper.token,
-            "refreshToken": api_helper.refresh_token,
-            "lang": E2E_LANG.lower(),
-            "apiBase": API_BASE,
-        },
-    )
+@pytest.fixture(scope="function")
+def auth_admin(page, auth_storage_state):
+    """
+    Admin page: its context was created from the session storage state (tokens in localStorage),
+    so no per-test login navigation is needed. Tests navigate to their own route.
+    """
+    session = auth_storage_state(*ADMIN_CREDENTIALS)
+    api_helper.token = session["access_token"]
+    api_helper.refresh_token = session["refresh_token"]
+    return page
 
-    page.goto(f"{BASE_URL}/")
-    expect(page).to_have_url(f"{BASE_URL}/", timeout=8000)
-    page.wait_for_timeout(1000)
+@pytest.fixture(scope="function")
+def api_admin(auth_storage_state):
+    """
+    Browserless admin session for API/DB-verifiable cases (fast lane, @pytest.mark.api_only):
+    reuses the session login tokens and never starts a Playwright context.
+    """
+    session = auth_storage_state(*ADMIN_CREDENTIALS)
+    api_helper.token = session["access_token"]
+    api_helper.refresh_token = session["refresh_token"]
+    return api_helper
 
-    token = page.evaluate("localStorage.getItem('accessToken')")
-    assert token is not None
+class _LazyPage:
+    """Proxy that creates the authenticated admin page on first use."""
 
-    return page
+    def __init__(self, request):
+        self._request = request
+        self._page = None
+
+    @property
+    def started(self) -> bool:
+        return self._page is not None
+
+    def __getattr__(self, name):
+        if self._page is None:
+            self._page = self._request.getfixturevalue("auth_admin")
+        return getattr(self._page, name)
+
+@pytest.fixture(scope="function")
+def lazy_page(request, api_admin):
+    """
+    Admin page that is only launched when the test actually touches it, so cases that usually stay
+    on API/DB checks (e.g. a screenshot on an unexpected state) do not pay for browser/context setup.
+    Pass lazy_page.<attr> results, not the proxy itself, to expect().
+    """
+    return _LazyPage(request)
 
 @pytest.fixture
-def standard_product(auth_admin):
+def standard_product(api_admin):
     """
     预置一个标准 Product 实体，包含 String, Decimal, Bool 等典型字段。
     确保它已发布并生成默认模板。
     """
     global _STANDARD_PRODUCT_CACHE
     if _STANDARD_PRODUCT_CACHE is not None:
+        note_cache("standard_product", hit=True)
         return _STANDARD_PRODUCT_CACHE
+    note_cache("standard_product", hit=False)
 
     assert api_helper.login_as_admin()
 
@@ -390,13 +681,113 @@ def save_page_content(page, name):
         print(f"保存页面内容失败: {e}")
     return path
 
+def pytest_addoption(parser):
+    group = parser.getgroup("bobcrm-e2e")
+    group.addoption(
+        "--harness-profile",
+        action="store_true",
+        default=E2E_HARNESS_PROFILE,
+        help="sample the harness per test: speedscope flamegraphs + harness/server/sleep breakdown (E2E_HARNESS_PROFILE=1)",
+    )
+    group.addoption(
+        "--harness-profile-interval-ms",
+        type=float,
+        default=float(os.getenv("E2E_HARNESS_PROFILE_INTERVAL_MS", "5")),
+        help="sampling interval of --harness-profile",
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers",
+        "api_only: API/DB-verifiable case that runs without a browser (fast lane: -m api_only, UI lane: -m 'not api_only')",
+    )
+    config.addinivalue_line("markers", "xdist_group(name): worker bin assigned by the duration-history scheduler")
+    if E2E_FIXTURE_TIMING and not config.pluginmanager.has_plugin("e2e-fixture-timing"):
+        config.pluginmanager.register(
+            FixtureTimingPlugin(os.path.join("tests", "e2e", "reports", "fixture_timing_latest.json")),
+            "e2e-fixture-timing",
+        )
+    if config.getoption("harness_profile") and not config.pluginmanager.has_plugin("e2e-harness-profile"):
+        config.pluginmanager.register(
+            HarnessProfilePlugin(
+                os.path.join("tests", "e2e", "reports"),
+                interval_s=config.getoption("harness_profile_interval_ms") / 1000.0,
+            ),
+            "e2e-harness-profile",
+        )
+
+
+def pytest_collection_modifyitems(config, items):
+    # The fast lane must stay browserless: an api_only case that requests the page fixtures eagerly is a bug.
+    eager = {"page", "context", "auth_admin"}
+    for item in items:
+        if item.get_closest_marker("api_only") and eager.intersection(getattr(item, "fixturenames", ())):
+            raise pytest.UsageError(
+                f"{item.nodeid} is marked api_only but requests {sorted(eager.intersection(item.fixturenames))}; "
+                "use api_admin / lazy_page instead"
+            )
+
+    if E2E_SCHEDULE == "longest-first" or E2E_SHARD:
+        _schedule_items(config, items)
+
+
+def _parse_shard(value: str) -> tuple[int, int]:
+    """E2E_SHARD "i/N" -> (i, N) with 1 <= i <= N."""
+    try:
+        index, total = (int(x) for x in value.split("/", 1))
+    except ValueError:
+        raise pytest.UsageError(f"E2E_SHARD must be i/N (e.g. 1/4), got {value!r}") from None
+    if not 1 <= index <= total:
+        raise pytest.UsageError(f"E2E_SHARD must be i/N with 1 <= i <= N, got {value!r}")
+    return index, total
+
+
+def _schedule_items(config, items):
+    """Order items longest-first from the duration history and pack them into worker bins."""
+    known = {}
+    if E2E_DURATION_DB != "off" and os.path.exists(E2E_DURATION_DB):
+        history = DurationHistory(E2E_DURATION_DB)
+        try:
+            known = history.estimates()
+        finally:
+            history.close()
+    estimates = estimate_durations([item.nodeid for item in items], known)
+
+    workers = int(getattr(config.option, "numprocesses", None) or os.getenv("E2E_WORKERS", "1") or 1)
+    shard_index = None
+    if E2E_SHARD:
+        index, total = _parse_shard(E2E_SHARD)
+        shard_index, workers = index - 1, total
+    bins = schedule([item.nodeid for item in items], estimates, workers)
+
+    by_id = {item.nodeid: item for item in items}
+    if shard_index is not None:
+        keep = set(bins[shard_index]["nodeids"])
+        deselected = [item for item in items if item.nodeid not in keep]
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+        ordered = [by_id[n] for n in bins[shard_index]["nodeids"]]
+    else:
+        for b in bins:
+            for nodeid in b["nodeids"]:
+                by_id[nodeid].add_marker(pytest.mark.xdist_group(f"e2e-bin-{b['worker']}"))
+        ordered = sorted(items, key=lambda item: estimates[item.nodeid], reverse=True)
+    items[:] = ordered
+
+
 # 失败时捕获截图的 Hook
 @pytest.hookimpl(tryfirst=True, hookwrapper=True)
 def pytest_runtest_makereport(item, call):
     outcome = yield
     rep = outcome.get_result()
+    # Expose phase reports to fixtures (artifact retention decides on teardown).
+    setattr(item, f"rep_{rep.when}", rep)
     if rep.when == "call" and rep.failed:
         page = item.funcargs.get("page")
+        lazy = item.funcargs.get("lazy_page")
+        if page is None and lazy is not None and lazy.started:
+            page = lazy._page
         if page:
             name = item.name
             take_screenshot(page, f"FAILURE_{name}")
@@ -407,6 +798,12 @@ def pytest_runtest_logreport(report):
     """
     Batch6: record per-test durations for regression matrix reporting.
     """
+    phases = _E2E_PHASES.setdefault(getattr(report, "nodeid", ""), {"outcome": "unknown"})
+    phases[f"{report.when}_s"] = float(getattr(report, "duration", 0.0) or 0.0)
+    if report.when == "call" or report.failed or report.skipped:
+        if phases["outcome"] in ("unknown", "passed"):
+            phases["outcome"] = report.outcome
+
     if report.when != "call":
         return
 
@@ -437,7 +834,58 @@ def pytest_terminal_summary(terminalreporter, exitstatus, config):
     """
     Batch6: print and persist a simple duration distribution summary.
     """
+    _ARTIFACT_CLEANER.shutdown(wait=True)
+    stats = _ARTIFACT_STATS
+    if stats["videos_kept"] or stats["videos_discarded"] or stats["traces_kept"]:
+        terminalreporter.write_sep("-", "E2E artifacts")
+        terminalreporter.write_line(
+            f"[E2E] video={E2E_VIDEO} tracing={E2E_TRACING}: kept {stats['videos_kept']} videos, "
+            f"{stats['traces_kept']} traces; discarded {stats['videos_discarded']} videos "
+            f"({stats['bytes_discarded'] / (1024 * 1024):.1f} MB not written to {VIDEO_DIR}); "
+            f"video finalize time {stats['finalize_s']:.1f}s"
+        )
+
+    if _E2E_WATERFALLS:
+        terminalreporter.write_sep("-", "E2E request waterfall (over-fetching)")
+        flagged = sorted(
+            (w for w in _E2E_WATERFALLS if w["duplicate_gets"] or w["serial_chains"]),
+            key=lambda w: (w["duplicate_gets"], w["serial_chains"]),
+            reverse=True,
+        )
+        for w in flagged[:15]:
+            terminalreporter.write_line(
+                f"{w['nodeid']}: {w['requests']} requests {w['by_source']}, "
+                f"{w['duplicate_gets']} duplicate GETs, {w['serial_chains']} serial chains -> {w['path']}"
+            )
+        if not flagged:
+            terminalreporter.write_line(f"[E2E] No duplicate GETs or serial chains in {len(_E2E_WATERFALLS)} tests")
+
+    if _E2E_CIRCUIT_TRAFFIC:
+        terminalreporter.write_sep("-", "E2E circuit traffic (heaviest interactions)")
+        for a in heaviest_actions(_E2E_CIRCUIT_TRAFFIC, top=10):
+            rtt = f"{a['rtt_ms']:.0f}ms" if a["rtt_ms"] is not None else "n/a"
+            terminalreporter.write_line(
+                f"{a['nodeid']} [{a['name']}]: {a['messages_sent']} sent / {a['messages_received']} received, "
+                f"{a['bytes_received'] / 1024:.1f} KB in, {a['render_batches']} render batches, rtt={rtt}"
+            )
+        path = write_traffic_report(os.path.join("tests", "e2e", "reports", "circuit_traffic_latest.json"), _E2E_CIRCUIT_TRAFFIC)
+        terminalreporter.write_line(f"[E2E] Circuit traffic report written: {path}")
+
+    if _E2E_PHASES and E2E_DURATION_DB != "off":
+        history = DurationHistory(E2E_DURATION_DB)
+        try:
+            run_id = history.record_run([{"nodeid": n, **p} for n, p in _E2E_PHASES.items()])
+            regressions = history.regressions()
+        finally:
+            history.close()
+        terminalreporter.write_line(f"[E2E] Duration history: run #{run_id} ({len(_E2E_PHASES)} tests) -> {E2E_DURATION_DB}")
+        for r in regressions[:5]:
+            terminalreporter.write_line(f"[E2E] Slower than baseline: {r['nodeid']} {r['baseline_s']:.1f}s -> {r['recent_s']:.1f}s")
+
     if not _E2E_DURATIONS:
+        if _SPAN_COLLECTOR is not None:
+            # Nothing to attach spans to (all tests errored in setup or were deselected): free the port.
+            _SPAN_COLLECTOR.stop()
         return
 
     durations = sorted(d["duration_s"] for d in _E2E_DURATIONS)
@@ -463,6 +911,47 @@ def pytest_terminal_summary(terminalreporter, exitstatus, config):
     terminalreporter.write_sep("-", "E2E durations (Batch6)")
     terminalreporter.write_line(json.dumps(summary, ensure_ascii=False))
 
+    # Page readiness: time-to-interactive per route (ms since navigation start).
+    readiness = {}
+    for r in _E2E_PAGE_READINESS:
+        if r["tti_ms"] is not None:
+            readiness.setdefault(r["route"], []).append(float(r["tti_ms"]))
+    readiness_summary = {}
+    for route, values in sorted(readiness.items()):
+        values.sort()
+        readiness_summary[route] = {
+            "count": len(values),
+            "p50_ms": values[int(round((len(values) - 1) * 0.5))],
+            "max_ms": values[-1],
+        }
+    if readiness_summary:
+        terminalreporter.write_sep("-", "E2E page readiness (time-to-interactive)")
+        for route, stat in sorted(readiness_summary.items(), key=lambda kv: kv[1]["p50_ms"], reverse=True)[:10]:
+            terminalreporter.write_line(
+                f"{route:<60} n={stat['count']:<3} p50={stat['p50_ms']:.0f}ms max={stat['max_ms']:.0f}ms"
+            )
+
+    # Server spans for the slowest tests (trace ids sent via traceparent, spans from the API exporter).
+    if _SPAN_COLLECTOR is not None:
+        try:
+            time.sleep(E2E_OTEL_FLUSH_S)
+            slow = sorted(_E2E_DURATIONS, key=lambda d: d["duration_s"], reverse=True)[:10]
+            terminalreporter.write_sep("-", f"E2E server spans for slow tests ({_SPAN_COLLECTOR.received} spans received)")
+            for d in slow:
+                spans = _SPAN_COLLECTOR.spans_for([_E2E_TRACE_IDS.get(d["nodeid"])])
+                if not spans:
+                    continue
+                by_category = {}
+                for span in spans:
+                    by_category[span_category(span)] = by_category.get(span_category(span), 0.0) + span["duration_ms"]
+                d["server_time_ms"] = {k: round(v, 1) for k, v in sorted(by_category.items())}
+                d["server_spans"] = slowest_spans(spans, top=5)
+                terminalreporter.write_line(f"{d['nodeid']} ({d['duration_s']:.1f}s): " + ", ".join(
+                    f"{s['category']}:{s['name']} {s['duration_ms']:.0f}ms" for s in d["server_spans"][:3]
+                ))
+        finally:
+            _SPAN_COLLECTOR.stop()
+
     # Write detailed report to disk (not intended to be committed)
     ts = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
     out_dir = os.path.join("tests", "e2e", "reports")
@@ -473,6 +962,7 @@ def pytest_terminal_summary(terminalreporter, exitstatus, config):
         "generated_at_utc": ts,
         "summary": summary,
         "items": _E2E_DURATIONS,
+        "page_readiness": {"routes": readiness_summary, "items": _E2E_PAGE_READINESS},
     }
     try:
         with open(out_path, "w", encoding="utf-8") as f:
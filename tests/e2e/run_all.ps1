@@ -1,5 +1,8 @@
 param(
     [string]$ResultId = "PC-001",
+    # all: every case; api: browserless fast lane (@pytest.mark.api_only); ui: browser cases only
+    [ValidateSet("all", "api", "ui")]
+    [string]$Lane = "all",
     [string[]]$PytestArgs = @()
 )
 
@@ -33,13 +36,22 @@ New-Item -ItemType Directory -Path $runDir -Force | Out-Null
 $artifactSources = @(
     Join-Path $e2eRoot "screenshots"
     Join-Path $e2eRoot "videos"
+    Join-Path $e2eRoot "traces"
     Join-Path $e2eRoot "reports"
 )
 
+$laneArgs = @()
+if ($Lane -eq "api") {
+    $laneArgs = @("-m", "api_only")
+}
+elseif ($Lane -eq "ui") {
+    $laneArgs = @("-m", "not api_only")
+}
+
 $exitCode = 0
 try {
     Push-Location $repoRoot
-    python -m pytest $e2eRoot @PytestArgs
+    python -m pytest $e2eRoot @laneArgs @PytestArgs
     $exitCode = $LASTEXITCODE
 }
 finally {
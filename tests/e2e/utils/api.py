@@ -1,8 +1,23 @@
 import requests
 import os
+from utils.tracing import trace_headers
 
 BASE_URL = os.getenv("BASE_URL", "http://localhost:3000").rstrip("/")
 API_BASE = os.getenv("API_BASE", "http://localhost:5200").rstrip("/")
+# /api/lookups/resolve keeps at most this many distinct ids per request.
+LOOKUP_RESOLVE_MAX_IDS = 2000
+
+
+def _field_value(record: dict, property_name: str):
+    """Record value by PropertyName, camelCase or any casing (query results use camelCase)."""
+    if property_name in record:
+        return record[property_name]
+    camel = property_name[:1].lower() + property_name[1:]
+    if camel in record:
+        return record[camel]
+    lowered = property_name.lower()
+    return next((v for k, v in record.items() if k.lower() == lowered), None)
+
 
 class ApiHelper:
     def __init__(self, base_url=BASE_URL, api_base=API_BASE):
@@ -10,12 +25,17 @@ class ApiHelper:
         self.api_base = api_base
         self.token = None
         self.refresh_token = None
+        # Set per test by conftest (E2E_OTEL=1): every call carries a traceparent in this trace.
+        self.trace_id = None
+        self.trace_label = None
+        # /api/lookups/resolve requests made by resolve_lookup_ids (benchmarks compare it to ids resolved).
+        self.lookup_resolve_calls = 0
 
     def login(self, username: str, password: str):
         """Logs in with provided credentials to get a token for subsequent API calls."""
         url = f"{self.api_base}/api/auth/login"
         payload = {"username": username, "password": password}
-        resp = requests.post(url, json=payload)
+        resp = requests.post(url, json=payload, headers=trace_headers(self.trace_id, self.trace_label))
         if resp.status_code == 200:
             data = resp.json()
             self.token = data["data"]["accessToken"]
@@ -31,8 +51,13 @@ class ApiHelper:
         headers = {"Content-Type": "application/json"}
         if self.token:
             headers["Authorization"] = f"Bearer {self.token}"
+        headers.update(trace_headers(self.trace_id, self.trace_label))
         return headers
 
+    def get(self, endpoint, params=None):
+        url = f"{self.api_base}{endpoint}"
+        return requests.get(url, params=params, headers=self.get_headers())
+
     def delete(self, endpoint):
         url = f"{self.api_base}{endpoint}"
         return requests.delete(url, headers=self.get_headers())
@@ -45,4 +70,51 @@ class ApiHelper:
         url = f"{self.api_base}{endpoint}"
         return requests.put(url, json=data, headers=self.get_headers())
 
+    def resolve_lookup_ids(self, target: str, ids, display_field: str | None = None,
+                           chunk_size: int = LOOKUP_RESOLVE_MAX_IDS) -> dict:
+        """Resolves ids of one lookup target to display text, one /api/lookups/resolve call per chunk."""
+        unique = list(dict.fromkeys(str(i).strip() for i in ids if i is not None and str(i).strip()))
+        labels = {}
+        for start in range(0, len(unique), chunk_size):
+            resp = self.post("/api/lookups/resolve", {
+                "target": target,
+                "ids": unique[start:start + chunk_size],
+                "displayField": display_field,
+            })
+            self.lookup_resolve_calls += 1
+            resp.raise_for_status()
+            labels.update(resp.json().get("data") or {})
+        return labels
+
+    def resolve_lookups(self, records, fields: list[dict]) -> dict:
+        """
+        Batch-resolves lookup display text for records (e.g. several query pages chained together).
+
+        `fields` is field metadata as returned by the API (propertyName, lookupEntityName, lookupDisplayField).
+        Ids are deduplicated across all fields pointing at the same target/display field and across all
+        records, so the cost follows distinct ids, not records x fields.
+        Returns {propertyName: {id: label}}; fields sharing a target share the same mapping.
+        """
+        groups: dict[tuple, dict] = {}
+        for field in fields:
+            target = (field.get("lookupEntityName") or "").strip()
+            if target:
+                key = (target.lower(), (field.get("lookupDisplayField") or "").strip())
+                groups.setdefault(key, {"target": target, "fields": [], "ids": {}})["fields"].append(field["propertyName"])
+        for record in records:
+            for group in groups.values():
+                for name in group["fields"]:
+                    value = _field_value(record, name)
+                    if isinstance(value, dict):
+                        value = value.get("id", value.get("Id"))
+                    if value is not None and str(value).strip():
+                        group["ids"][str(value).strip()] = None
+
+        resolved = {}
+        for (_, display_field), group in groups.items():
+            labels = self.resolve_lookup_ids(group["target"], group["ids"], display_field or None) if group["ids"] else {}
+            for name in group["fields"]:
+                resolved[name] = labels
+        return resolved
+
 api_helper = ApiHelper()
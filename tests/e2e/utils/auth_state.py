@@ -0,0 +1,32 @@
+"""
+Playwright storage states for authenticated Blazor sessions.
+
+The App reads the access/refresh tokens, language and apiBase from localStorage (and lang/apiBase
+cookies during prerender), so a context created with this state starts logged in without a
+/login round trip. Shared by the E2E conftest and the browser-driven load tools.
+"""
+
+
+def build_storage_state(helper, base_url: str, lang: str, api_base: str) -> dict:
+    """Storage state for base_url from a logged-in ApiHelper (helper.token / helper.refresh_token)."""
+    local_storage = {
+        "accessToken": helper.token,
+        "lang": lang.lower(),
+        "apiBase": api_base,
+        "configured": "true",
+    }
+    if helper.refresh_token:
+        local_storage["refreshToken"] = helper.refresh_token
+
+    domain = base_url.split("://", 1)[-1].split("/", 1)[0].split(":", 1)[0]
+    return {
+        "cookies": [
+            {"name": "lang", "value": lang.lower(), "domain": domain, "path": "/",
+             "expires": -1, "httpOnly": False, "secure": False, "sameSite": "Lax"},
+            {"name": "apiBase", "value": api_base, "domain": domain, "path": "/",
+             "expires": -1, "httpOnly": False, "secure": False, "sameSite": "Lax"},
+        ],
+        "origins": [
+            {"origin": base_url, "localStorage": [{"name": k, "value": v} for k, v in local_storage.items()]}
+        ],
+    }
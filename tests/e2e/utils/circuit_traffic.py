@@ -0,0 +1,148 @@
+"""
+SignalR circuit traffic instrumentation for Blazor Server pages (Chromium, via CDP).
+
+Every UI interaction in Blazor Server is a round trip over the circuit websocket: the browser sends
+an event (DispatchBrowserEvent / BeginInvokeDotNetFromJS) and the server answers with render batches
+(JS.RenderBatch). The recorder listens to Network.webSocketFrameSent/Received and attributes frames
+to named user actions:
+
+    with circuit_traffic.action("select widget"):
+        page.click(".designer-canvas .card")
+
+Per action it reports message counts, bytes in both directions and the round-trip latency
+(first server frame after the first client frame) plus the settle time (last server frame).
+"""
+import base64
+import contextlib
+import json
+import os
+import time
+
+# Hub method names appear verbatim in both the JSON and MessagePack SignalR protocols.
+HUB_TARGETS = (
+    b"JS.RenderBatch", b"DispatchBrowserEvent", b"BeginInvokeDotNetFromJS", b"EndInvokeJSFromDotNet",
+    b"JS.BeginInvokeJS", b"JS.EndInvokeDotNet", b"OnRenderCompleted", b"OnLocationChanged",
+    b"JS.AttachComponent", b"JS.Error", b"UpdateRootComponents",
+)
+# SignalR pings are a handful of bytes; they are counted but never start an interaction.
+PING_MAX_BYTES = 8
+
+
+def _decode(payload: str, opcode: int) -> bytes:
+    if opcode == 2:
+        try:
+            return base64.b64decode(payload)
+        except Exception:
+            return payload.encode("utf-8", "replace")
+    return payload.encode("utf-8", "replace")
+
+
+def _label(data: bytes) -> str:
+    if len(data) <= PING_MAX_BYTES:
+        return "ping"
+    for target in HUB_TARGETS:
+        if target in data:
+            return target.decode("ascii")
+    return "other"
+
+
+class CircuitTrafficRecorder:
+    """Collects websocket frames of one page through a CDP session and groups them per action."""
+
+    def __init__(self, page):
+        self.frames: list[dict] = []
+        self.actions: list[dict] = []
+        self._current = None
+        self._page = page
+        self._cdp = page.context.new_cdp_session(page)
+        self._cdp.on("Network.webSocketFrameSent", lambda e: self._on_frame("sent", e))
+        self._cdp.on("Network.webSocketFrameReceived", lambda e: self._on_frame("received", e))
+        self._cdp.send("Network.enable")
+
+    def _on_frame(self, direction: str, event: dict):
+        response = event.get("response") or {}
+        data = _decode(response.get("payloadData", ""), int(response.get("opcode", 1)))
+        frame = {
+            "direction": direction,
+            "ts": float(event.get("timestamp", 0.0)),  # CDP monotonic seconds
+            "wall": time.perf_counter(),
+            "bytes": len(data),
+            "label": _label(data),
+        }
+        self.frames.append(frame)
+        if self._current is not None:
+            self._current["frames"].append(frame)
+
+    @contextlib.contextmanager
+    def action(self, name: str, settle_ms: int = 300):
+        """Attribute frames to a named user action; waits settle_ms for trailing render batches."""
+        current = {"name": name, "frames": [], "started": time.perf_counter()}
+        self._current = current
+        try:
+            yield current
+            # Sync Playwright only dispatches CDP events inside its own calls: time.sleep would
+            # hold back the trailing frames until after the action closed.
+            self._page.wait_for_timeout(settle_ms)
+        finally:
+            self._current = None
+            current["wall_ms"] = (time.perf_counter() - current["started"]) * 1000
+            self.actions.append(self._summarize(current))
+
+    @staticmethod
+    def _summarize(action: dict) -> dict:
+        frames = [f for f in action["frames"] if f["label"] != "ping"]
+        sent = [f for f in frames if f["direction"] == "sent"]
+        received = [f for f in frames if f["direction"] == "received"]
+        rtt_ms = settle_ms = None
+        if sent:
+            first_sent = sent[0]["ts"]
+            after = [f["ts"] for f in received if f["ts"] >= first_sent]
+            if after:
+                rtt_ms = (after[0] - first_sent) * 1000
+                settle_ms = (after[-1] - first_sent) * 1000
+        labels: dict[str, int] = {}
+        for f in frames:
+            labels[f["label"]] = labels.get(f["label"], 0) + 1
+        return {
+            "name": action["name"],
+            "messages_sent": len(sent),
+            "messages_received": len(received),
+            "bytes_sent": sum(f["bytes"] for f in sent),
+            "bytes_received": sum(f["bytes"] for f in received),
+            "render_batches": labels.get("JS.RenderBatch", 0),
+            "rtt_ms": rtt_ms,
+            "settle_ms": settle_ms,
+            "wall_ms": action.get("wall_ms"),
+            "labels": labels,
+        }
+
+    def unattributed(self, name: str = "(whole test)") -> dict:
+        """Summary of every frame as one interaction, for pages recorded without explicit actions."""
+        return self._summarize({"name": name, "frames": list(self.frames)})
+
+    def totals(self) -> dict:
+        frames = [f for f in self.frames if f["label"] != "ping"]
+        return {
+            "messages": len(frames),
+            "bytes_sent": sum(f["bytes"] for f in frames if f["direction"] == "sent"),
+            "bytes_received": sum(f["bytes"] for f in frames if f["direction"] == "received"),
+        }
+
+    def detach(self):
+        try:
+            self._cdp.detach()
+        except Exception:
+            pass
+
+
+def heaviest_actions(records: list[dict], top: int = 10) -> list[dict]:
+    """Flatten {nodeid, actions} records and rank actions by bytes received from the server."""
+    flat = [{"nodeid": r["nodeid"], **a} for r in records for a in r["actions"]]
+    return sorted(flat, key=lambda a: a["bytes_received"], reverse=True)[:top]
+
+
+def write_traffic_report(path: str, records: list[dict]) -> str:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"tests": records, "heaviest": heaviest_actions(records, top=20)}, f, ensure_ascii=False, indent=2)
+    return path
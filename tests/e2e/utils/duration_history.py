@@ -0,0 +1,234 @@
+"""
+Duration history for E2E runs (local SQLite) and runtime-aware test scheduling.
+
+Every run appends per-test setup/call/teardown durations, so trends survive across runs:
+
+    python tests/e2e/utils/duration_history.py trend --category 06_form_design
+    python tests/e2e/utils/duration_history.py regressions --recent 3 --ratio 1.5
+    python tests/e2e/utils/duration_history.py schedule --workers 4
+
+The scheduler estimates each test from its recent median total (setup + call + teardown), falls back
+to the category median and then the global median for unseen tests, and packs tests longest-first
+onto the least-loaded worker (LPT), so long categories are spread instead of clustering in the tail.
+"""
+import argparse
+import os
+import sqlite3
+import statistics
+import sys
+from datetime import datetime, timezone
+
+DEFAULT_DB_PATH = os.path.join("tests", "e2e", "reports", "durations_history.sqlite")
+DEFAULT_ESTIMATE_S = 5.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started_at_utc TEXT NOT NULL,
+    label TEXT
+);
+CREATE TABLE IF NOT EXISTS results (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    nodeid TEXT NOT NULL,
+    category TEXT NOT NULL,
+    outcome TEXT NOT NULL,
+    setup_s REAL NOT NULL DEFAULT 0,
+    call_s REAL NOT NULL DEFAULT 0,
+    teardown_s REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (run_id, nodeid)
+);
+CREATE INDEX IF NOT EXISTS ix_results_nodeid ON results(nodeid, run_id);
+CREATE INDEX IF NOT EXISTS ix_results_category ON results(category, run_id);
+"""
+
+
+def category_of(nodeid: str) -> str:
+    """tests/e2e/cases/<NN_xxx>/... -> NN_xxx"""
+    parts = nodeid.replace("\\", "/").split("tests/e2e/cases/")
+    if len(parts) > 1:
+        return parts[1].split("/", 1)[0]
+    parts = nodeid.replace("\\", "/").split("cases/")
+    return parts[1].split("/", 1)[0] if len(parts) > 1 else "unknown"
+
+
+def _pct(values: list[float], p: float) -> float:
+    values = sorted(values)
+    return values[max(0, min(len(values) - 1, int(round((len(values) - 1) * p))))]
+
+
+class DurationHistory:
+    def __init__(self, path: str = DEFAULT_DB_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path)
+        self._conn.executescript(SCHEMA)
+
+    def close(self):
+        self._conn.close()
+
+    def record_run(self, results: list[dict], label: str | None = None) -> int:
+        """results: [{"nodeid", "outcome", "setup_s", "call_s", "teardown_s"}] -> run id"""
+        with self._conn:
+            cur = self._conn.execute(
+                "INSERT INTO runs(started_at_utc, label) VALUES (?, ?)",
+                (datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ"), label),
+            )
+            run_id = cur.lastrowid
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO results(run_id, nodeid, category, outcome, setup_s, call_s, teardown_s) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        run_id, r["nodeid"], category_of(r["nodeid"]), r.get("outcome", "unknown"),
+                        float(r.get("setup_s") or 0.0), float(r.get("call_s") or 0.0), float(r.get("teardown_s") or 0.0),
+                    )
+                    for r in results
+                ],
+            )
+        return run_id
+
+    def trend(self, category: str | None = None, nodeid: str | None = None, last_runs: int = 10) -> list[dict]:
+        """Per-run count/p50/p90/total of test totals, oldest first, optionally filtered."""
+        where, args = [], []
+        if category:
+            where.append("category = ?")
+            args.append(category)
+        if nodeid:
+            where.append("nodeid = ?")
+            args.append(nodeid)
+        clause = f"WHERE {' AND '.join(where)}" if where else ""
+        rows = self._conn.execute(
+            f"SELECT run_id, setup_s + call_s + teardown_s FROM results {clause} ORDER BY run_id", args
+        ).fetchall()
+        by_run: dict[int, list[float]] = {}
+        for run_id, total in rows:
+            by_run.setdefault(run_id, []).append(total)
+        run_ids = sorted(by_run)[-last_runs:]
+        started = dict(self._conn.execute("SELECT id, started_at_utc FROM runs").fetchall())
+        return [
+            {
+                "run_id": run_id,
+                "started_at_utc": started.get(run_id),
+                "count": len(by_run[run_id]),
+                "p50_s": _pct(by_run[run_id], 0.50),
+                "p90_s": _pct(by_run[run_id], 0.90),
+                "total_s": sum(by_run[run_id]),
+            }
+            for run_id in run_ids
+        ]
+
+    def regressions(self, recent_runs: int = 3, baseline_runs: int = 10, ratio: float = 1.5,
+                    min_delta_s: float = 1.0) -> list[dict]:
+        """Tests whose median over the last recent_runs exceeds the median of the baseline_runs before them."""
+        run_ids = [r[0] for r in self._conn.execute("SELECT id FROM runs ORDER BY id DESC LIMIT ?",
+                                                    (recent_runs + baseline_runs,))]
+        if len(run_ids) <= recent_runs:
+            return []
+        recent_ids, baseline_ids = set(run_ids[:recent_runs]), set(run_ids[recent_runs:])
+        recent: dict[str, list[float]] = {}
+        baseline: dict[str, list[float]] = {}
+        placeholders = ",".join("?" * len(run_ids))
+        for run_id, nodeid, total in self._conn.execute(
+            f"SELECT run_id, nodeid, setup_s + call_s + teardown_s FROM results "
+            f"WHERE run_id IN ({placeholders}) AND outcome = 'passed'",
+            run_ids,
+        ):
+            if run_id in recent_ids:
+                recent.setdefault(nodeid, []).append(total)
+            elif run_id in baseline_ids:
+                baseline.setdefault(nodeid, []).append(total)
+
+        found = []
+        for nodeid, values in recent.items():
+            if nodeid not in baseline:
+                continue
+            now, before = statistics.median(values), statistics.median(baseline[nodeid])
+            if now > before * ratio and now - before >= min_delta_s:
+                found.append({"nodeid": nodeid, "baseline_s": before, "recent_s": now, "ratio": now / before if before else None})
+        return sorted(found, key=lambda r: r["recent_s"] - r["baseline_s"], reverse=True)
+
+    def estimates(self, last_runs: int = 5) -> dict[str, float]:
+        """Median total duration per test over its last last_runs recorded runs."""
+        per_test: dict[str, list[float]] = {}
+        for nodeid, total in self._conn.execute(
+            "SELECT nodeid, setup_s + call_s + teardown_s FROM results ORDER BY run_id DESC"
+        ):
+            values = per_test.setdefault(nodeid, [])
+            if len(values) < last_runs:
+                values.append(total)
+        return {nodeid: statistics.median(values) for nodeid, values in per_test.items()}
+
+
+def estimate_durations(nodeids: list[str], known: dict[str, float]) -> dict[str, float]:
+    """History estimate per test; unseen tests get their category median, then the global median."""
+    by_category: dict[str, list[float]] = {}
+    for nodeid, value in known.items():
+        by_category.setdefault(category_of(nodeid), []).append(value)
+    global_default = statistics.median(known.values()) if known else DEFAULT_ESTIMATE_S
+    result = {}
+    for nodeid in nodeids:
+        if nodeid in known:
+            result[nodeid] = known[nodeid]
+        elif by_category.get(category_of(nodeid)):
+            result[nodeid] = statistics.median(by_category[category_of(nodeid)])
+        else:
+            result[nodeid] = global_default
+    return result
+
+
+def schedule(nodeids: list[str], estimates: dict[str, float], workers: int) -> list[dict]:
+    """Longest-processing-time-first bin packing: [{"worker", "estimate_s", "nodeids"}] per worker."""
+    bins = [{"worker": i, "estimate_s": 0.0, "nodeids": []} for i in range(max(1, workers))]
+    for nodeid in sorted(nodeids, key=lambda n: estimates.get(n, DEFAULT_ESTIMATE_S), reverse=True):
+        target = min(bins, key=lambda b: b["estimate_s"])
+        target["nodeids"].append(nodeid)
+        target["estimate_s"] += estimates.get(nodeid, DEFAULT_ESTIMATE_S)
+    return bins
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="E2E duration history and runtime-aware scheduling")
+    parser.add_argument("--db", default=os.getenv("E2E_DURATION_DB", DEFAULT_DB_PATH))
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_trend = sub.add_parser("trend", help="p50/p90 per run")
+    p_trend.add_argument("--category")
+    p_trend.add_argument("--nodeid")
+    p_trend.add_argument("--runs", type=int, default=10)
+
+    p_reg = sub.add_parser("regressions", help="tests slower in recent runs than in the baseline")
+    p_reg.add_argument("--recent", type=int, default=3)
+    p_reg.add_argument("--baseline", type=int, default=10)
+    p_reg.add_argument("--ratio", type=float, default=1.5)
+    p_reg.add_argument("--min-delta", type=float, default=1.0)
+
+    p_sched = sub.add_parser("schedule", help="longest-first bin packing of the last run's tests")
+    p_sched.add_argument("--workers", type=int, default=4)
+
+    args = parser.parse_args(argv)
+    history = DurationHistory(args.db)
+    try:
+        if args.command == "trend":
+            for row in history.trend(args.category, args.nodeid, args.runs):
+                print(f"run {row['run_id']:<5} {row['started_at_utc']} n={row['count']:<4} "
+                      f"p50={row['p50_s']:.2f}s p90={row['p90_s']:.2f}s total={row['total_s']:.1f}s")
+        elif args.command == "regressions":
+            found = history.regressions(args.recent, args.baseline, args.ratio, args.min_delta)
+            for r in found:
+                print(f"{r['nodeid']}: {r['baseline_s']:.2f}s -> {r['recent_s']:.2f}s")
+            if not found:
+                print("[E2E] No duration regressions")
+            return 1 if found else 0
+        else:
+            known = history.estimates()
+            bins = schedule(sorted(known), known, args.workers)
+            for b in bins:
+                categories = sorted({category_of(n) for n in b["nodeids"]})
+                print(f"worker {b['worker']}: {len(b['nodeids'])} tests, ~{b['estimate_s']:.1f}s ({', '.join(categories)})")
+    finally:
+        history.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
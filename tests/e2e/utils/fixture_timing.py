@@ -0,0 +1,117 @@
+"""
+Fixture-level timing for E2E runs.
+
+The expensive work of this suite happens in fixture setup/teardown (admin bootstrap, standard_product
+compile, clean_platform DROPs, browser contexts), which per-test call durations do not show. The
+plugin wraps pytest's fixture hooks and records, per fixture:
+- setups (pytest cache misses) and uses (tests that requested it); uses - setups = cache hits
+- setup and teardown wall time (exclusive: dependencies are set up before the fixture itself)
+- application-level cache hits/misses reported by fixtures that keep their own cache
+  (e.g. standard_product, auth_storage_state) via note_cache()
+"""
+import json
+import os
+import time
+
+import pytest
+
+_PLUGIN = None
+
+
+def note_cache(fixture: str, hit: bool):
+    """Record a hit/miss of a fixture's own (module-level) cache; no-op when the plugin is not active."""
+    if _PLUGIN is not None:
+        stat = _PLUGIN.stat(fixture)
+        stat["app_cache_hits" if hit else "app_cache_misses"] += 1
+
+
+class FixtureTimingPlugin:
+    def __init__(self, report_path: str):
+        global _PLUGIN
+        _PLUGIN = self
+        self.report_path = report_path
+        self.stats: dict[str, dict] = {}
+        self.suite_s = 0.0
+
+    def stat(self, name: str, scope: str | None = None) -> dict:
+        stat = self.stats.setdefault(
+            name,
+            {"scope": scope, "setups": 0, "uses": 0, "setup_s": 0.0, "teardown_s": 0.0, "errors": 0,
+             "app_cache_hits": 0, "app_cache_misses": 0},
+        )
+        if scope and not stat["scope"]:
+            stat["scope"] = scope
+        return stat
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_fixture_setup(self, fixturedef, request):
+        stat = self.stat(fixturedef.argname, fixturedef.scope)
+        t0 = time.perf_counter()
+        outcome = yield
+        stat["setup_s"] += time.perf_counter() - t0
+        stat["setups"] += 1
+        if outcome.excinfo is not None:
+            stat["errors"] += 1
+
+        # Finalizers run LIFO: this one runs right before the fixture's own teardown and
+        # pytest_fixture_post_finalizer closes the measurement.
+        def _mark_teardown_start():
+            fixturedef._e2e_teardown_started = time.perf_counter()
+
+        fixturedef.addfinalizer(_mark_teardown_start)
+
+    def pytest_fixture_post_finalizer(self, fixturedef, request):
+        started = getattr(fixturedef, "_e2e_teardown_started", None)
+        if started is not None:
+            self.stat(fixturedef.argname, fixturedef.scope)["teardown_s"] += time.perf_counter() - started
+            fixturedef._e2e_teardown_started = None
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_setup(self, item):
+        yield
+        for name in getattr(item, "fixturenames", ()):
+            if name in self.stats:
+                self.stats[name]["uses"] += 1
+
+    def pytest_runtest_logreport(self, report):
+        self.suite_s += float(getattr(report, "duration", 0.0) or 0.0)
+
+    def summary(self) -> list[dict]:
+        rows = []
+        for name, s in self.stats.items():
+            total = s["setup_s"] + s["teardown_s"]
+            rows.append({
+                "fixture": name,
+                **s,
+                "cache_hits": max(0, s["uses"] - s["setups"]),
+                "total_s": total,
+                "share_of_suite": total / self.suite_s if self.suite_s else None,
+            })
+        return sorted(rows, key=lambda r: r["total_s"], reverse=True)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        rows = self.summary()
+        if not rows:
+            return
+        terminalreporter.write_sep("-", "E2E fixture time (setup + teardown)")
+        terminalreporter.write_line(f"[E2E] Suite phase time: {self.suite_s:.1f}s")
+        for r in rows[:15]:
+            if r["total_s"] < 0.05:
+                break
+            share = f"{r['share_of_suite'] * 100:5.1f}%" if r["share_of_suite"] is not None else "  n/a"
+            app_cache = (
+                f" app-cache {r['app_cache_hits']} hit/{r['app_cache_misses']} miss"
+                if r["app_cache_hits"] or r["app_cache_misses"] else ""
+            )
+            terminalreporter.write_line(
+                f"{r['fixture']:<28} {r['scope'] or '':<9} {share} total={r['total_s']:.1f}s "
+                f"setup={r['setup_s']:.1f}s teardown={r['teardown_s']:.1f}s "
+                f"setups={r['setups']} hits={r['cache_hits']}{app_cache}"
+            )
+        try:
+            os.makedirs(os.path.dirname(self.report_path) or ".", exist_ok=True)
+            with open(self.report_path, "w", encoding="utf-8") as f:
+                json.dump({"suite_s": self.suite_s, "fixtures": rows}, f, ensure_ascii=False, indent=2)
+            terminalreporter.write_line(f"[E2E] Fixture timing report written: {self.report_path}")
+        except Exception as ex:
+            terminalreporter.write_line(f"[E2E] Failed to write fixture timing report: {ex}")
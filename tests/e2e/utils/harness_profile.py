@@ -0,0 +1,233 @@
+"""
+Opt-in profiling of the E2E harness itself (pytest --harness-profile, or E2E_HARNESS_PROFILE=1).
+
+Per test (setup + call + teardown) a background thread samples the test thread's Python stack and
+writes a speedscope flamegraph (tests/e2e/reports/flamegraphs/<test>.speedscope.json, open it at
+https://www.speedscope.app). pytest/pluggy frames are dropped so stacks start at the test or fixture.
+
+Blocking calls are instrumented to split wall time into:
+- sleep: time.sleep
+- subprocess: subprocess.run/check_output (DbHelper runs psql through `docker exec`)
+- http: requests.Session.request (ApiHelper, raw requests calls)
+- playwright: estimated from the share of samples inside the Playwright client (browser RPC)
+- harness: the remainder (Python work in tests, fixtures and utils, JSON parsing, ...)
+"""
+import functools
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+_SKIP_PATH_PARTS = (f"{os.sep}_pytest{os.sep}", f"{os.sep}pluggy{os.sep}")
+_PLAYWRIGHT_PATH_PART = f"{os.sep}playwright{os.sep}"
+INSTRUMENTED = ("sleep", "subprocess", "http")
+
+_PROFILER = None  # the StackSampler of the running test, if any
+
+
+class StackSampler:
+    """Samples one thread's stack every interval_s and sums wall time per collapsed stack."""
+
+    def __init__(self, thread_id: int, interval_s: float = 0.005):
+        self.thread_id = thread_id
+        self.interval_s = interval_s
+        self.frames: dict[tuple, int] = {}  # (name, file, line) -> frame index
+        self.samples: dict[tuple, float] = {}  # stack of frame indexes (root first) -> seconds
+        self.kinds: dict[str, float] = {}  # sampled seconds per category
+        self.timers = {kind: 0.0 for kind in INSTRUMENTED}
+        self.active_kind = None  # set by the instrumented wrappers while the test thread is blocked
+        self._stop = threading.Event()
+        self._thread = None
+        self.started = self.stopped = None
+
+    def _frame_index(self, code) -> int:
+        key = (code.co_name, code.co_filename, code.co_firstlineno)
+        index = self.frames.get(key)
+        if index is None:
+            index = self.frames[key] = len(self.frames)
+        return index
+
+    def _sample(self, weight_s: float):
+        frame = sys._current_frames().get(self.thread_id)
+        if frame is None:
+            return
+        stack, in_playwright = [], False
+        while frame is not None:
+            filename = frame.f_code.co_filename
+            if not any(part in filename for part in _SKIP_PATH_PARTS):
+                stack.append(self._frame_index(frame.f_code))
+                in_playwright = in_playwright or _PLAYWRIGHT_PATH_PART in filename
+            frame = frame.f_back
+        key = tuple(reversed(stack))
+        self.samples[key] = self.samples.get(key, 0.0) + weight_s
+        kind = self.active_kind or ("playwright" if in_playwright else "harness")
+        self.kinds[kind] = self.kinds.get(kind, 0.0) + weight_s
+
+    def _run(self):
+        # Ticks are late while the test thread holds the GIL: weight each sample by the real elapsed time.
+        last = time.perf_counter()
+        while not self._stop.wait(self.interval_s):
+            now = time.perf_counter()
+            self._sample(now - last)
+            last = now
+
+    def start(self):
+        self.started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="harness-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.stopped = time.perf_counter()
+
+    @property
+    def wall_s(self) -> float:
+        return (self.stopped or time.perf_counter()) - (self.started or time.perf_counter())
+
+    def breakdown(self) -> dict:
+        """Seconds per category; playwright is the sampled share of the non-instrumented time."""
+        wall = self.wall_s
+        result = {kind: self.timers[kind] for kind in INSTRUMENTED}
+        rest = max(0.0, wall - sum(result.values()))
+        unblocked = self.kinds.get("playwright", 0) + self.kinds.get("harness", 0)
+        result["playwright"] = rest * self.kinds.get("playwright", 0) / unblocked if unblocked else 0.0
+        result["harness"] = rest - result["playwright"]
+        return result
+
+    def to_speedscope(self, name: str) -> dict:
+        frames = [None] * len(self.frames)
+        for (func, filename, line), index in self.frames.items():
+            frames[index] = {"name": func, "file": filename, "line": line}
+        stacks = list(self.samples)
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "shared": {"frames": frames},
+            "profiles": [{
+                "type": "sampled",
+                "name": name,
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": self.wall_s,
+                "samples": [list(s) for s in stacks],
+                "weights": [self.samples[s] for s in stacks],
+            }],
+            "name": name,
+            "exporter": "bobcrm-e2e-harness-profile",
+        }
+
+
+def _instrument(kind: str, fn):
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        profiler = _PROFILER
+        # Only the outermost blocking call on the test thread counts (run -> communicate, etc.).
+        if profiler is None or profiler.active_kind is not None or threading.get_ident() != profiler.thread_id:
+            return fn(*args, **kwargs)
+        profiler.active_kind = kind
+        t0 = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            profiler.timers[kind] += time.perf_counter() - t0
+            profiler.active_kind = None
+
+    wrapper._e2e_original = fn
+    return wrapper
+
+
+def _patch_targets() -> list[tuple]:
+    targets = [(time, "sleep", "sleep"), (subprocess, "run", "subprocess"), (subprocess, "check_output", "subprocess")]
+    try:
+        import requests
+        targets.append((requests.Session, "request", "http"))
+    except ImportError:
+        pass
+    return targets
+
+
+class HarnessProfilePlugin:
+    def __init__(self, out_dir: str, interval_s: float = 0.005):
+        self.out_dir = out_dir
+        self.interval_s = interval_s
+        self.rows: list[dict] = []
+        self._patched = []
+        for owner, attr, kind in _patch_targets():
+            original = getattr(owner, attr)
+            setattr(owner, attr, _instrument(kind, original))
+            self._patched.append((owner, attr, original))
+
+    def pytest_unconfigure(self, config):
+        for owner, attr, original in self._patched:
+            setattr(owner, attr, original)
+        self._patched = []
+
+    def _write_flamegraph(self, item, profiler: StackSampler) -> str | None:
+        name = "".join(c if c.isalnum() or c in "-_." else "_" for c in item.name)
+        path = os.path.join(self.out_dir, "flamegraphs", f"{name}.speedscope.json")
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(profiler.to_speedscope(item.nodeid), f)
+            return path
+        except OSError:
+            return None
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_protocol(self, item, nextitem):
+        global _PROFILER
+        profiler = StackSampler(threading.get_ident(), self.interval_s)
+        _PROFILER = profiler.start()
+        try:
+            yield
+        finally:
+            _PROFILER = None
+            profiler.stop()
+        self.rows.append({
+            "nodeid": item.nodeid,
+            "wall_s": profiler.wall_s,
+            "sampled_s": sum(profiler.samples.values()),
+            "breakdown_s": profiler.breakdown(),
+            "flamegraph": self._write_flamegraph(item, profiler),
+        })
+
+    def totals(self) -> dict:
+        totals = {}
+        for row in self.rows:
+            for kind, seconds in row["breakdown_s"].items():
+                totals[kind] = totals.get(kind, 0.0) + seconds
+        return totals
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.rows:
+            return
+        totals = self.totals()
+        wall = sum(r["wall_s"] for r in self.rows)
+        terminalreporter.write_sep("-", "E2E harness profile (where test wall time goes)")
+        terminalreporter.write_line(
+            f"[E2E] {len(self.rows)} tests, {wall:.1f}s: " + ", ".join(
+                f"{kind} {seconds:.1f}s ({seconds / wall * 100 if wall else 0:.0f}%)"
+                for kind, seconds in sorted(totals.items(), key=lambda kv: kv[1], reverse=True)
+            )
+        )
+        terminalreporter.write_line("[E2E] waiting on server = http + subprocess (psql) + playwright (browser RPC)")
+        for row in sorted(self.rows, key=lambda r: r["breakdown_s"]["harness"], reverse=True)[:5]:
+            b = row["breakdown_s"]
+            terminalreporter.write_line(
+                f"{row['nodeid']}: harness {b['harness']:.1f}s, sleep {b['sleep']:.1f}s of {row['wall_s']:.1f}s"
+                f" -> {row['flamegraph']}"
+            )
+        path = os.path.join(self.out_dir, "harness_profile_latest.json")
+        try:
+            os.makedirs(self.out_dir, exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({"wall_s": wall, "totals_s": totals, "items": self.rows}, f, ensure_ascii=False, indent=2)
+            terminalreporter.write_line(f"[E2E] Harness profile written: {path}")
+        except Exception as ex:
+            terminalreporter.write_line(f"[E2E] Failed to write harness profile: {ex}")
@@ -0,0 +1,385 @@
+"""
+EXPLAIN capture and index advisor for dynamic entity queries.
+
+Dynamic tables (TestProducts, Products, Test_Account_*s, ...) are created with a primary key only,
+while /api/dynamic-entities/{fullType}/query can filter and sort on any field. This tool replays a
+mix of query payloads as the SQL the API generates for dynamic tables (SELECT page + COUNT(*)),
+captures EXPLAIN (ANALYZE, BUFFERS) through psql, flags sequential scans on large tables and proposes
+indexes. Proposals are measured in a scratch database: the table is cloned with pg_dump, seeded up to
+--rows, every query is timed, the indexes are applied, and the queries are timed again.
+
+Workload sources (combinable):
+- --workload FILE: JSON list or JSONL of {"entity": fullTypeName, "payload": {...}, "weight": n}
+- --waterfalls DIR: per-test waterfalls written with E2E_WATERFALL=1 (the API recording proxy keeps
+  the body of every /query call)
+- --synthetic: generated payloads (equals/contains/range filters, sort and paging) per column
+
+Usage:
+    python tests/e2e/utils/index_advisor.py --entity BobCrm.Base.Custom.Products --synthetic --rows 200000
+    python tests/e2e/utils/index_advisor.py --waterfalls tests/e2e/reports/waterfall --rows 100000
+"""
+import argparse
+import glob
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+from urllib.parse import unquote
+
+if __package__ in (None, ""):
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.db import DbHelper, db_helper
+
+QUERY_URL_RE = re.compile(r"^/api/dynamic-entities/(?!raw/)([^/?]+)/query(?:\?|$)")
+IDENTIFIER_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+TEXT_TYPES = {"text", "character varying", "character", "citext"}
+NUMERIC_TYPES = {"integer", "bigint", "smallint", "numeric", "real", "double precision"}
+TIME_TYPES = {"timestamp with time zone", "timestamp without time zone", "date"}
+SCRATCH_DB = "bobcrm_index_advisor"
+
+
+def _quote_ident(name: str) -> str:
+    if not IDENTIFIER_RE.match(name or ""):
+        raise ValueError(f"Invalid identifier: {name}")
+    return f'"{name}"'
+
+
+def _literal(value, data_type: str) -> str:
+    if data_type == "boolean":
+        return "TRUE" if str(value).strip().lower() in ("true", "1", "yes") else "FALSE"
+    if data_type in NUMERIC_TYPES and isinstance(value, (int, float)) and not isinstance(value, bool):
+        return repr(value)
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+# --- workload ------------------------------------------------------------------------------------
+
+def load_workload(paths: list[str]) -> list[dict]:
+    items = []
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            text = f.read().strip()
+        docs = json.loads(text) if text.startswith("[") else [json.loads(ln) for ln in text.splitlines() if ln.strip()]
+        items += [{"entity": d["entity"], "payload": d.get("payload") or {}, "weight": d.get("weight", 1)} for d in docs]
+    return items
+
+
+def workload_from_waterfalls(directory: str) -> list[dict]:
+    items = []
+    for path in sorted(glob.glob(os.path.join(directory, "*.json"))):
+        with open(path, encoding="utf-8") as f:
+            waterfall = json.load(f)
+        for row in waterfall.get("waterfall", []):
+            match = QUERY_URL_RE.match(row.get("url") or "")
+            if row.get("method") == "POST" and match and row.get("payload") is not None:
+                items.append({"entity": unquote(match.group(1)), "payload": row["payload"], "weight": 1})
+    return items
+
+
+def synthetic_workload(entity: str, columns: dict[str, str], page_size: int = 20) -> list[dict]:
+    """One payload per filterable column and operator the API supports, plus sorted pages."""
+    items = []
+    for name, data_type in columns.items():
+        if name in ("Id", "IsDeleted"):
+            continue
+        if data_type in TEXT_TYPES:
+            items.append({"Filters": [{"Field": name, "Operator": "equals", "Value": f"{name}-42"}]})
+            items.append({"Filters": [{"Field": name, "Operator": "contains", "Value": "42"}]})
+        elif data_type in NUMERIC_TYPES:
+            items.append({"Filters": [{"Field": name, "Operator": "greaterThan", "Value": 9990}]})
+        elif data_type == "boolean":
+            items.append({"Filters": [{"Field": name, "Operator": "equals", "Value": True}]})
+        elif data_type in TIME_TYPES:
+            items.append({"Filters": [{"Field": name, "Operator": "greaterThan", "Value": "2000-01-01"}]})
+        else:
+            continue
+        items.append({"OrderBy": name, "OrderByDescending": True, "Skip": page_size * 5})
+    return [{"entity": entity, "payload": {"Take": page_size, **p}, "weight": 1} for p in items]
+
+
+# --- SQL as generated by ReflectionPersistenceService.QueryDynamicTableAsync / CountDynamicTableAsync
+
+def _payload_value(payload: dict, key: str):
+    # Recorded bodies use the App's camelCase serializer, hand-written workloads often PascalCase.
+    return payload.get(key, payload.get(key[0].lower() + key[1:]))
+
+
+def build_queries(table: str, columns: dict[str, str], payload: dict) -> dict:
+    where = [f'{_quote_ident("IsDeleted")} = FALSE'] if "IsDeleted" in columns else []
+    filter_columns = []
+    for f in _payload_value(payload, "Filters") or []:
+        field = _payload_value(f, "Field")
+        if not field or field not in columns:
+            continue
+        column, op = _quote_ident(field), _payload_value(f, "Operator") or "equals"
+        value = _payload_value(f, "Value")
+        if value is None:
+            where.append(f"{column} IS NULL" if op == "equals" else f"{column} IS NOT NULL")
+            continue
+        if op == "contains":
+            where.append(f"{column} ILIKE {_literal(f'%{value}%', 'text')}")
+        else:
+            sql_op = {"greaterThan": ">", "lessThan": "<"}.get(op, "=")
+            where.append(f"{column} {sql_op} {_literal(value, columns[field])}")
+            op = op if sql_op != "=" else "equals"
+        filter_columns.append((field, op))
+
+    clause = f" WHERE {' AND '.join(where)}" if where else ""
+    select = f"SELECT * FROM {_quote_ident(table)}{clause}"
+    order_by = _payload_value(payload, "OrderBy")
+    if order_by and order_by in columns:
+        select += f" ORDER BY {_quote_ident(order_by)} {'DESC' if _payload_value(payload, 'OrderByDescending') else 'ASC'}"
+    else:
+        order_by = None
+    take = _payload_value(payload, "Take")
+    take = 100 if take is None else int(take)  # endpoint default
+    if take > 0:
+        select += f" LIMIT {take}"
+    skip = _payload_value(payload, "Skip")
+    if skip and int(skip) > 0:
+        select += f" OFFSET {int(skip)}"
+    return {
+        "select": select,
+        "count": f"SELECT COUNT(*) FROM {_quote_ident(table)}{clause}",
+        "filters": filter_columns,
+        "order_by": order_by,
+    }
+
+
+# --- EXPLAIN -------------------------------------------------------------------------------------
+
+def explain(db: DbHelper, sql: str) -> dict:
+    out = db.execute_scalar(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}", strict=True)
+    return json.loads(out)[0]
+
+
+def _walk(node: dict):
+    yield node
+    for child in node.get("Plans", []):
+        yield from _walk(child)
+
+
+def summarize_plan(plan: dict, table: str) -> dict:
+    nodes = list(_walk(plan["Plan"]))
+    seq = [n for n in nodes if n.get("Node Type") == "Seq Scan" and n.get("Relation Name") == table]
+    return {
+        "execution_ms": plan.get("Execution Time", 0.0),
+        "seq_scan": bool(seq),
+        "rows_scanned": sum(n.get("Actual Rows", 0) + n.get("Rows Removed by Filter", 0) for n in seq),
+        "shared_read_blocks": sum(n.get("Shared Read Blocks", 0) for n in nodes if "Relation Name" in n),
+        "indexes_used": sorted({n["Index Name"] for n in nodes if n.get("Index Name")}),
+        "sort": any(n.get("Node Type") == "Sort" for n in nodes),
+    }
+
+
+def propose_indexes(table: str, columns: dict[str, str], query: dict) -> list[dict]:
+    """Btree on equality columns (+ one range or sort column), trigram GIN for ILIKE '%x%'."""
+    partial = f' WHERE {_quote_ident("IsDeleted")} = FALSE' if "IsDeleted" in columns else ""
+    equals = [c for c, op in query["filters"] if op == "equals" and columns.get(c) != "boolean"]
+    ranges = [c for c, op in query["filters"] if op in ("greaterThan", "lessThan")]
+    keys = list(dict.fromkeys(equals + ranges[:1]))
+    if not ranges and query["order_by"] and query["order_by"] != "Id":
+        keys = list(dict.fromkeys(keys + [query["order_by"]]))
+    proposals = []
+    if keys:
+        proposals.append({"method": "btree", "columns": keys, "partial": partial})
+    for c, op in query["filters"]:
+        if op == "contains":
+            proposals.append({"method": "gin_trgm", "columns": [c], "partial": partial})
+    for p in proposals:
+        suffix = "trgm" if p["method"] == "gin_trgm" else "btree"
+        p["name"] = f"ix_{table}_{'_'.join(p['columns'])}_{suffix}"[:63]
+        if p["method"] == "gin_trgm":
+            body = f"USING gin ({_quote_ident(p['columns'][0])} gin_trgm_ops)"
+        else:
+            body = f"({', '.join(_quote_ident(c) for c in p['columns'])})"
+        p["ddl"] = f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {_quote_ident(p['name'])} ON {_quote_ident(table)} {body}{p['partial']}"
+    return proposals
+
+
+# --- scratch database ----------------------------------------------------------------------------
+
+def table_for_entity(db: DbHelper, entity: str) -> str | None:
+    name = db.execute_scalar(
+        f"""SELECT "EntityName" FROM "EntityDefinitions" WHERE "FullTypeName" = {_literal(entity, 'text')} LIMIT 1"""
+    )
+    return f"{name}s" if name else None
+
+
+def table_columns(db: DbHelper, table: str) -> dict[str, str]:
+    rows = db.execute_rows(
+        "SELECT column_name, data_type FROM information_schema.columns "
+        f"WHERE table_schema = 'public' AND table_name = {_literal(table, 'text')} ORDER BY ordinal_position",
+        strict=True,
+    )
+    return {name: data_type for name, data_type in rows}
+
+
+def create_scratch(source: DbHelper, tables: list[str], scratch_db: str = SCRATCH_DB) -> DbHelper:
+    """Clone the tables (schema + rows) into a fresh scratch database; the live database is never indexed."""
+    source.execute_query(f'DROP DATABASE IF EXISTS "{scratch_db}"', strict=True)
+    source.execute_query(f'CREATE DATABASE "{scratch_db}"', strict=True)
+    table_args = " ".join(f"-t 'public.\"{t}\"'" for t in tables)
+    subprocess.run(
+        ["docker", "exec", "-i", source.container_name, "sh", "-c",
+         f"pg_dump -U {source.user} -d {source.db_name} {table_args} | psql -q -U {source.user} -d {scratch_db}"],
+        capture_output=True, text=True, check=True,
+    )
+    scratch = DbHelper(source.container_name, scratch_db, source.user)
+    scratch.execute_query("CREATE EXTENSION IF NOT EXISTS pg_trgm", strict=True)
+    return scratch
+
+
+def seed_rows(db: DbHelper, table: str, columns: dict[str, str], rows: int) -> int:
+    """Append generated rows until the table holds `rows`; values are spread so filters stay selective."""
+    current = int(db.execute_scalar(f"SELECT COUNT(*) FROM {_quote_ident(table)}", strict=True) or 0)
+    missing = rows - current
+    if missing > 0:
+        names, values = [], []
+        for name, data_type in columns.items():
+            if name == "Id":
+                continue
+            if name == "IsDeleted":
+                expr = "FALSE"
+            elif data_type in TEXT_TYPES:
+                expr = f"'{name}-' || (g % 10000)"
+            elif data_type in NUMERIC_TYPES:
+                expr = "(g % 10000)"
+            elif data_type == "boolean":
+                expr = "(g % 10 = 0)"
+            elif data_type in TIME_TYPES:
+                expr = "now() - (g % 100000) * interval '1 minute'"
+            elif data_type == "uuid":
+                expr = "gen_random_uuid()"
+            else:
+                continue
+            names.append(_quote_ident(name))
+            values.append(expr)
+        db.execute_query(
+            f"INSERT INTO {_quote_ident(table)} ({', '.join(names)}) "
+            f"SELECT {', '.join(values)} FROM generate_series(1, {missing}) AS g",
+            strict=True,
+        )
+    db.execute_query(f"ANALYZE {_quote_ident(table)}", strict=True)
+    return max(rows, current)
+
+
+def _timed(db: DbHelper, sql: str, table: str, repeat: int) -> dict:
+    runs = [summarize_plan(explain(db, sql), table) for _ in range(max(1, repeat))]
+    summary = dict(runs[-1])
+    summary["execution_ms"] = statistics.median(r["execution_ms"] for r in runs)
+    return summary
+
+
+# --- driver --------------------------------------------------------------------------------------
+
+def advise(workload: list[dict], rows: int = 100_000, repeat: int = 3, large_table_rows: int = 10_000,
+           source: DbHelper = db_helper, keep_scratch: bool = False) -> dict:
+    tables, columns, unresolved = {}, {}, set()
+    for item in workload:
+        entity = item["entity"]
+        if entity not in tables and entity not in unresolved:
+            table = table_for_entity(source, entity)
+            if table and source.table_exists(table):
+                tables[entity], columns[table] = table, table_columns(source, table)
+            else:
+                unresolved.add(entity)
+    if not tables:
+        return {"queries": [], "indexes": [], "unresolved_entities": sorted(unresolved)}
+
+    scratch = create_scratch(source, sorted(set(tables.values())))
+    try:
+        table_rows = {t: seed_rows(scratch, t, columns[t], rows) for t in set(tables.values())}
+        queries, proposals = [], {}
+        for item in workload:
+            table = tables.get(item["entity"])
+            if not table:
+                continue
+            built = build_queries(table, columns[table], item["payload"])
+            for kind in ("select", "count"):
+                before = _timed(scratch, built[kind], table, repeat)
+                row = {"entity": item["entity"], "table": table, "kind": kind, "sql": built[kind],
+                       "weight": item.get("weight", 1), "before": before, "proposed": []}
+                if before["seq_scan"] and table_rows[table] >= large_table_rows:
+                    for p in propose_indexes(table, columns[table], built):
+                        proposals.setdefault(p["name"], {**p, "table": table})
+                        row["proposed"].append(p["name"])
+                queries.append(row)
+
+        for p in proposals.values():
+            # CONCURRENTLY is what the live table needs; the idle scratch copy can take the plain form.
+            scratch.execute_query(p["ddl"].replace(" CONCURRENTLY", ""), strict=True)
+        for table in set(tables.values()):
+            scratch.execute_query(f"ANALYZE {_quote_ident(table)}", strict=True)
+        for row in queries:
+            row["after"] = _timed(scratch, row["sql"], row["table"], repeat)
+
+        for name, p in proposals.items():
+            users = [r for r in queries if name in r["after"]["indexes_used"]]
+            p["used_by"] = len(users)
+            p["saved_ms"] = sum((r["before"]["execution_ms"] - r["after"]["execution_ms"]) * r["weight"] for r in users)
+            p["size"] = scratch.execute_scalar(f"SELECT pg_size_pretty(pg_relation_size({_literal(_quote_ident(name), 'text')}::regclass))")
+        return {
+            "rows_per_table": table_rows,
+            "queries": queries,
+            "indexes": sorted(proposals.values(), key=lambda p: p["saved_ms"], reverse=True),
+            "unresolved_entities": sorted(unresolved),
+        }
+    finally:
+        if not keep_scratch:
+            source.execute_query(f'DROP DATABASE IF EXISTS "{SCRATCH_DB}"')
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="EXPLAIN capture and index advisor for dynamic entity queries")
+    parser.add_argument("--workload", action="append", default=[], help="JSON/JSONL payload mix")
+    parser.add_argument("--waterfalls", help="directory of E2E waterfall reports with recorded /query bodies")
+    parser.add_argument("--synthetic", action="store_true", help="generate payloads for every column of --entity")
+    parser.add_argument("--entity", action="append", default=[], help="fullTypeName for --synthetic")
+    parser.add_argument("--rows", type=int, default=100_000, help="seed each scratch table up to this many rows")
+    parser.add_argument("--repeat", type=int, default=3, help="EXPLAIN ANALYZE runs per query (median)")
+    parser.add_argument("--large-table-rows", type=int, default=10_000, help="seq scans below this are ignored")
+    parser.add_argument("--keep-scratch", action="store_true", help=f"keep the {SCRATCH_DB} database")
+    parser.add_argument("--out", default=os.path.join("tests", "e2e", "reports", "index_advisor_latest.json"))
+    args = parser.parse_args(argv)
+
+    workload = load_workload(args.workload)
+    if args.waterfalls:
+        workload += workload_from_waterfalls(args.waterfalls)
+    if args.synthetic:
+        for entity in args.entity:
+            table = table_for_entity(db_helper, entity)
+            if table:
+                workload += synthetic_workload(entity, table_columns(db_helper, table))
+    if not workload:
+        print("[PG] Empty workload: pass --workload, --waterfalls or --synthetic --entity")
+        return 2
+
+    result = advise(workload, args.rows, args.repeat, args.large_table_rows, keep_scratch=args.keep_scratch)
+    for entity in result["unresolved_entities"]:
+        print(f"[PG] Skipped {entity}: no EntityDefinitions row or table")
+
+    seq = [q for q in result["queries"] if q["before"]["seq_scan"]]
+    print(f"[PG] {len(result['queries'])} statements, {len(seq)} sequential scans on {result.get('rows_per_table')}")
+    for q in sorted(seq, key=lambda q: q["before"]["execution_ms"], reverse=True)[:15]:
+        b, a = q["before"], q["after"]
+        print(f"  {b['execution_ms']:8.2f}ms -> {a['execution_ms']:8.2f}ms  scanned={b['rows_scanned']:<8} "
+              f"{q['sql'][:110]}")
+    for p in result["indexes"]:
+        status = f"saves {p['saved_ms']:.1f}ms over {p['used_by']} statements" if p["used_by"] else "not used by the planner"
+        print(f"[PG] {p['ddl']}  -- {p['size']}, {status}")
+    if not result["indexes"]:
+        print("[PG] No index proposals")
+
+    os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+    print(f"[PG] Index advisor report written: {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,165 @@
+"""
+Query and lookup latency of dynamic tables with and without field-level indexes (isIndexed/isUnique).
+
+A scratch database gets the two tables the DDL generator would create for a customer entity with a
+lookup field to a tier entity (BenchCustomers.TierId -> BenchTiers.Id), seeded with --rows and
+--lookup-rows. Every statement is timed with EXPLAIN ANALYZE (median of --repeat runs), the indexes
+the generator emits for the flagged fields are built CONCURRENTLY (as publish-changes does on a live
+table, build time recorded), and the statements are timed again.
+
+Flags benchmarked: BenchCustomers.TierId isIndexed, BenchCustomers.Email isUnique, BenchTiers.Code isUnique.
+
+Usage:
+    python tests/e2e/utils/index_benchmark.py --rows 1000000 --lookup-rows 1000
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+if __package__ in (None, ""):
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.db import DbHelper, db_helper
+from utils.index_advisor import _quote_ident, _timed
+
+SCRATCH_DB = "bobcrm_index_benchmark"
+RECORDS, LOOKUP = "BenchCustomers", "BenchTiers"
+
+# (table, column, unique) for the flagged fields; names follow PostgreSQLDDLGenerator.BuildIndexName.
+FIELD_INDEXES = [
+    (RECORDS, "TierId", False),
+    (RECORDS, "Email", True),
+    (LOOKUP, "Code", True),
+]
+
+
+def index_name(table: str, column: str, unique: bool) -> str:
+    return f"{'UX' if unique else 'IX'}_{table}_{column}"[:63]
+
+
+def index_ddl(table: str, column: str, unique: bool) -> str:
+    return (f"CREATE {'UNIQUE ' if unique else ''}INDEX CONCURRENTLY IF NOT EXISTS "
+            f"{_quote_ident(index_name(table, column, unique))} ON {_quote_ident(table)} ({_quote_ident(column)})")
+
+
+def create_scratch(source: DbHelper, rows: int, lookup_rows: int, scratch_db: str = SCRATCH_DB) -> DbHelper:
+    """Fresh database with both tables shaped like generated dynamic tables (primary key only)."""
+    source.execute_query(f'DROP DATABASE IF EXISTS "{scratch_db}"', strict=True)
+    source.execute_query(f'CREATE DATABASE "{scratch_db}"', strict=True)
+    scratch = DbHelper(source.container_name, scratch_db, source.user)
+    scratch.execute_query(
+        f'CREATE TABLE "{LOOKUP}" ("Id" SERIAL PRIMARY KEY, "Code" VARCHAR(64) NOT NULL, '
+        f'"Name" VARCHAR(200), "IsDeleted" BOOLEAN NOT NULL DEFAULT FALSE)',
+        strict=True,
+    )
+    scratch.execute_query(
+        f'CREATE TABLE "{RECORDS}" ("Id" SERIAL PRIMARY KEY, "Code" VARCHAR(64), "Name" VARCHAR(200), '
+        f'"Email" VARCHAR(200), "TierId" INTEGER, "Score" INTEGER, "IsDeleted" BOOLEAN NOT NULL DEFAULT FALSE, '
+        f'"CreatedAt" TIMESTAMPTZ NOT NULL DEFAULT now())',
+        strict=True,
+    )
+    scratch.execute_query(
+        f'INSERT INTO "{LOOKUP}" ("Code", "Name") '
+        f"SELECT 'TIER-' || g, 'Tier ' || g FROM generate_series(1, {lookup_rows}) AS g",
+        strict=True,
+    )
+    scratch.execute_query(
+        f'INSERT INTO "{RECORDS}" ("Code", "Name", "Email", "TierId", "Score", "IsDeleted", "CreatedAt") '
+        f"SELECT 'C-' || g, 'Customer ' || g, 'customer' || g || '@bench.local', 1 + (g % {lookup_rows}), "
+        f"g % 10000, (g % 50 = 0), now() - (g % 100000) * interval '1 minute' "
+        f"FROM generate_series(1, {rows}) AS g",
+        strict=True,
+    )
+    scratch.execute_query(f'ANALYZE "{LOOKUP}"; ANALYZE "{RECORDS}"', strict=True)
+    return scratch
+
+
+def statements(rows: int, lookup_rows: int) -> list[dict]:
+    """Statements shaped like ReflectionPersistenceService queries and lookup resolution."""
+    email = f"customer{rows // 2}@bench.local"
+    tier = lookup_rows // 2 or 1
+    tier_ids = ", ".join(str(1 + i * max(1, lookup_rows // 20)) for i in range(min(20, lookup_rows)))
+    r, t = _quote_ident(RECORDS), _quote_ident(LOOKUP)
+    return [
+        {"name": "query_equals_email", "kind": "query", "table": RECORDS,
+         "sql": f"""SELECT * FROM {r} WHERE "Email" = '{email}' AND "IsDeleted" = FALSE ORDER BY "Id" LIMIT 20"""},
+        {"name": "query_equals_tier_page", "kind": "query", "table": RECORDS,
+         "sql": f"""SELECT * FROM {r} WHERE "TierId" = {tier} AND "IsDeleted" = FALSE ORDER BY "Id" LIMIT 20 OFFSET 40"""},
+        {"name": "query_equals_tier_count", "kind": "query", "table": RECORDS,
+         "sql": f"""SELECT COUNT(*) FROM {r} WHERE "TierId" = {tier} AND "IsDeleted" = FALSE"""},
+        {"name": "lookup_resolve_by_code", "kind": "lookup", "table": LOOKUP,
+         "sql": f"""SELECT "Id", "Name" FROM {t} WHERE "Code" = 'TIER-{tier}'"""},
+        {"name": "lookup_resolve_by_id", "kind": "lookup", "table": LOOKUP,
+         "sql": f"""SELECT "Id", "Name" FROM {t} WHERE "Id" = ANY(ARRAY[{tier_ids}])"""},
+        {"name": "lookup_join_by_tier_code", "kind": "lookup", "table": RECORDS,
+         "sql": f"""SELECT c."Id", c."Name", l."Name" FROM {r} c JOIN {t} l ON l."Id" = c."TierId" """
+                f"""WHERE l."Code" = 'TIER-{tier}' AND c."IsDeleted" = FALSE ORDER BY c."Id" LIMIT 20"""},
+        {"name": "lookup_referencing_count", "kind": "lookup", "table": RECORDS,
+         "sql": f"""SELECT "TierId", COUNT(*) FROM {r} WHERE "TierId" = ANY(ARRAY[{tier_ids}]) GROUP BY "TierId\""""},
+    ]
+
+
+def benchmark(rows: int = 1_000_000, lookup_rows: int = 1_000, repeat: int = 5,
+              source: DbHelper = db_helper, keep_scratch: bool = False) -> dict:
+    scratch = create_scratch(source, rows, lookup_rows)
+    try:
+        results = [dict(s) for s in statements(rows, lookup_rows)]
+        for s in results:
+            s["without"] = _timed(scratch, s["sql"], s["table"], repeat)
+
+        indexes = []
+        for table, column, unique in FIELD_INDEXES:
+            ddl = index_ddl(table, column, unique)
+            started = time.perf_counter()
+            scratch.execute_query(ddl, strict=True)
+            name = index_name(table, column, unique)
+            indexes.append({
+                "name": name,
+                "ddl": ddl,
+                "build_s": round(time.perf_counter() - started, 2),
+                "size": scratch.execute_scalar(f"SELECT pg_size_pretty(pg_relation_size('\"{name}\"'::regclass))"),
+            })
+        scratch.execute_query(f'ANALYZE "{LOOKUP}"; ANALYZE "{RECORDS}"', strict=True)
+
+        for s in results:
+            s["with"] = _timed(scratch, s["sql"], s["table"], repeat)
+            before, after = s["without"]["execution_ms"], s["with"]["execution_ms"]
+            s["speedup"] = round(before / after, 1) if after else None
+        return {"rows": rows, "lookup_rows": lookup_rows, "repeat": repeat, "indexes": indexes, "statements": results}
+    finally:
+        if not keep_scratch:
+            source.execute_query(f'DROP DATABASE IF EXISTS "{SCRATCH_DB}"')
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Dynamic table latency with and without field-level indexes")
+    parser.add_argument("--rows", type=int, default=1_000_000, help=f"rows in {RECORDS}")
+    parser.add_argument("--lookup-rows", type=int, default=1_000, help=f"rows in {LOOKUP}")
+    parser.add_argument("--repeat", type=int, default=5, help="EXPLAIN ANALYZE runs per statement (median)")
+    parser.add_argument("--keep-scratch", action="store_true", help=f"keep the {SCRATCH_DB} database")
+    parser.add_argument("--out", default=os.path.join("tests", "e2e", "reports", "index_benchmark_latest.json"))
+    args = parser.parse_args(argv)
+
+    print(f"[PG] Seeding {RECORDS} ({args.rows} rows) and {LOOKUP} ({args.lookup_rows} rows) in {SCRATCH_DB}")
+    result = benchmark(args.rows, args.lookup_rows, args.repeat, keep_scratch=args.keep_scratch)
+
+    print(f"{'Statement':<28} | {'Without':>10} | {'With':>10} | {'Speedup':>7} | Indexes used")
+    print("-" * 100)
+    for s in result["statements"]:
+        w, i = s["without"], s["with"]
+        print(f"{s['name']:<28} | {w['execution_ms']:>8.2f}ms | {i['execution_ms']:>8.2f}ms | "
+              f"{(s['speedup'] or 0):>6.1f}x | {', '.join(i['indexes_used']) or '-'}")
+    for index in result["indexes"]:
+        print(f"[PG] {index['ddl']}  -- built in {index['build_s']}s, {index['size']}")
+
+    os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+    print(f"[PG] Index benchmark report written: {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
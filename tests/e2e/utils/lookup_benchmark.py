@@ -0,0 +1,230 @@
+"""
+Lookup display resolution cost per list page.
+
+Creates lookup target entities seeded to --target-rows rows, and record entities with --field-counts
+lookup fields (lookupEntityName/lookupDisplayField, as in test_archive_record_binding.py) pointing at
+them, then pages through the records three ways:
+- raw: POST /api/dynamic-entities/{type}/query without lang (no display enrichment)
+- enriched: the same with ?lang=, so DynamicEntityDisplayEnricher resolves every lookup server-side
+- batch: raw pages resolved client-side with ApiHelper.resolve_lookups (/api/lookups/resolve)
+and, with --naive, one resolve call per row and field on the first page for comparison.
+
+Resolve cost per page is enriched - raw. Both the enricher and the batch helper should scale with the
+distinct ids of a page (reported next to rows x fields), not with rows x fields.
+
+Entities are named Perf_Lookup*; they are dropped at the end unless --keep.
+
+Usage:
+    python tests/e2e/utils/lookup_benchmark.py --field-counts 1,5,20 --target-rows 1000,100000,1000000
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import uuid
+
+if __package__ in (None, ""):
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.api import ApiHelper, _field_value, api_helper
+from utils.db import DbHelper, db_helper, drop_all_dynamic_content
+from utils.index_advisor import _quote_ident, seed_rows, table_columns
+
+PREFIX = "Perf_Lookup"
+NAMESPACE = "BobCrm.Base.Custom"
+
+
+def create_entity(api: ApiHelper, entity_name: str, fields: list[dict]) -> dict:
+    payload = {
+        "namespace": NAMESPACE,
+        "entityName": entity_name,
+        "displayName": {"en": entity_name, "zh": entity_name, "ja": entity_name},
+        "structureType": "Single",
+        "fields": fields,
+    }
+    created = api.post("/api/entity-definitions", payload)
+    assert created.status_code in (200, 201), created.text
+    entity = created.json()["data"]
+    entity_id = entity["id"]
+    for step in ("publish", "compile"):
+        resp = api.post(f"/api/entity-definitions/{entity_id}/{step}", {})
+        assert resp.status_code == 200, f"{step} {entity_name}: {resp.text}"
+    return {"id": entity_id, "entityName": entity_name,
+            "fullTypeName": entity.get("fullTypeName") or f"{NAMESPACE}.{entity_name}",
+            "route": str(entity.get("entityRoute") or entity_name).lower(), "table": f"{entity_name}s"}
+
+
+def create_target(api: ApiHelper, db: DbHelper, suffix: str, rows: int) -> dict:
+    target = create_entity(api, f"{PREFIX}Target{rows}_{suffix}", [
+        {"propertyName": "Name", "displayName": {"en": "Name"}, "dataType": "String", "length": 100,
+         "isRequired": True, "sortOrder": 10},
+    ])
+    target["rows"] = seed_rows(db, target["table"], table_columns(db, target["table"]), rows)
+    return target
+
+
+def create_records(api: ApiHelper, db: DbHelper, suffix: str, target: dict, field_count: int, rows: int) -> dict:
+    fields = [
+        {"propertyName": "Name", "displayName": {"en": "Name"}, "dataType": "String", "length": 100,
+         "isRequired": True, "sortOrder": 10},
+    ]
+    lookup_names = [f"Ref{i:02d}Id" for i in range(1, field_count + 1)]
+    for i, name in enumerate(lookup_names, start=1):
+        fields.append({
+            "propertyName": name, "displayName": {"en": name}, "dataType": "Int32", "isRequired": False,
+            "sortOrder": 10 + i * 10, "isEntityRef": True,
+            "lookupEntityName": target["entityName"], "lookupDisplayField": "Name",
+        })
+    records = create_entity(api, f"{PREFIX}Rec{field_count}x{target['rows']}_{suffix}", fields)
+    records["rows"] = seed_rows(db, records["table"], table_columns(db, records["table"]), rows)
+    # Ids spread over the whole target table, so a page holds up to rows x fields distinct ids.
+    assignments = ", ".join(f"{_quote_ident(n)} = 1 + floor(random() * {target['rows']})::int" for n in lookup_names)
+    db.execute_query(f"UPDATE {_quote_ident(records['table'])} SET {assignments}", strict=True)
+    records["lookup_fields"] = [
+        {"propertyName": n, "lookupEntityName": target["entityName"], "lookupDisplayField": "Name"} for n in lookup_names
+    ]
+    return records
+
+
+def _query_page(api: ApiHelper, records: dict, skip: int, take: int, lang: str | None) -> tuple[float, list[dict]]:
+    endpoint = f"/api/dynamic-entities/{records['fullTypeName']}/query?includeMeta=false"
+    if lang:
+        endpoint += f"&lang={lang}"
+    started = time.perf_counter()
+    resp = api.post(endpoint, {"skip": skip, "take": take, "orderBy": "Id"})
+    elapsed = (time.perf_counter() - started) * 1000
+    assert resp.status_code == 200, resp.text
+    return elapsed, resp.json()["data"]["data"]
+
+
+def _distinct_ids(rows: list[dict], fields: list[dict]) -> int:
+    ids = set()
+    for row in rows:
+        for f in fields:
+            value = _field_value(row, f["propertyName"])
+            if value is not None:
+                ids.add(value)
+    return len(ids)
+
+
+def measure(api: ApiHelper, records: dict, page_size: int, pages: int, lang: str, naive: bool) -> dict:
+    fields = records["lookup_fields"]
+    raw_ms, enriched_ms, batch_ms, batch_calls, distinct, labelled = [], [], [], [], [], 0
+    all_rows = []
+    for page in range(pages):
+        skip = page * page_size
+        raw, rows = _query_page(api, records, skip, page_size, None)
+        enriched, enriched_rows = _query_page(api, records, skip, page_size, lang)
+        raw_ms.append(raw)
+        enriched_ms.append(enriched)
+        labelled += sum(len(r.get("__display") or {}) for r in enriched_rows)
+        distinct.append(_distinct_ids(rows, fields))
+
+        calls_before = api.lookup_resolve_calls
+        started = time.perf_counter()
+        resolved = api.resolve_lookups(rows, fields)
+        batch_ms.append((time.perf_counter() - started) * 1000)
+        batch_calls.append(api.lookup_resolve_calls - calls_before)
+        assert all(isinstance(m, dict) for m in resolved.values())
+        all_rows += rows
+
+    # Across pages: one dedup pass over everything listed so far.
+    calls_before = api.lookup_resolve_calls
+    started = time.perf_counter()
+    api.resolve_lookups(all_rows, fields)
+    all_pages = {"ms": (time.perf_counter() - started) * 1000, "calls": api.lookup_resolve_calls - calls_before,
+                 "distinct_ids": _distinct_ids(all_rows, fields), "row_field_refs": len(all_rows) * len(fields)}
+
+    result = {
+        "entity": records["fullTypeName"],
+        "lookup_fields": len(fields),
+        "page_size": page_size,
+        "pages": pages,
+        "row_field_refs_per_page": page_size * len(fields),
+        "distinct_ids_per_page": statistics.mean(distinct) if distinct else 0,
+        "raw_ms_p50": statistics.median(raw_ms),
+        "enriched_ms_p50": statistics.median(enriched_ms),
+        "resolve_ms_p50": statistics.median(e - r for e, r in zip(enriched_ms, raw_ms)),
+        "labels_per_page": labelled / pages if pages else 0,
+        "batch_ms_p50": statistics.median(batch_ms),
+        "batch_calls_per_page": statistics.mean(batch_calls),
+        "all_pages_batch": all_pages,
+    }
+    if naive and all_rows:
+        first_page = all_rows[:page_size]
+        started = time.perf_counter()
+        calls = 0
+        for row in first_page:
+            for f in fields:
+                value = _field_value(row, f["propertyName"])
+                if value is not None:
+                    api.resolve_lookup_ids(f["lookupEntityName"], [value], f["lookupDisplayField"])
+                    calls += 1
+        result["naive_first_page"] = {"ms": (time.perf_counter() - started) * 1000, "calls": calls}
+    return result
+
+
+def run(field_counts: list[int], target_rows: list[int], records: int, page_size: int, pages: int,
+        lang: str = "en", naive: bool = False, keep: bool = False,
+        api: ApiHelper = api_helper, db: DbHelper = db_helper) -> dict:
+    assert api.login_as_admin(), "admin login failed"
+    suffix = uuid.uuid4().hex[:6]
+    results = []
+    try:
+        for rows in target_rows:
+            print(f"[PERF] Creating lookup target with {rows} rows")
+            target = create_target(api, db, suffix, rows)
+            for count in field_counts:
+                print(f"[PERF] Creating records with {count} lookup fields -> {target['entityName']}")
+                rec = create_records(api, db, suffix, target, count, records)
+                row = measure(api, rec, page_size, pages, lang, naive)
+                row["target_rows"] = target["rows"]
+                results.append(row)
+        return {"records": records, "page_size": page_size, "pages": pages, "results": results}
+    finally:
+        if not keep:
+            drop_all_dynamic_content(prefixes=(PREFIX,), strict=False)
+
+
+def _int_list(value: str) -> list[int]:
+    return [int(v) for v in value.split(",") if v.strip()]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Lookup display resolution cost per list page")
+    parser.add_argument("--field-counts", type=_int_list, default=[1, 5, 20], help="lookup fields per record entity")
+    parser.add_argument("--target-rows", type=_int_list, default=[1_000, 100_000, 1_000_000], help="rows per lookup target")
+    parser.add_argument("--records", type=int, default=2_000, help="rows per record entity")
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--pages", type=int, default=10)
+    parser.add_argument("--lang", default=os.getenv("E2E_LANG", "en"))
+    parser.add_argument("--naive", action="store_true", help="also time one resolve call per row and field (first page)")
+    parser.add_argument("--keep", action="store_true", help=f"keep the {PREFIX}* entities")
+    parser.add_argument("--out", default=os.path.join("tests", "e2e", "reports", "lookup_benchmark_latest.json"))
+    args = parser.parse_args(argv)
+
+    result = run(args.field_counts, args.target_rows, args.records, args.page_size, args.pages,
+                 args.lang, args.naive, args.keep)
+
+    print(f"{'Target rows':>11} | {'Fields':>6} | {'Refs/page':>9} | {'Distinct':>8} | {'Raw':>8} | "
+          f"{'Enriched':>8} | {'Resolve':>8} | {'Batch':>8} | Calls")
+    print("-" * 100)
+    for r in result["results"]:
+        print(f"{r['target_rows']:>11} | {r['lookup_fields']:>6} | {r['row_field_refs_per_page']:>9} | "
+              f"{r['distinct_ids_per_page']:>8.0f} | {r['raw_ms_p50']:>6.1f}ms | {r['enriched_ms_p50']:>6.1f}ms | "
+              f"{r['resolve_ms_p50']:>6.1f}ms | {r['batch_ms_p50']:>6.1f}ms | {r['batch_calls_per_page']:.1f}")
+        if "naive_first_page" in r:
+            n = r["naive_first_page"]
+            print(f"{'':>11}   naive first page: {n['calls']} calls, {n['ms']:.0f}ms")
+
+    os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+    print(f"[PERF] Lookup benchmark report written: {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,265 @@
+"""
+Per-test request waterfall capture for E2E runs.
+
+Two sources are recorded:
+- browser: every request the page makes (document, static assets, _blazor negotiate, JS fetches),
+  via Playwright request/requestfinished/requestfailed events
+- app-server: BobCrm.App is Blazor Server, so its API calls are made by the App process, not the
+  browser. ApiRecordingProxy is a small forwarding proxy in front of API_BASE; the harness points the
+  context's apiBase (cookie + localStorage) at it, so every API call made for the circuit is recorded
+  and attributed to the running test.
+
+The analysis flags identical GETs issued more than once and serial chains of GETs that never overlap
+(each starts right after the previous one ends) and could have been issued in parallel.
+"""
+import http.client
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+HOP_BY_HOP = {
+    "connection", "keep-alive", "proxy-authenticate", "proxy-authorization",
+    "te", "trailers", "transfer-encoding", "upgrade", "host", "content-length",
+}
+
+
+def _is_query_path(path: str) -> bool:
+    path = urlsplit(path).path
+    return path.startswith("/api/dynamic-entities/") and path.endswith("/query")
+
+
+class ApiRecordingProxy:
+    """Threaded HTTP forwarder to the API that records method/url/status/timing/bytes per request."""
+
+    def __init__(self, target: str, host: str = "127.0.0.1", port: int = 0):
+        self.target = urlsplit(target)
+        self.entries: list[dict] = []
+        self.current_test = None
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _handler_class(self):
+        proxy = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def _forward(self):
+                started = time.time()
+                t0 = time.perf_counter()
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else None
+                headers = {k: v for k, v in self.headers.items() if k.lower() not in HOP_BY_HOP}
+                conn_cls = http.client.HTTPSConnection if proxy.target.scheme == "https" else http.client.HTTPConnection
+                conn = conn_cls(proxy.target.hostname, proxy.target.port, timeout=300)
+                status, payload, resp_headers = 502, b"", []
+                try:
+                    conn.request(self.command, self.path, body=body, headers=headers)
+                    resp = conn.getresponse()
+                    status, payload, resp_headers = resp.status, resp.read(), resp.getheaders()
+                except Exception as ex:
+                    payload = str(ex).encode("utf-8")
+                finally:
+                    conn.close()
+
+                self.send_response(status)
+                for k, v in resp_headers:
+                    if k.lower() not in HOP_BY_HOP:
+                        self.send_header(k, v)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                if self.command != "HEAD":
+                    self.wfile.write(payload)
+
+                entry = {
+                    "source": "app-server",
+                    "method": self.command,
+                    "url": self.path,
+                    "status": status,
+                    "started_at": started,
+                    "duration_ms": (time.perf_counter() - t0) * 1000,
+                    "bytes": len(payload),
+                }
+                if body and self.command == "POST" and _is_query_path(self.path):
+                    # Kept so utils/index_advisor.py can replay the recorded query mix.
+                    try:
+                        entry["payload"] = json.loads(body)
+                    except ValueError:
+                        pass
+                proxy.record(entry)
+
+            do_GET = do_POST = do_PUT = do_DELETE = do_PATCH = do_HEAD = do_OPTIONS = _forward
+
+        return _Handler
+
+    def record(self, entry: dict):
+        with self._lock:
+            entry["nodeid"] = self.current_test
+            self.entries.append(entry)
+
+    def entries_for(self, nodeid: str) -> list[dict]:
+        with self._lock:
+            return [e for e in self.entries if e.get("nodeid") == nodeid]
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._server.serve_forever, name="api-recording-proxy", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        if self._thread is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread = None
+
+
+class BrowserRequestRecorder:
+    """Records the page's own network requests via Playwright events."""
+
+    def __init__(self, page):
+        self.entries: list[dict] = []
+        self._pending: dict[int, dict] = {}
+        page.on("request", self._on_request)
+        page.on("requestfinished", self._on_finished)
+        page.on("requestfailed", self._on_failed)
+
+    def _on_request(self, request):
+        self._pending[id(request)] = {
+            "source": "browser",
+            "method": request.method,
+            "url": request.url,
+            "resource_type": request.resource_type,
+            "started_at": time.time(),
+        }
+
+    def _complete(self, request, status):
+        entry = self._pending.pop(id(request), None)
+        if entry is None:
+            return
+        timing = request.timing or {}
+        # Playwright timing: startTime is epoch ms, the rest are ms relative to it (-1 when unavailable).
+        if timing.get("startTime"):
+            entry["started_at"] = timing["startTime"] / 1000.0
+        response_end = timing.get("responseEnd", -1)
+        entry["duration_ms"] = response_end if response_end and response_end > 0 else (time.time() - entry["started_at"]) * 1000
+        entry["status"] = status
+        try:
+            sizes = request.sizes()
+            entry["bytes"] = int(sizes.get("responseBodySize", 0)) + int(sizes.get("responseHeadersSize", 0))
+        except Exception:
+            entry["bytes"] = None
+        self.entries.append(entry)
+
+    def _on_finished(self, request):
+        try:
+            response = request.response()
+            status = response.status if response else None
+        except Exception:
+            status = None
+        self._complete(request, status)
+
+    def _on_failed(self, request):
+        self._complete(request, "failed")
+
+
+def _key(entry: dict) -> str:
+    url = entry["url"]
+    parts = urlsplit(url)
+    return f"{entry['method']} {parts.path}{'?' + parts.query if parts.query else ''}"
+
+
+def find_duplicate_gets(entries: list[dict]) -> list[dict]:
+    """Identical successful GETs (same source, path and query) issued more than once."""
+    counts: dict[tuple[str, str], int] = {}
+    for e in entries:
+        if e["method"] != "GET" or not isinstance(e.get("status"), int) or not 200 <= e["status"] < 400:
+            continue
+        k = (e["source"], _key(e))
+        counts[k] = counts.get(k, 0) + 1
+    return [{"source": s, "request": k, "count": n} for (s, k), n in sorted(counts.items()) if n > 1]
+
+
+def find_serial_chains(entries: list[dict], max_gap_ms: float = 30.0, min_length: int = 3) -> list[dict]:
+    """
+    Runs of GETs to different URLs where each starts within max_gap_ms after the previous one
+    finished and never overlaps it: typical of sequential awaits that could be issued concurrently.
+    """
+    chains = []
+    for source in sorted({e["source"] for e in entries}):
+        gets = sorted(
+            (e for e in entries if e["source"] == source and e["method"] == "GET" and e.get("duration_ms") is not None),
+            key=lambda e: e["started_at"],
+        )
+        current: list[dict] = []
+        for e in gets:
+            if current:
+                prev = current[-1]
+                prev_end = prev["started_at"] + prev["duration_ms"] / 1000.0
+                gap_ms = (e["started_at"] - prev_end) * 1000
+                if 0 <= gap_ms <= max_gap_ms and _key(e) != _key(prev):
+                    current.append(e)
+                    continue
+                if len(current) >= min_length:
+                    chains.append(current)
+            current = [e]
+        if len(current) >= min_length:
+            chains.append(current)
+
+    return [
+        {
+            "source": chain[0]["source"],
+            "length": len(chain),
+            "serial_ms": sum(e["duration_ms"] for e in chain),
+            "parallel_ms": max(e["duration_ms"] for e in chain),
+            "requests": [_key(e) for e in chain],
+        }
+        for chain in chains
+    ]
+
+
+def build_waterfall(nodeid: str, entries: list[dict]) -> dict:
+    entries = sorted(entries, key=lambda e: e["started_at"])
+    t0 = entries[0]["started_at"] if entries else 0.0
+    rows = [
+        {
+            "offset_ms": round((e["started_at"] - t0) * 1000, 1),
+            "duration_ms": round(e["duration_ms"], 1) if e.get("duration_ms") is not None else None,
+            "source": e["source"],
+            "method": e["method"],
+            "status": e.get("status"),
+            "bytes": e.get("bytes"),
+            "url": e["url"],
+            **({"payload": e["payload"]} if "payload" in e else {}),
+        }
+        for e in entries
+    ]
+    return {
+        "nodeid": nodeid,
+        "requests": len(rows),
+        "by_source": {s: sum(1 for r in rows if r["source"] == s) for s in sorted({r["source"] for r in rows})},
+        "duplicate_gets": find_duplicate_gets(entries),
+        "serial_chains": find_serial_chains(entries),
+        "waterfall": rows,
+    }
+
+
+def write_waterfall(out_dir: str, name: str, waterfall: dict) -> str:
+    os.makedirs(out_dir, exist_ok=True)
+    path = os.path.join(out_dir, f"{name}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(waterfall, f, ensure_ascii=False, indent=2)
+    return path
@@ -0,0 +1,82 @@
+"""
+Front-end page metrics for Blazor pages: Navigation Timing, LCP, long tasks, JS heap and circuit
+time-to-interactive, checked against per-route budgets.
+"""
+import json
+
+# Routes.razor calls bobcrm.markCircuitReady once the circuit is interactive and the splash is gone.
+# Older app builds without the signal fall back to the splash/stage check.
+CIRCUIT_READY_JS = """
+() => document.documentElement.getAttribute('data-circuit') === 'ready'
+    || (!!window.bobcrm && typeof window.bobcrm.markCircuitReady !== 'function'
+        && (!document.querySelector('.app-splash') || !!document.querySelector('.app-stage.ready')))
+""".strip()
+
+# Installed as an init script before navigation so buffered LCP/long-task entries are observed.
+PERF_OBSERVER_INIT_SCRIPT = """
+(() => {
+  const perf = window.__bobcrmPerf = { lcpMs: null, longTasks: 0, longTaskMs: 0 };
+  try {
+    new PerformanceObserver((list) => {
+      const entries = list.getEntries();
+      if (entries.length) perf.lcpMs = entries[entries.length - 1].startTime;
+    }).observe({ type: 'largest-contentful-paint', buffered: true });
+  } catch (e) { }
+  try {
+    new PerformanceObserver((list) => {
+      for (const e of list.getEntries()) { perf.longTasks += 1; perf.longTaskMs += e.duration; }
+    }).observe({ type: 'longtask', buffered: true });
+  } catch (e) { }
+})();
+"""
+
+COLLECT_JS = """
+() => {
+  const nav = performance.getEntriesByType('navigation')[0];
+  const perf = window.__bobcrmPerf || {};
+  const mem = performance.memory;
+  return {
+    ttfb_ms: nav ? nav.responseStart - nav.startTime : null,
+    dom_content_loaded_ms: nav ? nav.domContentLoadedEventEnd - nav.startTime : null,
+    load_ms: nav && nav.loadEventEnd > 0 ? nav.loadEventEnd - nav.startTime : null,
+    transfer_kb: nav ? nav.transferSize / 1024 : null,
+    lcp_ms: perf.lcpMs === undefined ? null : perf.lcpMs,
+    long_tasks: perf.longTasks || 0,
+    long_task_ms: perf.longTaskMs || 0,
+    tti_ms: (window.bobcrm && window.bobcrm.circuitReadyAt) || null,
+    js_heap_mb: mem ? mem.usedJSHeapSize / (1024 * 1024) : null,
+  };
+}
+"""
+
+
+def collect_page_metrics(page) -> dict:
+    """Collect metrics for the current document; JS heap falls back to CDP when performance.memory is absent."""
+    metrics = page.evaluate(COLLECT_JS)
+    if metrics.get("js_heap_mb") is None:
+        try:
+            cdp = page.context.new_cdp_session(page)
+            cdp.send("Performance.enable")
+            values = {m["name"]: m["value"] for m in cdp.send("Performance.getMetrics")["metrics"]}
+            metrics["js_heap_mb"] = values.get("JSHeapUsedSize", 0) / (1024 * 1024)
+            cdp.detach()
+        except Exception:
+            pass
+    return metrics
+
+
+def load_budgets(path: str) -> dict:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def check_budgets(metrics: dict, budget: dict) -> list[str]:
+    """Return violations as 'metric=value > budget' strings; metrics that were not measured are skipped."""
+    violations = []
+    for metric, limit in budget.items():
+        value = metrics.get(metric)
+        if limit is None or value is None:
+            continue
+        if value > limit:
+            violations.append(f"{metric}={value:.1f} > {limit}")
+    return violations
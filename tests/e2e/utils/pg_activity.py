@@ -0,0 +1,317 @@
+"""
+FIX-05: SQL connection-leak and pool-saturation watchdog.
+
+Polls pg_stat_activity (grouped by application_name/state) on a background thread during
+E2E or Locust runs, writes the time series to disk and flags:
+- connections that grow monotonically over the run (leak)
+- "idle in transaction" sessions older than a threshold (unreleased transactions)
+
+The ramp mode drives increasing concurrency against one API endpoint and reports the level at
+which the API's Npgsql pool saturates (connection count plateaus while latency/errors climb).
+
+Usage:
+    python tests/e2e/utils/pg_activity.py sample --duration 60
+    python tests/e2e/utils/pg_activity.py ramp --levels 10,25,50,100,150 --path /api/users
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+if __package__ in (None, ""):
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.db import db_helper
+
+# Npgsql leaves application_name empty unless the connection string sets "Application Name".
+NO_APP_NAME = "(none)"
+
+ACTIVITY_SQL = """
+SELECT COALESCE(NULLIF(application_name, ''), '(none)'),
+       COALESCE(state, 'unknown'),
+       count(*),
+       COALESCE(max(EXTRACT(EPOCH FROM (now() - state_change)))
+                FILTER (WHERE state = 'idle in transaction'), 0)
+FROM pg_stat_activity
+WHERE datname = current_database() AND pid <> pg_backend_pid()
+GROUP BY 1, 2
+ORDER BY 1, 2;
+""".strip()
+
+
+class PgActivitySampler:
+    """Background sampler of pg_stat_activity; one sample per interval, grouped by app/state."""
+
+    def __init__(
+        self,
+        db=db_helper,
+        interval_s: float = 1.0,
+        idle_in_tx_threshold_s: float = 30.0,
+        leak_min_growth: int = 5,
+        leak_segments: int = 4,
+        ignore_apps: tuple[str, ...] = ("psql",),
+    ):
+        self.db = db
+        self.interval_s = interval_s
+        self.idle_in_tx_threshold_s = idle_in_tx_threshold_s
+        self.leak_min_growth = leak_min_growth
+        self.leak_segments = max(2, leak_segments)
+        self.ignore_apps = set(ignore_apps)
+        self.samples: list[dict] = []
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def sample_once(self) -> dict:
+        """Take one snapshot: {ts, apps: {app: {state: count}}, max_idle_in_tx_s: {app: seconds}}."""
+        rows = self.db.execute_rows(ACTIVITY_SQL)
+        apps: dict[str, dict[str, int]] = {}
+        idle_in_tx: dict[str, float] = {}
+        for row in rows:
+            if len(row) < 4:
+                continue
+            app, state, count, idle_s = row[0], row[1], row[2], row[3]
+            if app in self.ignore_apps:
+                continue
+            try:
+                apps.setdefault(app, {})[state] = int(count)
+                if state == "idle in transaction":
+                    idle_in_tx[app] = float(idle_s or 0)
+            except ValueError:
+                continue
+
+        sample = {"ts": time.time(), "apps": apps, "max_idle_in_tx_s": idle_in_tx}
+        with self._lock:
+            self.samples.append(sample)
+        return sample
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.sample_once()
+            except Exception as ex:
+                print(f"[PG] Sampling failed: {ex}")
+            self._stop.wait(self.interval_s)
+
+    def start(self):
+        if self._thread is not None:
+            return self
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="pg-activity-sampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._thread is None:
+            return self
+        self._stop.set()
+        self._thread.join(timeout=self.interval_s + 15)
+        self._thread = None
+        return self
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def totals(self, app: str | None = None) -> list[int]:
+        """Total connection count per sample (optionally restricted to one application_name)."""
+        with self._lock:
+            samples = list(self.samples)
+        out = []
+        for s in samples:
+            apps = s["apps"]
+            if app is not None:
+                out.append(sum(apps.get(app, {}).values()))
+            else:
+                out.append(sum(sum(states.values()) for states in apps.values()))
+        return out
+
+    def app_names(self) -> list[str]:
+        with self._lock:
+            return sorted({a for s in self.samples for a in s["apps"]})
+
+    def _is_monotonic_growth(self, series: list[int]) -> bool:
+        """
+        Leak heuristic: split the series into segments and require the per-segment peak to never
+        drop and to rise by at least leak_min_growth overall. Segment peaks tolerate per-sample noise.
+        """
+        if len(series) < self.leak_segments * 2:
+            return False
+        size = len(series) / self.leak_segments
+        peaks = [
+            max(series[int(i * size):int((i + 1) * size)] or [0])
+            for i in range(self.leak_segments)
+        ]
+        non_decreasing = all(b >= a for a, b in zip(peaks, peaks[1:]))
+        return non_decreasing and peaks[-1] - peaks[0] >= self.leak_min_growth
+
+    def problems(self) -> list[str]:
+        """Return human-readable violations (empty list means healthy)."""
+        found = []
+        for app in self.app_names():
+            series = self.totals(app)
+            if self._is_monotonic_growth(series):
+                found.append(
+                    f"Connections of '{app}' grew monotonically: {series[0]} -> {series[-1]} over {len(series)} samples"
+                )
+
+        with self._lock:
+            samples = list(self.samples)
+        worst: dict[str, float] = {}
+        for s in samples:
+            for app, secs in s["max_idle_in_tx_s"].items():
+                worst[app] = max(worst.get(app, 0.0), secs)
+        for app, secs in sorted(worst.items()):
+            if secs > self.idle_in_tx_threshold_s:
+                found.append(
+                    f"'{app}' held an idle-in-transaction session for {secs:.1f}s (threshold {self.idle_in_tx_threshold_s:.0f}s)"
+                )
+        return found
+
+    def summary(self) -> dict:
+        with self._lock:
+            samples = list(self.samples)
+        per_app = {}
+        for app in self.app_names():
+            series = self.totals(app)
+            per_app[app] = {"first": series[0], "last": series[-1], "peak": max(series)}
+        return {
+            "samples": len(samples),
+            "interval_s": self.interval_s,
+            "per_app": per_app,
+            "problems": self.problems(),
+        }
+
+    def write_timeseries(self, path: str) -> str:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with self._lock:
+            samples = list(self.samples)
+        payload = {
+            "generated_at_utc": datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ"),
+            "summary": self.summary(),
+            "samples": samples,
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False, indent=2)
+        return path
+
+
+def find_pool_saturation(
+    request_fn,
+    levels: list[int],
+    requests_per_worker: int = 20,
+    api_app: str = NO_APP_NAME,
+    sampler: PgActivitySampler | None = None,
+    plateau_ratio: float = 1.1,
+) -> dict:
+    """
+    Ramp concurrency and report where the API's connection pool saturates.
+
+    request_fn() performs one API call and returns True on success. For every level the API's
+    peak connection count, p95 latency and error ratio are recorded. The pool is considered
+    saturated at the first level where concurrency grew but peak connections did not grow by
+    plateau_ratio and either p95 latency doubled or errors appeared (Npgsql pool timeouts).
+    """
+    sampler = sampler or PgActivitySampler(interval_s=0.5)
+    steps = []
+    saturated_at = None
+
+    def _worker():
+        latencies, errors = [], 0
+        for _ in range(requests_per_worker):
+            t0 = time.perf_counter()
+            try:
+                ok = request_fn()
+            except Exception:
+                ok = False
+            latencies.append(time.perf_counter() - t0)
+            if not ok:
+                errors += 1
+        return latencies, errors
+
+    for level in levels:
+        sampler.samples.clear()
+        with sampler:
+            with ThreadPoolExecutor(max_workers=level) as pool:
+                results = list(pool.map(lambda _: _worker(), range(level)))
+
+        latencies = sorted(l for lat, _ in results for l in lat)
+        errors = sum(e for _, e in results)
+        p95 = latencies[int(round((len(latencies) - 1) * 0.95))] if latencies else 0.0
+        peak = max(sampler.totals(api_app) or [0])
+        step = {
+            "concurrency": level,
+            "peak_connections": peak,
+            "p95_s": p95,
+            "error_ratio": errors / max(1, len(latencies)),
+        }
+        steps.append(step)
+        print(f"[PG] ramp c={level}: peak_conn={peak} p95={p95 * 1000:.0f}ms errors={step['error_ratio']:.1%}")
+
+        if saturated_at is None and len(steps) > 1:
+            prev = steps[-2]
+            conn_flat = peak < prev["peak_connections"] * plateau_ratio
+            degraded = p95 > prev["p95_s"] * 2 or step["error_ratio"] > 0
+            if conn_flat and degraded:
+                saturated_at = level
+
+    return {"steps": steps, "saturated_at_concurrency": saturated_at}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="pg_stat_activity connection watchdog")
+    sub = parser.add_subparsers(dest="mode", required=True)
+
+    p_sample = sub.add_parser("sample", help="sample for a fixed duration and check for leaks")
+    p_sample.add_argument("--duration", type=float, default=60.0)
+    p_sample.add_argument("--interval", type=float, default=1.0)
+    p_sample.add_argument("--idle-tx-threshold", type=float, default=30.0)
+    p_sample.add_argument("--out", default=os.path.join("tests", "e2e", "reports", "pg_activity_latest.json"))
+
+    p_ramp = sub.add_parser("ramp", help="ramp concurrency to find Npgsql pool saturation")
+    p_ramp.add_argument("--levels", default="10,25,50,100,150,200")
+    p_ramp.add_argument("--path", default="/api/users")
+    p_ramp.add_argument("--requests-per-worker", type=int, default=20)
+    p_ramp.add_argument("--api-app", default=NO_APP_NAME, help="application_name used by the API's connections")
+    p_ramp.add_argument("--out", default=os.path.join("tests", "e2e", "reports", "pg_pool_ramp_latest.json"))
+
+    args = parser.parse_args(argv)
+
+    if args.mode == "sample":
+        sampler = PgActivitySampler(interval_s=args.interval, idle_in_tx_threshold_s=args.idle_tx_threshold)
+        with sampler:
+            time.sleep(args.duration)
+        sampler.write_timeseries(args.out)
+        summary = sampler.summary()
+        print(json.dumps(summary, ensure_ascii=False, indent=2))
+        return 1 if summary["problems"] else 0
+
+    import requests
+    from utils.api import api_helper
+
+    if not api_helper.login_as_admin():
+        print("[PG] Admin login failed")
+        return 2
+    url = f"{api_helper.api_base}{args.path}"
+    headers = api_helper.get_headers()
+
+    def _call() -> bool:
+        return requests.get(url, headers=headers, timeout=30).status_code == 200
+
+    levels = [int(x) for x in args.levels.split(",") if x.strip()]
+    result = find_pool_saturation(_call, levels, requests_per_worker=args.requests_per_worker, api_app=args.api_app)
+    os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+    print(f"[PG] Pool saturation at concurrency: {result['saturated_at_concurrency'] or 'not reached'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
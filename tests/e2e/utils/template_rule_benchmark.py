@@ -0,0 +1,256 @@
+"""
+Throughput of runtime template selection (TemplateStateBindingRuleEngine) against the number of rules.
+
+Creates a Perf_Rule* entity (Name, Tier, Region, Status, Score), --templates copies of its Detail
+template and --records records with values drawn from small domains. Then, for each rule count in
+--rule-counts, it replaces the entity's DetailView state bindings with N generated rules and one
+default. The rules vary the match field, the value, and the priority; some values never occur, so
+some records fall through to the default. Finally it calls POST /api/templates/runtime/{entityType}
+once per record from --concurrency threads.
+
+Each resolution is checked against a reference implementation of the rule order (priority desc, id
+asc, case-insensitive equality, default fallback), so the report doubles as a correctness baseline
+for a precompiled rule index. Reported per rule count: resolutions/s, p50/p95 latency and mismatches.
+Reported overall: the p50 slope in ms per rule.
+
+--inline sends the record as entityData, which takes the per-call record load out of the measurement.
+
+Usage:
+    python tests/e2e/utils/template_rule_benchmark.py --rule-counts 1,10,50,200 --records 500 --concurrency 8
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+if __package__ in (None, ""):
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.api import ApiHelper, _field_value, api_helper
+from utils.db import DbHelper, db_helper, drop_all_dynamic_content
+from utils.index_advisor import _quote_ident, seed_rows, table_columns
+from utils.lookup_benchmark import create_entity
+
+PREFIX = "Perf_Rule"
+VIEW_STATE = "DetailView"
+# Field -> values present in the data; rules also use a few values that never occur.
+DOMAINS = {
+    "Tier": [f"T{i}" for i in range(10)],
+    "Region": [f"R{i}" for i in range(20)],
+    "Status": [f"S{i}" for i in range(5)],
+    "Score": [str(i) for i in range(100)],
+}
+
+
+def create_fixture(api: ApiHelper, db: DbHelper, records: int, templates: int, suffix: str) -> dict:
+    entity = create_entity(api, f"{PREFIX}Bench_{suffix}", [
+        {"propertyName": "Name", "displayName": {"en": "Name"}, "dataType": "String", "length": 100, "isRequired": True, "sortOrder": 10},
+        {"propertyName": "Tier", "displayName": {"en": "Tier"}, "dataType": "String", "length": 20, "sortOrder": 20},
+        {"propertyName": "Region", "displayName": {"en": "Region"}, "dataType": "String", "length": 20, "sortOrder": 30},
+        {"propertyName": "Status", "displayName": {"en": "Status"}, "dataType": "String", "length": 20, "sortOrder": 40},
+        {"propertyName": "Score", "displayName": {"en": "Score"}, "dataType": "Int32", "sortOrder": 50},
+    ])
+    table = _quote_ident(entity["table"])
+    seed_rows(db, entity["table"], table_columns(db, entity["table"]), records)
+    db.execute_query(
+        f"""UPDATE {table} SET "Tier" = 'T' || floor(random() * 10)::int, "Region" = 'R' || floor(random() * 20)::int, """
+        f""""Status" = 'S' || floor(random() * 5)::int, "Score" = floor(random() * 100)::int""",
+        strict=True,
+    )
+    rows = db.execute_rows(f'SELECT "Id", "Tier", "Region", "Status", "Score" FROM {table} ORDER BY "Id"', strict=True)
+    entity["records"] = [
+        {"id": int(r[0]), "tier": r[1], "region": r[2], "status": r[3], "score": int(r[4])} for r in rows
+    ]
+
+    resp = api.get(f"/api/templates/bindings/{entity['route']}", params={"usageType": "Detail"})
+    assert resp.status_code == 200, resp.text
+    base_id = int(resp.json()["data"]["templateId"])
+    entity["templates"] = []
+    for i in range(templates):
+        resp = api.post(f"/api/templates/{base_id}/copy", {
+            "name": f"RULE{i}({entity['route']})", "entityType": entity["route"], "usageType": 0,
+            "description": "template rule benchmark",
+        })
+        assert resp.status_code in (200, 201), resp.text
+        entity["templates"].append(int(resp.json()["data"]["id"]))
+    entity["base_template"] = base_id
+    return entity
+
+
+def generate_rules(count: int, templates: list[int], rng: random.Random) -> list[dict]:
+    rules = []
+    for _ in range(count):
+        field = rng.choice(list(DOMAINS))
+        values = DOMAINS[field]
+        # ~20% of rules target a value no record has: they are evaluated but never win.
+        value = rng.choice(values) if rng.random() >= 0.2 else f"X{rng.randint(0, 999)}"
+        rules.append({
+            "matchFieldName": field,
+            "matchFieldValue": value,
+            "templateId": rng.choice(templates),
+            "priority": rng.randint(0, 1000),
+            "isDefault": False,
+        })
+    rules.append({"matchFieldName": None, "matchFieldValue": None, "templateId": templates[0], "priority": 0, "isDefault": True})
+    return rules
+
+
+def replace_bindings(api: ApiHelper, db: DbHelper, route: str, rules: list[dict]) -> list[dict]:
+    # Only this view state's rules: bindings for other states (e.g. the create/edit defaults) stay intact.
+    db.execute_query(
+        f"""DELETE FROM "TemplateStateBindings" WHERE "EntityType" = '{route}' AND "ViewState" = '{VIEW_STATE}'""",
+        strict=True,
+    )
+    created = []
+    for rule in rules:
+        resp = api.post("/api/templates/state-bindings", {"entityType": route, "viewState": VIEW_STATE, "requiredPermission": None, **rule})
+        assert resp.status_code in (200, 201), resp.text
+        created.append({**rule, "id": int(resp.json()["data"]["id"])})
+    return created
+
+
+def matching_rule(rules: list[dict], record: dict) -> dict | None:
+    """First match in engine order: priority desc, id asc, case-insensitive equality."""
+    for rule in sorted((r for r in rules if r["matchFieldName"]), key=lambda r: (-r["priority"], r["id"])):
+        actual = _field_value(record, rule["matchFieldName"])
+        if actual is not None and str(actual).lower() == rule["matchFieldValue"].lower():
+            return rule
+    return None
+
+
+def expected_template(rules: list[dict], record: dict, base_template: int) -> int:
+    """Reference of TemplateStateBindingRuleEngine.SelectTemplateId for the rules this tool creates."""
+    rule = matching_rule(rules, record)
+    if rule:
+        return rule["templateId"]
+    default = [r for r in rules if r["isDefault"]]
+    return default[-1]["templateId"] if default else base_template
+
+
+def resolve_all(api: ApiHelper, route: str, records: list[dict], concurrency: int, inline: bool) -> tuple[list, float]:
+    url = f"{api.api_base}/api/templates/runtime/{route}"
+    headers = api.get_headers()
+    local = threading.local()
+
+    def call(record: dict):
+        session = getattr(local, "session", None)
+        if session is None:
+            session = local.session = requests.Session()
+        body = {"entityId": record["id"]}
+        if inline:
+            body["entityData"] = {k.capitalize(): v for k, v in record.items()}
+        started = time.perf_counter()
+        resp = session.post(url, json=body, headers=headers, timeout=30)
+        elapsed = (time.perf_counter() - started) * 1000
+        template = resp.json()["data"]["template"]["id"] if resp.status_code == 200 else None
+        return record, elapsed, template
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        results = list(pool.map(call, records))
+    return results, time.perf_counter() - started
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))] if ordered else 0.0
+
+
+def _slope(xs: list[float], ys: list[float]) -> float:
+    if len(xs) < 2:
+        return 0.0
+    mx, my = statistics.mean(xs), statistics.mean(ys)
+    var = sum((x - mx) ** 2 for x in xs)
+    return sum((x - mx) * (y - my) for x, y in zip(xs, ys)) / var if var else 0.0
+
+
+def run(rule_counts: list[int], records: int = 500, templates: int = 8, concurrency: int = 8, inline: bool = False,
+        seed: int = 42, keep: bool = False, api: ApiHelper = api_helper, db: DbHelper = db_helper) -> dict:
+    assert api.login_as_admin(), "admin login failed"
+    rng = random.Random(seed)
+    try:
+        fixture = create_fixture(api, db, records, templates, uuid.uuid4().hex[:6])
+        route = fixture["route"]
+        # Warm up the entity type, template and binding caches before the first measurement.
+        resolve_all(api, route, fixture["records"][:concurrency * 2], concurrency, inline)
+        rows = []
+        for count in rule_counts:
+            rules = replace_bindings(api, db, route, generate_rules(count, fixture["templates"], rng))
+            results, wall_s = resolve_all(api, route, fixture["records"], concurrency, inline)
+            latencies = [ms for _, ms, _ in results]
+            errors = sum(1 for _, _, t in results if t is None)
+            mismatches = sum(
+                1 for record, _, t in results
+                if t is not None and t != expected_template(rules, record, fixture["base_template"])
+            )
+            by_template = {}
+            for _, _, t in results:
+                by_template[str(t)] = by_template.get(str(t), 0) + 1
+            rows.append({
+                "rules": count,
+                "resolutions": len(results),
+                "resolutions_per_s": len(results) / wall_s if wall_s else 0.0,
+                "p50_ms": statistics.median(latencies) if latencies else 0.0,
+                "p95_ms": _percentile(latencies, 95),
+                "errors": errors,
+                "mismatches": mismatches,
+                "fell_through_to_default": sum(1 for record, _, _ in results if matching_rule(rules, record) is None),
+                "templates_selected": by_template,
+            })
+            print(f"[PERF] {count} rules: {rows[-1]['resolutions_per_s']:.0f}/s, p50 {rows[-1]['p50_ms']:.1f}ms, "
+                  f"{mismatches} mismatches, {errors} errors")
+        return {
+            "entity": route,
+            "records": len(fixture["records"]),
+            "concurrency": concurrency,
+            "inline": inline,
+            "p50_ms_per_rule": _slope([r["rules"] for r in rows], [r["p50_ms"] for r in rows]),
+            "results": rows,
+        }
+    finally:
+        if not keep:
+            drop_all_dynamic_content(prefixes=(PREFIX,), strict=False)
+
+
+def _int_list(value: str) -> list[int]:
+    return [int(v) for v in value.split(",") if v.strip()]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Template state-binding rule engine throughput vs rule count")
+    parser.add_argument("--rule-counts", type=_int_list, default=[1, 10, 50, 200], help="state bindings per run")
+    parser.add_argument("--records", type=int, default=500, help="records resolved per run (one call each)")
+    parser.add_argument("--templates", type=int, default=8, help="template copies the rules point at")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--inline", action="store_true", help="send entityData instead of entityId")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--keep", action="store_true", help=f"keep the {PREFIX}* entity, templates and bindings")
+    parser.add_argument("--out", default=os.path.join("tests", "e2e", "reports", "template_rule_benchmark_latest.json"))
+    args = parser.parse_args(argv)
+
+    result = run(args.rule_counts, args.records, args.templates, args.concurrency, args.inline, args.seed, args.keep)
+
+    print(f"{'Rules':>6} | {'Res/s':>8} | {'p50':>8} | {'p95':>8} | {'Default':>7} | Mismatches")
+    print("-" * 64)
+    for r in result["results"]:
+        print(f"{r['rules']:>6} | {r['resolutions_per_s']:>8.0f} | {r['p50_ms']:>6.1f}ms | {r['p95_ms']:>6.1f}ms | "
+              f"{r['fell_through_to_default']:>7} | {r['mismatches']}")
+    print(f"[PERF] p50 grows {result['p50_ms_per_rule'] * 1000:.1f}us per rule")
+
+    os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+    print(f"[PERF] Template rule benchmark report written: {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
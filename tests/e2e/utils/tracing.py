@@ -0,0 +1,325 @@
+"""
+W3C trace-context propagation for the test harness and a local OTLP/HTTP span collector.
+
+The harness sends `traceparent` on its API calls (one trace per test or locust request), and the API
+exports its spans (ASP.NET Core, Npgsql, Roslyn compile, DDL, template generation) over OTLP/HTTP
+to SpanCollector, a small in-process receiver. Traces are mapped back to the test that started them,
+so the duration report can show which server work made a slow test slow.
+
+The API side is opt-in: set Telemetry__OtlpEndpoint=http://127.0.0.1:4318/v1/traces for BobCrm.Api.
+Both protobuf (the .NET exporter default) and JSON OTLP payloads are accepted.
+"""
+import json
+import os
+import secrets
+import struct
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import quote
+
+
+def new_trace_id() -> str:
+    return secrets.token_hex(16)
+
+
+def traceparent(trace_id: str) -> str:
+    """traceparent for a new client span in trace_id (sampled)."""
+    return f"00-{trace_id}-{secrets.token_hex(8)}-01"
+
+
+def trace_headers(trace_id: str | None, label: str | None = None) -> dict:
+    if not trace_id:
+        return {}
+    headers = {"traceparent": traceparent(trace_id)}
+    if label:
+        # Baggage values must be percent-encoded.
+        headers["baggage"] = f"bobcrm.test={quote(label, safe='')}"
+    return headers
+
+
+# --- minimal protobuf decoding for ExportTraceServiceRequest ---------------------------------------
+
+def _varint(buf: bytes, pos: int) -> tuple[int, int]:
+    result = shift = 0
+    while True:
+        b = buf[pos]
+        pos += 1
+        result |= (b & 0x7F) << shift
+        if not b & 0x80:
+            return result, pos
+        shift += 7
+
+
+def _fields(buf: bytes):
+    """Yield (field number, wire type, value) of one protobuf message."""
+    pos = 0
+    while pos < len(buf):
+        key, pos = _varint(buf, pos)
+        number, wire = key >> 3, key & 7
+        if wire == 0:
+            value, pos = _varint(buf, pos)
+        elif wire == 1:
+            value, pos = buf[pos:pos + 8], pos + 8
+        elif wire == 2:
+            length, pos = _varint(buf, pos)
+            value, pos = buf[pos:pos + length], pos + length
+        elif wire == 5:
+            value, pos = buf[pos:pos + 4], pos + 4
+        else:
+            raise ValueError(f"unsupported wire type {wire}")
+        yield number, wire, value
+
+
+def _any_value(buf: bytes):
+    for number, wire, value in _fields(buf):
+        if number == 1:
+            return value.decode("utf-8", "replace")
+        if number == 2:
+            return bool(value)
+        if number == 3:
+            return value - (1 << 64) if value >= 1 << 63 else value
+        if number == 4:
+            return struct.unpack("<d", value)[0]
+    return None
+
+
+def _attributes(items: list[bytes]) -> dict:
+    attrs = {}
+    for item in items:
+        key, val = None, None
+        for number, _, value in _fields(item):
+            if number == 1:
+                key = value.decode("utf-8", "replace")
+            elif number == 2:
+                val = _any_value(value)
+        if key:
+            attrs[key] = val
+    return attrs
+
+
+def _span(buf: bytes, service: str | None, scope: str | None) -> dict:
+    span = {"service": service, "scope": scope, "attributes": {}, "status": None}
+    attrs = []
+    for number, _, value in _fields(buf):
+        if number == 1:
+            span["trace_id"] = value.hex()
+        elif number == 2:
+            span["span_id"] = value.hex()
+        elif number == 4:
+            span["parent_span_id"] = value.hex() or None
+        elif number == 5:
+            span["name"] = value.decode("utf-8", "replace")
+        elif number == 6:
+            span["kind"] = value
+        elif number == 7:
+            span["start_ns"] = struct.unpack("<Q", value)[0]
+        elif number == 8:
+            span["end_ns"] = struct.unpack("<Q", value)[0]
+        elif number == 9:
+            attrs.append(value)
+        elif number == 15:
+            span["status"] = dict((n, v) for n, _, v in _fields(value)).get(3)
+    span["attributes"] = _attributes(attrs)
+    span["duration_ms"] = (span.get("end_ns", 0) - span.get("start_ns", 0)) / 1e6
+    return span
+
+
+def decode_protobuf_export(buf: bytes) -> list[dict]:
+    spans = []
+    for number, _, resource_spans in _fields(buf):
+        if number != 1:
+            continue
+        service, scope_blobs = None, []
+        for n, _, value in _fields(resource_spans):
+            if n == 1:  # Resource
+                service = _attributes([v for rn, _, v in _fields(value) if rn == 1]).get("service.name")
+            elif n == 2:
+                scope_blobs.append(value)
+        for scope_spans in scope_blobs:
+            scope, span_blobs = None, []
+            for n, _, value in _fields(scope_spans):
+                if n == 1:
+                    scope = dict((sn, sv) for sn, _, sv in _fields(value)).get(1, b"").decode("utf-8", "replace")
+                elif n == 2:
+                    span_blobs.append(value)
+            spans += [_span(blob, service, scope) for blob in span_blobs]
+    return spans
+
+
+def decode_json_export(doc: dict) -> list[dict]:
+    def _value(v: dict):
+        for k in ("stringValue", "boolValue", "intValue", "doubleValue"):
+            if k in v:
+                return int(v[k]) if k == "intValue" else v[k]
+        return None
+
+    spans = []
+    for rs in doc.get("resourceSpans", []):
+        resource = {a["key"]: _value(a.get("value", {})) for a in rs.get("resource", {}).get("attributes", [])}
+        for ss in rs.get("scopeSpans", []):
+            scope = ss.get("scope", {}).get("name")
+            for s in ss.get("spans", []):
+                start, end = int(s.get("startTimeUnixNano", 0)), int(s.get("endTimeUnixNano", 0))
+                spans.append({
+                    "service": resource.get("service.name"),
+                    "scope": scope,
+                    # OTLP/JSON uses hex ids (not base64) per the spec.
+                    "trace_id": s.get("traceId", "").lower(),
+                    "span_id": s.get("spanId", "").lower(),
+                    "parent_span_id": s.get("parentSpanId") or None,
+                    "name": s.get("name"),
+                    "kind": s.get("kind"),
+                    "start_ns": start,
+                    "end_ns": end,
+                    "duration_ms": (end - start) / 1e6,
+                    "attributes": {a["key"]: _value(a.get("value", {})) for a in s.get("attributes", [])},
+                    "status": (s.get("status") or {}).get("code"),
+                })
+    return spans
+
+
+def span_category(span: dict) -> str:
+    """Coarse bucket for reports: sql, roslyn, ddl, template, http, other."""
+    name = (span.get("name") or "").lower()
+    attrs = span.get("attributes", {})
+    if span.get("scope") == "Npgsql" or attrs.get("db.system") == "postgresql":
+        return "sql"
+    if name.startswith("roslyn."):
+        return "roslyn"
+    if name.startswith("ddl."):
+        return "ddl"
+    if name.startswith("template."):
+        return "template"
+    if "http.request.method" in attrs or "http.method" in attrs:
+        return "http"
+    return "other"
+
+
+class SpanCollector:
+    """In-process OTLP/HTTP trace receiver (POST /v1/traces) that indexes spans by trace id."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 4318):
+        self._spans: dict[str, list[dict]] = {}
+        self._lock = threading.Lock()
+        self.received = 0
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def endpoint(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1/traces"
+
+    def _handler_class(self):
+        collector = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def _read_body(self) -> bytes:
+                if "chunked" not in (self.headers.get("Transfer-Encoding") or "").lower():
+                    return self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                # Exporters that stream the request (no Content-Length) send it chunked.
+                chunks = []
+                while True:
+                    size = int(self.rfile.readline().split(b";", 1)[0].strip() or b"0", 16)
+                    if size == 0:
+                        while self.rfile.readline() not in (b"\r\n", b"\n", b""):
+                            pass  # trailers
+                        return b"".join(chunks)
+                    chunks.append(self.rfile.read(size))
+                    self.rfile.readline()
+
+            def do_POST(self):
+                try:
+                    body = self._read_body()
+                    if "json" in (self.headers.get("Content-Type") or ""):
+                        spans = decode_json_export(json.loads(body or b"{}"))
+                        payload, content_type = b"{}", "application/json"
+                    else:
+                        spans = decode_protobuf_export(body)
+                        payload, content_type = b"", "application/x-protobuf"
+                    collector.add(spans)
+                    self.send_response(200)
+                except Exception as ex:
+                    payload, content_type = str(ex).encode("utf-8"), "text/plain"
+                    self.send_response(400)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+        return _Handler
+
+    def add(self, spans: list[dict]):
+        with self._lock:
+            for span in spans:
+                self._spans.setdefault(span.get("trace_id", ""), []).append(span)
+            self.received += len(spans)
+
+    def spans_for(self, trace_ids) -> list[dict]:
+        with self._lock:
+            return [s for t in trace_ids for s in self._spans.get(t, [])]
+
+    def trace_ids(self) -> list[str]:
+        with self._lock:
+            return list(self._spans)
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._server.serve_forever, name="otlp-span-collector", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        if self._thread is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread = None
+
+
+def slowest_spans(spans: list[dict], top: int = 5, exclude_http: bool = True) -> list[dict]:
+    """Slowest spans, by default skipping the HTTP server spans that wrap all other work."""
+    picked = [s for s in spans if not (exclude_http and span_category(s) == "http")]
+    picked.sort(key=lambda s: s["duration_ms"], reverse=True)
+    return [
+        {
+            "category": span_category(s),
+            "name": s.get("name"),
+            "duration_ms": round(s["duration_ms"], 1),
+            "statement": (s["attributes"].get("db.statement") or s["attributes"].get("db.query.text") or "")[:200] or None,
+        }
+        for s in picked[:top]
+    ]
+
+
+def slowest_traces(collector: SpanCollector, labels: dict[str, str] | None = None, top: int = 10) -> list[dict]:
+    """
+    Slowest traces by server root span (the span whose parent is the harness' client span), each with
+    its slowest inner spans; labelled with the harness label when known, else the root span name.
+    """
+    labels = labels or {}
+    rows = []
+    for trace_id in collector.trace_ids():
+        spans = collector.spans_for([trace_id])
+        ids = {s.get("span_id") for s in spans}
+        roots = [s for s in spans if s.get("parent_span_id") not in ids]
+        if not roots:
+            continue
+        root = max(roots, key=lambda s: s["duration_ms"])
+        rows.append({
+            "trace_id": trace_id,
+            "label": labels.get(trace_id) or root.get("name"),
+            "duration_ms": round(root["duration_ms"], 1),
+            "spans": slowest_spans([s for s in spans if s is not root], top=5),
+        })
+    return sorted(rows, key=lambda r: r["duration_ms"], reverse=True)[:top]
+
+
+def write_span_report(path: str, payload: dict) -> str:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, ensure_ascii=False, indent=2)
+    return path
@@ -0,0 +1,243 @@
+"""
+Concurrent Blazor Server circuit load driven by headless browsers.
+
+Locust only exercises the REST API; Blazor Server capacity is bounded by per-circuit memory in the
+App process and SignalR throughput. This driver opens N concurrent headless Chromium contexts
+(authenticated with the same storage state the E2E conftest uses), runs a scripted journey per
+circuit and, for each concurrency level, records:
+- App RSS before/after the circuits are up -> memory per circuit
+- per-step interaction latency (navigation until the circuit readiness signal), p50/p95/max
+
+Usage:
+    python tests/performance/circuit_load.py --levels 1,5,10,20 --rounds 2
+    python tests/performance/circuit_load.py --app-pid 12345 --report tests/performance/reports/circuits.json
+
+The App process is found by scanning for "BobCrm.App" when --app-pid / PERF_APP_PID is not given;
+memory columns are empty when it runs elsewhere (e.g. another host or container).
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "e2e"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import requests  # noqa: E402
+from playwright.async_api import async_playwright  # noqa: E402
+
+from soak import read_process_rss_bytes  # noqa: E402
+from utils.api import ApiHelper  # noqa: E402
+from utils.auth_state import build_storage_state  # noqa: E402
+from utils.page_metrics import CIRCUIT_READY_JS  # noqa: E402
+
+BASE_URL = os.getenv("BASE_URL", "http://localhost:3000").rstrip("/")
+API_BASE = os.getenv("API_BASE", "http://localhost:5200").rstrip("/")
+E2E_LANG = os.getenv("E2E_LANG", "en").strip() or "en"
+REPORT_DIR = os.getenv("PERF_REPORT_DIR", os.path.join("tests", "performance", "reports"))
+
+
+def find_app_pid(name: str = "BobCrm.App") -> int | None:
+    """First local process whose command line mentions the App (dotnet run / published dll / exe)."""
+    own = os.getpid()
+    try:
+        entries = os.listdir("/proc")
+    except OSError:
+        entries = []
+    for entry in entries:
+        if not entry.isdigit() or int(entry) == own:
+            continue
+        try:
+            with open(f"/proc/{entry}/cmdline", "rb") as f:
+                cmdline = f.read().replace(b"\0", b" ").decode("utf-8", "replace")
+        except OSError:
+            continue
+        # Skip the `dotnet run` wrapper; the App itself runs as BobCrm.App(.dll).
+        if name in cmdline and " run" not in cmdline and "circuit_load" not in cmdline:
+            return int(entry)
+    return None
+
+
+def resolve_journey(helper: ApiHelper) -> list[tuple[str, str]]:
+    """dashboard -> customer list -> entity detail -> form designer, with ids taken from live data."""
+    steps = [("dashboard", "/"), ("customer list", "/customers")]
+    headers = helper.get_headers()
+
+    customers = requests.get(f"{API_BASE}/api/customers", headers=headers, timeout=30)
+    items = (customers.json().get("data") or []) if customers.status_code == 200 else []
+    if items:
+        steps.append(("entity detail", f"/customer/{items[0]['id']}"))
+    else:
+        print("[CIRCUITS] No customers found; entity detail step skipped")
+
+    binding = requests.get(
+        f"{API_BASE}/api/templates/bindings/customer", params={"usageType": "Detail"}, headers=headers, timeout=30
+    )
+    template_id = (binding.json().get("data") or {}).get("templateId") if binding.status_code == 200 else None
+    steps.append(("form designer", f"/designer/{template_id}" if template_id else "/designer/new"))
+    return steps
+
+
+def _pct(values: list[float], p: float) -> float | None:
+    if not values:
+        return None
+    values = sorted(values)
+    return values[max(0, min(len(values) - 1, int(round((len(values) - 1) * p))))]
+
+
+async def _run_circuit(browser, state: dict, journey, rounds: int, latencies: dict, errors: list, opened: asyncio.Event,
+                       ready_count: list, n: int, release: asyncio.Event):
+    marked = False
+
+    def _mark_opened():
+        nonlocal marked
+        if not marked:
+            marked = True
+            ready_count[0] += 1
+            if ready_count[0] == n:
+                opened.set()
+
+    context = None
+    try:
+        context = await browser.new_context(storage_state=state, viewport={"width": 1280, "height": 720})
+        page = await context.new_page()
+        for r in range(rounds):
+            for name, path in journey:
+                t0 = time.perf_counter()
+                try:
+                    await page.goto(f"{BASE_URL}{path}", wait_until="domcontentloaded")
+                    await page.wait_for_function(CIRCUIT_READY_JS, timeout=30000)
+                    latencies.setdefault(name, []).append((time.perf_counter() - t0) * 1000)
+                except Exception as ex:
+                    errors.append(f"{name}: {str(ex).splitlines()[0]}")
+            if r == 0:
+                _mark_opened()
+        # Keep the circuit alive until memory has been sampled with all N circuits up.
+        await release.wait()
+    finally:
+        _mark_opened()
+        if context is not None:
+            await context.close()
+
+
+async def run_level(browser, state: dict, journey, n: int, rounds: int, app_pid: int | None, settle_s: float) -> dict:
+    rss_before = read_process_rss_bytes(app_pid) if app_pid else None
+    latencies: dict[str, list[float]] = {}
+    errors: list[str] = []
+    opened, release = asyncio.Event(), asyncio.Event()
+    ready_count = [0]
+
+    started = time.perf_counter()
+    tasks = [
+        asyncio.create_task(_run_circuit(browser, state, journey, rounds, latencies, errors, opened, ready_count, n, release))
+        for _ in range(n)
+    ]
+    done_waiter = asyncio.gather(*tasks, return_exceptions=True)
+
+    # Sample while all circuits are still connected; the peak is what bounds capacity.
+    await opened.wait()
+    await asyncio.sleep(settle_s)
+    rss_peak = read_process_rss_bytes(app_pid) if app_pid else None
+    release.set()
+    results = await done_waiter
+    errors += [repr(r) for r in results if isinstance(r, BaseException)]
+
+    all_latencies = [v for values in latencies.values() for v in values]
+    per_circuit = (
+        (rss_peak - rss_before) / n / (1024 * 1024) if rss_before is not None and rss_peak is not None else None
+    )
+    return {
+        "circuits": n,
+        "duration_s": time.perf_counter() - started,
+        "app_rss_before_mb": rss_before / (1024 * 1024) if rss_before is not None else None,
+        "app_rss_peak_mb": rss_peak / (1024 * 1024) if rss_peak is not None else None,
+        "memory_per_circuit_mb": per_circuit,
+        "latency_ms": {"p50": _pct(all_latencies, 0.50), "p95": _pct(all_latencies, 0.95), "max": _pct(all_latencies, 1.0)},
+        "steps": {
+            name: {"count": len(values), "p50_ms": _pct(values, 0.50), "p95_ms": _pct(values, 0.95)}
+            for name, values in latencies.items()
+        },
+        "errors": errors[:20],
+        "error_count": len(errors),
+    }
+
+
+async def run(levels: list[int], rounds: int, app_pid: int | None, settle_s: float, cooldown_s: float) -> dict:
+    helper = ApiHelper()
+    if not helper.login("admin", "Admin@12345"):
+        raise SystemExit("[CIRCUITS] Admin login failed")
+    state = build_storage_state(helper, BASE_URL, E2E_LANG, API_BASE)
+    journey = resolve_journey(helper)
+    print(f"[CIRCUITS] Journey: {' -> '.join(path for _, path in journey)}; app pid={app_pid}")
+
+    results = []
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        try:
+            for n in levels:
+                level = await run_level(browser, state, journey, n, rounds, app_pid, settle_s)
+                results.append(level)
+                mem = level["memory_per_circuit_mb"]
+                print(
+                    f"[CIRCUITS] n={n:<4} p50={level['latency_ms']['p50'] or 0:.0f}ms "
+                    f"p95={level['latency_ms']['p95'] or 0:.0f}ms "
+                    f"mem/circuit={'n/a' if mem is None else f'{mem:.2f}MB'} errors={level['error_count']}"
+                )
+                # Disconnected circuits are retained server-side for a while; let the App settle.
+                await asyncio.sleep(cooldown_s)
+        finally:
+            await browser.close()
+
+    return {
+        "generated_at_utc": datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ"),
+        "base_url": BASE_URL,
+        "app_pid": app_pid,
+        "journey": [{"step": name, "path": path} for name, path in journey],
+        "rounds": rounds,
+        "levels": results,
+    }
+
+
+def _positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be >= 1, got {number}")
+    return number
+
+
+def _positive_int_list(value: str) -> list[int]:
+    numbers = [_positive_int(x) for x in value.split(",") if x.strip()]
+    if not numbers:
+        raise argparse.ArgumentTypeError("expected at least one circuit count")
+    return numbers
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Concurrent Blazor Server circuit load with headless browsers")
+    parser.add_argument("--levels", type=_positive_int_list, default=[1, 5, 10, 20],
+                        help="comma-separated concurrent circuit counts")
+    # A circuit signals "opened" from its first round, so 0 rounds would leave run_level waiting forever.
+    parser.add_argument("--rounds", type=_positive_int, default=2, help="journeys per circuit and level")
+    parser.add_argument("--app-pid", type=int, default=int(os.getenv("PERF_APP_PID", "0")) or None)
+    parser.add_argument("--settle", type=float, default=2.0, help="seconds to wait before sampling peak RSS")
+    parser.add_argument("--cooldown", type=float, default=5.0, help="seconds between levels")
+    parser.add_argument("--report", default=os.path.join(REPORT_DIR, "circuit_load_latest.json"))
+    args = parser.parse_args(argv)
+
+    app_pid = args.app_pid or find_app_pid()
+    if app_pid is None:
+        print("[CIRCUITS] BobCrm.App process not found locally; memory per circuit will not be reported")
+
+    report = asyncio.run(run(args.levels, args.rounds, app_pid, args.settle, args.cooldown))
+    os.makedirs(os.path.dirname(args.report) or ".", exist_ok=True)
+    with open(args.report, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"[CIRCUITS] Report written: {args.report}")
+    return 1 if any(level["error_count"] for level in report["levels"]) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
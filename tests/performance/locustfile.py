@@ -1,9 +1,50 @@
+import os
+import sys
 import time
 import uuid
 import random
 import requests
 import json
-from locust import HttpUser, task, between, events
+from locust import HttpUser, task, between, constant, constant_throughput, events
+from locust.runners import MasterRunner, WorkerRunner
+
+# Reuse the E2E harness helpers (DbHelper, pg_stat_activity sampler).
+_PERF_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(_PERF_DIR, "..", "e2e"))
+sys.path.insert(0, _PERF_DIR)
+from utils.pg_activity import PgActivitySampler
+from utils.tracing import SpanCollector, new_trace_id, slowest_traces, trace_headers, write_span_report
+from soak import ApiResourceProbe
+import shapes
+from token_pool import mint_token_pool, renew_tokens
+from slo_gate import write_export
+
+PERF_PROFILE = os.getenv("PERF_PROFILE", "").strip().lower()
+PERF_SHAPE = os.getenv("PERF_SHAPE", "").strip().lower()
+# Pre-minted tokens for seeded users of various roles (PERF_TOKEN_POOL=0 falls back to per-user admin login).
+PERF_TOKEN_POOL = os.getenv("PERF_TOKEN_POOL", "1").strip().lower() not in ("0", "false", "no")
+PERF_PG_WATCHDOG = os.getenv("PERF_PG_WATCHDOG", "").strip().lower() in ("1", "true", "yes")
+PERF_REPORT_DIR = os.path.join(_PERF_DIR, "reports")
+# Set by slo_gate.py: where to export per-endpoint stats/histograms at test stop.
+PERF_EXPORT_PATH = os.getenv("PERF_EXPORT_PATH", "").strip()
+PERF_SOAK_COMPILE_INTERVAL_S = float(os.getenv("PERF_SOAK_COMPILE_INTERVAL_S", "300"))
+PERF_SOAK_SAMPLE_INTERVAL_S = float(os.getenv("PERF_SOAK_SAMPLE_INTERVAL_S", "60"))
+# Optional: fail the soak run when working-set growth exceeds this many MB/hour.
+PERF_SOAK_MAX_MB_PER_H = os.getenv("PERF_SOAK_MAX_MB_PER_H", "").strip()
+# Trace-context propagation (opt-in): every request carries a traceparent labelled with the request
+# name; the API exports spans to the local collector (Telemetry__OtlpEndpoint on BobCrm.Api).
+PERF_OTEL = os.getenv("PERF_OTEL", "").strip().lower() in ("1", "true", "yes")
+PERF_OTEL_FLUSH_S = float(os.getenv("PERF_OTEL_FLUSH_S", "6"))
+_PG_SAMPLER = None
+_SPAN_COLLECTOR = None
+_TRACE_LABELS = {}  # trace id -> request name (local runner only)
+_SOAK_PROBE = None
+_KNEE_RECORDER = None
+_TOKEN_POOL = None
+
+# Open model: bind exactly one LoadTestShape into the module namespace so Locust picks it up.
+if PERF_SHAPE:
+    ArrivalShape = shapes.SHAPES[PERF_SHAPE]
 
 # Target the stable entity created via debug script
 SHARED_ENTITY_NAME = "PerfProduct_Stable"
@@ -13,28 +54,202 @@ SHARED_FULL_TYPE_NAME = f"BobCrm.Base.Performance.{SHARED_ENTITY_NAME}"
 def on_test_start(environment, **kwargs):
     print(f"Starting Performance Test against pre-loaded entity: {SHARED_ENTITY_NAME}")
 
+    # Mint tokens before users spawn so the ramp does not turn into a password-hash storm.
+    global _TOKEN_POOL
+    if (PERF_TOKEN_POOL or PERF_PROFILE == "auth") and not isinstance(environment.runner, MasterRunner):
+        _TOKEN_POOL = mint_token_pool(environment.host)
+
+    # FIX-05: "no SQL connection leak" acceptance check (opt-in, master/local runner only).
+    global _PG_SAMPLER
+    if PERF_PG_WATCHDOG and not isinstance(environment.runner, WorkerRunner):
+        _PG_SAMPLER = PgActivitySampler(
+            interval_s=float(os.getenv("PERF_PG_INTERVAL_S", "2")),
+            idle_in_tx_threshold_s=float(os.getenv("PERF_PG_IDLE_TX_THRESHOLD_S", "30")),
+        ).start()
+
+    # Open model: bucket results per shape step to locate the P95 saturation knee.
+    global _KNEE_RECORDER
+    if PERF_SHAPE and isinstance(environment.shape_class, shapes.ArrivalRateShape):
+        _KNEE_RECORDER = shapes.SaturationKneeRecorder(environment.shape_class)
+        environment.events.request.add_listener(_KNEE_RECORDER.on_request)
+        _KNEE_RECORDER.start()
+
+    # Server spans: the collector runs next to locust (local/master runner).
+    global _SPAN_COLLECTOR
+    if PERF_OTEL and not isinstance(environment.runner, WorkerRunner):
+        _SPAN_COLLECTOR = SpanCollector(
+            host=os.getenv("PERF_OTEL_HOST", "127.0.0.1"),
+            port=int(os.getenv("PERF_OTEL_PORT", "4318")),
+        ).start()
+        print(f"[PERF] OTLP span collector: {_SPAN_COLLECTOR.endpoint}")
+
+    # Soak: track API memory and loaded dynamic assemblies for the growth slope.
+    global _SOAK_PROBE
+    if PERF_PROFILE == "soak" and not isinstance(environment.runner, WorkerRunner):
+        api_pid = os.getenv("PERF_API_PID", "").strip()
+        _SOAK_PROBE = ApiResourceProbe(
+            environment.host,
+            interval_s=PERF_SOAK_SAMPLE_INTERVAL_S,
+            pid=int(api_pid) if api_pid else None,
+        ).start()
+
+@events.test_stop.add_listener
+def on_test_stop(environment, **kwargs):
+    if PERF_EXPORT_PATH and not isinstance(environment.runner, WorkerRunner):
+        out_path = write_export(environment.stats, PERF_EXPORT_PATH)
+        print(f"[PERF] Stats export written: {out_path}")
+
+    global _KNEE_RECORDER
+    if _KNEE_RECORDER is not None:
+        recorder, _KNEE_RECORDER = _KNEE_RECORDER, None
+        recorder.active = False
+        out_path = recorder.write_report(os.path.join(PERF_REPORT_DIR, "capacity_latest.json"))
+        report = recorder.report()
+        knee = report["knee"]
+        print(f"[PERF] Capacity report written: {out_path}")
+        if knee:
+            print(f"[PERF] P95 budget ({report['p95_budget_ms']:.0f}ms) broken at {knee['achieved_rps']:.1f} RPS "
+                  f"(target {knee['target_rps']:.0f}, p95 {knee['p95_ms']:.0f}ms)")
+        print(f"[PERF] Capacity within budget: {report['capacity_rps'] or 0:.1f} RPS")
+
+    global _SPAN_COLLECTOR
+    if _SPAN_COLLECTOR is not None:
+        collector, _SPAN_COLLECTOR = _SPAN_COLLECTOR, None
+        time.sleep(PERF_OTEL_FLUSH_S)
+        traces = slowest_traces(collector, _TRACE_LABELS, top=20)
+        collector.stop()
+        out_path = write_span_report(
+            os.path.join(PERF_REPORT_DIR, "server_spans_latest.json"),
+            {"spans_received": collector.received, "slowest_traces": traces},
+        )
+        print(f"[PERF] Server span report written: {out_path}")
+        for t in traces[:5]:
+            inner = ", ".join(f"{s['category']}:{s['name']} {s['duration_ms']:.0f}ms" for s in t["spans"][:2])
+            print(f"[PERF] Slow request {t['label']} {t['duration_ms']:.0f}ms: {inner}")
+
+    global _SOAK_PROBE
+    if _SOAK_PROBE is not None:
+        probe, _SOAK_PROBE = _SOAK_PROBE, None
+        probe.stop()
+        out_path = probe.write_report(os.path.join(PERF_REPORT_DIR, "soak_latest.json"))
+        report = probe.report()
+        print(f"[PERF] Soak report written: {out_path}")
+        print(f"[PERF] Soak growth slopes: {json.dumps(report['slopes'])}")
+        ws_slope = report["slopes"]["working_set_mb_per_h"]
+        if PERF_SOAK_MAX_MB_PER_H and ws_slope is not None and ws_slope > float(PERF_SOAK_MAX_MB_PER_H):
+            print(f"[PERF] Working set grows {ws_slope:.1f} MB/h (budget {PERF_SOAK_MAX_MB_PER_H} MB/h)")
+            environment.process_exit_code = 1
+
+    global _PG_SAMPLER
+    if _PG_SAMPLER is None:
+        return
+    sampler, _PG_SAMPLER = _PG_SAMPLER, None
+    sampler.stop()
+    out_path = sampler.write_timeseries(os.path.join(PERF_REPORT_DIR, "pg_activity_latest.json"))
+    print(f"[PERF] pg_stat_activity time series written: {out_path}")
+    problems = sampler.problems()
+    for p in problems:
+        print(f"[PERF] SQL connection watchdog: {p}")
+    if problems:
+        environment.process_exit_code = 1
+
+def login(client):
+    """Admin login; returns the identity (credentials + tokens) used to renew the token later."""
+    identity = {"username": "admin", "password": "Admin@12345", "accessToken": None, "refreshToken": None}
+    try:
+        response = client.post("/api/auth/login", json={"username": identity["username"], "password": identity["password"]})
+        if response.status_code == 200:
+            data = response.json()['data']
+            identity["accessToken"] = data['accessToken']
+            identity["refreshToken"] = data.get('refreshToken')
+            client.headers.update({"Authorization": f"Bearer {identity['accessToken']}"})
+        else:
+            print(f"Login failed: {response.status_code}")
+    except Exception as e:
+        print(f"Login Exception: {e}")
+    return identity
+
+def keep_token_fresh(user, identity, pooled: bool):
+    """
+    Wrap client.request so the access token (Jwt:AccessMinutes, 60 by default) is renewed before it
+    expires and once more after a 401; otherwise multi-hour soaks end up measuring auth failures.
+    """
+    client = user.client
+    original = client.request
+
+    def _renew(stale_token=None):
+        if pooled:
+            return _TOKEN_POOL.renew(user.host, identity, stale_token)
+        return renew_tokens(user.host, identity, stale_token)
+
+    def _request(method, url, *args, **kwargs):
+        try:
+            _renew()
+        except Exception as e:
+            print(f"Token renewal failed: {e}")
+        token = identity.get("accessToken")
+        if token:
+            client.headers["Authorization"] = f"Bearer {token}"
+        response = original(method, url, *args, **kwargs)
+        if getattr(response, "status_code", None) == 401 and token:
+            try:
+                renewed = _renew(stale_token=token) or identity.get("accessToken") != token
+            except Exception as e:
+                print(f"Token renewal failed: {e}")
+                renewed = False
+            if renewed:
+                client.headers["Authorization"] = f"Bearer {identity['accessToken']}"
+                response = original(method, url, *args, **kwargs)
+        return response
+
+    client.request = _request
+
+def trace_requests(client):
+    """PERF_OTEL: wrap client.request so each request starts a trace labelled with its name."""
+    if not PERF_OTEL:
+        return
+    original = client.request
+
+    def _request(method, url, name=None, **kwargs):
+        trace_id = new_trace_id()
+        label = f"{method} {name or url}"
+        _TRACE_LABELS[trace_id] = label
+        kwargs["headers"] = {**(kwargs.get("headers") or {}), **trace_headers(trace_id, label)}
+        return original(method, url, name=name, **kwargs)
+
+    client.request = _request
+
 class BobCrmUser(HttpUser):
+    # Closed model by default; replaced by OpenModelUser when an arrival-rate shape is selected.
+    abstract = bool(PERF_SHAPE) or PERF_PROFILE == "auth"
     wait_time = between(1, 3)
     
     def on_start(self):
+        trace_requests(self.client)
         self.login()
         self.entity_name = SHARED_ENTITY_NAME
         self.full_type_name = SHARED_FULL_TYPE_NAME
 
     def login(self):
-        # Login to get token
-        try:
-            response = self.client.post("/api/auth/login", json={"username": "admin", "password": "Admin@12345"})
-            if response.status_code == 200:
-                token = response.json()['data']['accessToken']
-                self.client.headers.update({"Authorization": f"Bearer {token}"})
-            else:
-                print(f"Login failed: {response.status_code}")
-        except Exception as e:
-                print(f"Login Exception: {e}")
+        identity = _TOKEN_POOL.acquire() if _TOKEN_POOL is not None else None
+        if identity is None:
+            keep_token_fresh(self, login(self.client), pooled=False)
+            self.can_list_users = True
+            return
+        self.role = identity["role"]
+        self.can_list_users = identity["can_list_users"]
+        self.client.headers.update({"Authorization": f"Bearer {identity['accessToken']}"})
+        keep_token_fresh(self, identity, pooled=True)
+
+    @task(2)
+    def load_my_functions(self):
+        # Per-user permission evaluation: exercises the permission cache across identities.
+        self.client.get("/api/access/functions/me")
 
     @task(3)
     def load_users_list(self):
+        if not self.can_list_users:
+            return self.load_my_functions()
         with self.client.get("/api/users", catch_response=True) as response:
             if response.status_code == 200:
                 try:
@@ -49,9 +264,92 @@ class BobCrmUser(HttpUser):
     @task(5)
     def load_user_detail(self):
         if hasattr(self, 'target_user_id') and self.target_user_id:
-             self.client.get(f"/api/users/{self.target_user_id}")
+             self.client.get(f"/api/users/{self.target_user_id}", name="/api/users/[id]")
         else:
              # Fallback to list if no ID yet
              self.load_users_list()
 
     # Removed dynamic entity tasks
+
+class OpenModelUser(BobCrmUser):
+    """Same task mix as BobCrmUser, paced at a fixed rate so the shape controls arrivals."""
+    abstract = not PERF_SHAPE or PERF_PROFILE == "auth"
+    wait_time = constant_throughput(shapes.PERF_RATE_PER_USER)
+
+class AuthStormUser(HttpUser):
+    """
+    Auth profile (PERF_PROFILE=auth): login and refresh throughput on their own, using the
+    seeded pool identities. Refresh rotates the token, so each user keeps its own chain.
+    """
+    abstract = PERF_PROFILE != "auth"
+    wait_time = between(0.5, 1.5)
+
+    def on_start(self):
+        trace_requests(self.client)
+        identity = _TOKEN_POOL.acquire() if _TOKEN_POOL is not None else None
+        self.username = identity["username"] if identity else "admin"
+        self.password = identity["password"] if identity else "Admin@12345"
+        self.refresh_token = None
+        self.auth_login()
+
+    @task(1)
+    def auth_login(self):
+        with self.client.post(
+            "/api/auth/login",
+            json={"username": self.username, "password": self.password},
+            catch_response=True,
+        ) as response:
+            if response.status_code == 200:
+                self.refresh_token = response.json()["data"].get("refreshToken")
+            else:
+                response.failure(f"Login Failed: {response.status_code}")
+
+    @task(3)
+    def auth_refresh(self):
+        if not self.refresh_token:
+            return self.auth_login()
+        with self.client.post(
+            "/api/auth/refresh",
+            json={"refreshToken": self.refresh_token},
+            catch_response=True,
+        ) as response:
+            if response.status_code == 200:
+                self.refresh_token = response.json()["data"].get("refreshToken")
+            else:
+                self.refresh_token = None
+                response.failure(f"Refresh Failed: {response.status_code}")
+
+class SoakCompileUser(HttpUser):
+    """
+    Soak profile (PERF_PROFILE=soak): a single user that periodically recompiles the shared
+    entity and unloads its assembly, while BobCrmUser keeps query traffic running.
+    """
+    abstract = PERF_PROFILE != "soak"
+    fixed_count = 1
+    wait_time = constant(PERF_SOAK_COMPILE_INTERVAL_S)
+
+    def on_start(self):
+        trace_requests(self.client)
+        keep_token_fresh(self, login(self.client), pooled=False)
+        self.entity_id = None
+        response = self.client.get("/api/entity-definitions", name="/api/entity-definitions")
+        if response.status_code == 200:
+            for e in response.json().get("data") or []:
+                if str(e.get("fullTypeName", "")) == SHARED_FULL_TYPE_NAME:
+                    self.entity_id = e.get("id")
+                    break
+        if not self.entity_id:
+            print(f"Soak: entity not found: {SHARED_FULL_TYPE_NAME}")
+
+    @task
+    def compile_unload_cycle(self):
+        if not self.entity_id:
+            return
+        self.client.post(
+            f"/api/entity-definitions/{self.entity_id}/recompile",
+            name="/api/entity-definitions/[id]/recompile",
+        )
+        self.client.delete(
+            f"/api/entity-definitions/loaded-entities/{SHARED_FULL_TYPE_NAME}",
+            name="/api/entity-definitions/loaded-entities/[fullTypeName]",
+        )
@@ -0,0 +1,191 @@
+"""
+Open-model load shapes (arrival rate) for the Locust suite.
+
+The default BobCrmUser is a closed model: each user waits for its response plus between(1, 3)
+seconds, so a slowing server automatically receives less traffic. These shapes drive a target
+request rate instead: every OpenModelUser paces itself with constant_throughput(PERF_RATE_PER_USER)
+and the shape sizes the user count as target_rps / rate_per_user. Keep PERF_RATE_PER_USER low
+(default 0.5 req/s, i.e. a 2s budget per request) so users do not fall back to closed-loop pacing
+before the P95 budget is already blown.
+
+Select a shape with PERF_SHAPE=constant|step|spike (single-process runs; the knee recorder listens
+to request events in the same process as the shape):
+    PERF_SHAPE=step PERF_STEP_START_RPS=10 PERF_STEP_MAX_RPS=200 PERF_STEP_INC_RPS=10 \\
+        locust -f tests/performance/locustfile.py --headless --host http://localhost:5200
+
+Each step's P95 is compared against the FIX-05 budget (PERF_P95_BUDGET_MS, default 200ms).
+The saturation knee is the first step whose P95 breaks the budget; the capacity is the highest
+achieved RPS before it.
+"""
+import json
+import math
+import os
+from datetime import datetime, timezone
+
+from locust import LoadTestShape
+
+PERF_RATE_PER_USER = float(os.getenv("PERF_RATE_PER_USER", "0.5"))
+PERF_P95_BUDGET_MS = float(os.getenv("PERF_P95_BUDGET_MS", "200"))
+# Fraction of every step ignored while users spawn and the rate settles.
+PERF_STEP_WARMUP_RATIO = float(os.getenv("PERF_STEP_WARMUP_RATIO", "0.2"))
+
+
+def _env_float(name: str, default: float) -> float:
+    return float(os.getenv(name, str(default)))
+
+
+def parse_steps(spec: str) -> list[tuple[float, float]]:
+    """Parse "duration_s:rps,duration_s:rps,..." into [(duration_s, rps), ...]."""
+    steps = []
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        duration, rps = part.split(":", 1)
+        steps.append((float(duration), float(rps)))
+    return steps
+
+
+class ArrivalRateShape(LoadTestShape):
+    """Base shape: a list of (duration_s, target_rps) steps, run back to back."""
+
+    abstract = True
+    rate_per_user = PERF_RATE_PER_USER
+
+    def __init__(self):
+        super().__init__()
+        override = os.getenv("PERF_STEPS", "").strip()
+        self.steps = parse_steps(override) if override else self.build_steps()
+
+    def build_steps(self) -> list[tuple[float, float]]:
+        raise NotImplementedError
+
+    def step_at(self, run_time: float) -> int | None:
+        """Index of the step active at run_time (seconds since start), None when finished."""
+        elapsed = 0.0
+        for i, (duration, _) in enumerate(self.steps):
+            elapsed += duration
+            if run_time < elapsed:
+                return i
+        return None
+
+    def step_window(self, index: int) -> tuple[float, float]:
+        start = sum(d for d, _ in self.steps[:index])
+        return start, start + self.steps[index][0]
+
+    def tick(self):
+        index = self.step_at(self.get_run_time())
+        if index is None:
+            return None
+        target_rps = self.steps[index][1]
+        users = max(1, math.ceil(target_rps / self.rate_per_user))
+        # Spawn the whole step quickly; the warmup window absorbs the ramp.
+        return users, max(1.0, float(users))
+
+
+class ConstantArrivalShape(ArrivalRateShape):
+    abstract = False
+
+    def build_steps(self):
+        return [(_env_float("PERF_DURATION_S", 300), _env_float("PERF_TARGET_RPS", 50))]
+
+
+class StepRampShape(ArrivalRateShape):
+    abstract = False
+
+    def build_steps(self):
+        start = _env_float("PERF_STEP_START_RPS", 10)
+        stop = _env_float("PERF_STEP_MAX_RPS", 200)
+        inc = max(1.0, _env_float("PERF_STEP_INC_RPS", 10))
+        duration = _env_float("PERF_STEP_DURATION_S", 60)
+        steps = []
+        rps = start
+        while rps <= stop:
+            steps.append((duration, rps))
+            rps += inc
+        return steps
+
+
+class SpikeShape(ArrivalRateShape):
+    abstract = False
+
+    def build_steps(self):
+        base = _env_float("PERF_SPIKE_BASE_RPS", 20)
+        peak = _env_float("PERF_SPIKE_PEAK_RPS", 150)
+        return [
+            (_env_float("PERF_SPIKE_BEFORE_S", 120), base),
+            (_env_float("PERF_SPIKE_DURATION_S", 30), peak),
+            (_env_float("PERF_SPIKE_AFTER_S", 120), base),
+        ]
+
+
+SHAPES = {
+    "constant": ConstantArrivalShape,
+    "step": StepRampShape,
+    "spike": SpikeShape,
+}
+
+
+class SaturationKneeRecorder:
+    """Buckets request results per shape step and finds where P95 breaks the budget."""
+
+    def __init__(self, shape: ArrivalRateShape, budget_ms: float = PERF_P95_BUDGET_MS,
+                 warmup_ratio: float = PERF_STEP_WARMUP_RATIO):
+        self.shape = shape
+        self.budget_ms = budget_ms
+        self.warmup_ratio = warmup_ratio
+        self.active = False
+        self.results: list[tuple[float, float, bool]] = []  # (run_time_s, response_time_ms, failed)
+
+    def start(self):
+        self.active = True
+
+    def on_request(self, response_time, exception=None, **kwargs):
+        if not self.active:
+            return
+        # Use the shape's own clock so buckets line up with its step boundaries.
+        self.results.append((self.shape.get_run_time(), float(response_time or 0), exception is not None))
+
+    def report(self) -> dict:
+        steps = []
+        knee = None
+        capacity_rps = None
+        for i, (duration, target_rps) in enumerate(self.shape.steps):
+            start, end = self.shape.step_window(i)
+            measured_from = start + duration * self.warmup_ratio
+            bucket = [r for r in self.results if measured_from <= r[0] < end]
+            latencies = sorted(r[1] for r in bucket)
+            window = max(1e-9, end - measured_from)
+            p95 = latencies[int(round((len(latencies) - 1) * 0.95))] if latencies else None
+            step = {
+                "step": i,
+                "target_rps": target_rps,
+                "achieved_rps": len(bucket) / window,
+                "p50_ms": latencies[int(round((len(latencies) - 1) * 0.50))] if latencies else None,
+                "p95_ms": p95,
+                "fail_ratio": (sum(1 for r in bucket if r[2]) / len(bucket)) if bucket else None,
+                "requests": len(bucket),
+            }
+            steps.append(step)
+            if not bucket:
+                continue
+            if knee is None and p95 is not None and p95 > self.budget_ms:
+                knee = step
+            elif knee is None:
+                capacity_rps = max(capacity_rps or 0.0, step["achieved_rps"])
+
+        return {
+            "shape": type(self.shape).__name__,
+            "p95_budget_ms": self.budget_ms,
+            "rate_per_user": self.shape.rate_per_user,
+            "knee": knee,
+            "capacity_rps": capacity_rps,
+            "steps": steps,
+        }
+
+    def write_report(self, path: str) -> str:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        payload = {"generated_at_utc": datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ"), **self.report()}
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False, indent=2)
+        return path
@@ -0,0 +1,327 @@
+"""
+SLO regression gate for the Locust suite.
+
+Runs tests/performance/locustfile.py headless, exports per-endpoint stats and the response-time
+histogram Locust keeps per endpoint, compares them against the committed baseline
+(tests/performance/slo_baseline.json) and renders the markdown perf report.
+
+Noise tolerance:
+- latency percentiles use a distribution-free confidence interval (binomial order statistics over
+  the histogram); a percentile regresses only when the whole interval is above the budget, or above
+  the recorded baseline plus the relative/absolute tolerance
+- error rate regresses when the Wilson score lower bound exceeds the budget
+- throughput regresses when observed RPS is below min_rps minus the relative tolerance
+- a baseline endpoint that is missing from the run, or has fewer than min_samples requests, fails
+  the gate too (--allow-missing reports it without failing)
+
+Usage:
+    python tests/performance/slo_gate.py --host http://localhost:5200 -u 20 -r 5 --run-time 2m
+    python tests/performance/slo_gate.py --compare-only tests/performance/reports/locust_export_latest.json
+    python tests/performance/slo_gate.py ... --update-baseline
+
+Exit codes: 0 = within SLO, 1 = regression, 2 = run/export failed.
+"""
+import argparse
+import json
+import math
+import os
+import subprocess
+import sys
+from datetime import datetime, timezone
+
+PERF_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(PERF_DIR, "slo_baseline.json")
+DEFAULT_EXPORT = os.path.join(PERF_DIR, "reports", "locust_export_latest.json")
+DEFAULT_REPORT = os.path.join(PERF_DIR, "reports", "PERF-REPORT-latest.md")
+
+PERCENTILES = {"p50_ms": 0.50, "p95_ms": 0.95, "p99_ms": 0.99}
+# Two-sided z for the configured confidence (defaults to 95%).
+Z_BY_CONFIDENCE = {0.90: 1.645, 0.95: 1.96, 0.99: 2.576}
+
+
+def export_stats(stats) -> dict:
+    """Serialize a locust RequestStats object: per-endpoint summary plus response-time histogram."""
+    duration = 0.0
+    if stats.total.last_request_timestamp and stats.total.start_time:
+        duration = max(0.0, stats.total.last_request_timestamp - stats.total.start_time)
+
+    endpoints = {}
+    for (name, method), entry in sorted(stats.entries.items()):
+        endpoints[f"{method} {name}"] = {
+            "num_requests": entry.num_requests,
+            "num_failures": entry.num_failures,
+            "rps": entry.num_requests / duration if duration else 0.0,
+            "avg_ms": entry.avg_response_time,
+            "min_ms": entry.min_response_time,
+            "max_ms": entry.max_response_time,
+            "p50_ms": entry.get_response_time_percentile(0.50),
+            "p95_ms": entry.get_response_time_percentile(0.95),
+            "p99_ms": entry.get_response_time_percentile(0.99),
+            "histogram": {str(k): v for k, v in sorted(entry.response_times.items())},
+        }
+    return {
+        "generated_at_utc": datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ"),
+        "duration_s": duration,
+        "endpoints": endpoints,
+    }
+
+
+def write_export(stats, path: str) -> str:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(export_stats(stats), f, ensure_ascii=False, indent=2)
+    return path
+
+
+def _histogram_points(histogram: dict) -> tuple[list[float], list[int]]:
+    items = sorted((float(k), int(v)) for k, v in histogram.items())
+    return [k for k, _ in items], [v for _, v in items]
+
+
+def _value_at_rank(values: list[float], counts: list[int], rank: int) -> float:
+    seen = 0
+    for value, count in zip(values, counts):
+        seen += count
+        if seen >= rank:
+            return value
+    return values[-1]
+
+
+def quantile_ci(histogram: dict, q: float, z: float = 1.96) -> tuple[float, float, float] | None:
+    """(lower, estimate, upper) for quantile q using binomial order-statistic ranks."""
+    values, counts = _histogram_points(histogram)
+    n = sum(counts)
+    if n == 0:
+        return None
+    spread = z * math.sqrt(n * q * (1 - q))
+    lo_rank = max(1, int(math.floor(n * q - spread)))
+    hi_rank = min(n, int(math.ceil(n * q + spread)) + 1)
+    est_rank = max(1, min(n, int(math.ceil(n * q))))
+    return (
+        _value_at_rank(values, counts, lo_rank),
+        _value_at_rank(values, counts, est_rank),
+        _value_at_rank(values, counts, hi_rank),
+    )
+
+
+def wilson_interval(failures: int, n: int, z: float = 1.96) -> tuple[float, float]:
+    if n == 0:
+        return 0.0, 0.0
+    p = failures / n
+    denom = 1 + z * z / n
+    center = (p + z * z / (2 * n)) / denom
+    half = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denom
+    return max(0.0, center - half), min(1.0, center + half)
+
+
+def compare(current: dict, baseline: dict, allow_missing: bool = False) -> dict:
+    """
+    Compare an export against the baseline file; returns per-endpoint checks and the verdict.
+    Missing/insufficient endpoints count as regressions unless allow_missing.
+    """
+    defaults = baseline.get("defaults", {})
+    tolerance = baseline.get("tolerance", {})
+    rel = float(tolerance.get("relative", 0.10))
+    abs_ms = float(tolerance.get("absolute_ms", 5))
+    min_samples = int(tolerance.get("min_samples", 30))
+    z = Z_BY_CONFIDENCE.get(float(tolerance.get("confidence", 0.95)), 1.96)
+
+    results = []
+    regressions = []
+    for key, budget_cfg in sorted(baseline.get("endpoints", {}).items()):
+        budget = {**defaults, **{k: v for k, v in budget_cfg.items() if k != "baseline"}}
+        recorded = budget_cfg.get("baseline") or {}
+        observed = current["endpoints"].get(key)
+        if observed is None:
+            results.append({"endpoint": key, "status": "missing", "checks": []})
+            if not allow_missing:
+                regressions.append(key)
+            continue
+        n = int(observed["num_requests"])
+        if n < min_samples:
+            results.append({"endpoint": key, "status": "insufficient", "samples": n, "checks": []})
+            if not allow_missing:
+                regressions.append(key)
+            continue
+
+        checks = []
+        for metric, q in PERCENTILES.items():
+            ci = quantile_ci(observed["histogram"], q, z)
+            if ci is None:
+                continue
+            lo, est, hi = ci
+            limit = budget.get(metric)
+            failed_budget = limit is not None and lo > float(limit)
+            drift_limit = None
+            if recorded.get(metric) is not None:
+                drift_limit = float(recorded[metric]) * (1 + rel) + abs_ms
+            failed_drift = drift_limit is not None and lo > drift_limit
+            checks.append({
+                "metric": metric, "observed": est, "ci": [lo, hi], "budget": limit,
+                "baseline": recorded.get(metric), "regressed": failed_budget or failed_drift,
+            })
+
+        err_lo, err_hi = wilson_interval(int(observed["num_failures"]), n, z)
+        err_budget = budget.get("error_rate")
+        checks.append({
+            "metric": "error_rate", "observed": observed["num_failures"] / n, "ci": [err_lo, err_hi],
+            "budget": err_budget, "baseline": recorded.get("error_rate"),
+            "regressed": err_budget is not None and err_lo > float(err_budget),
+        })
+
+        min_rps = budget.get("min_rps")
+        checks.append({
+            "metric": "rps", "observed": observed["rps"], "ci": None, "budget": min_rps,
+            "baseline": recorded.get("rps"),
+            "regressed": min_rps is not None and observed["rps"] < float(min_rps) * (1 - rel),
+        })
+
+        status = "regressed" if any(c["regressed"] for c in checks) else "ok"
+        if status == "regressed":
+            regressions.append(key)
+        results.append({"endpoint": key, "status": status, "samples": n, "checks": checks})
+
+    untracked = sorted(set(current["endpoints"]) - set(baseline.get("endpoints", {})))
+    return {"regressions": regressions, "untracked": untracked, "results": results}
+
+
+def update_baseline(current: dict, baseline: dict) -> dict:
+    """Record observed values as the new baseline, keeping budgets; new endpoints get defaults."""
+    endpoints = baseline.setdefault("endpoints", {})
+    for key, observed in current["endpoints"].items():
+        entry = endpoints.setdefault(key, {})
+        entry["baseline"] = {
+            "p50_ms": observed["p50_ms"],
+            "p95_ms": observed["p95_ms"],
+            "p99_ms": observed["p99_ms"],
+            "error_rate": observed["num_failures"] / observed["num_requests"] if observed["num_requests"] else 0.0,
+            "rps": round(observed["rps"], 2),
+        }
+    return baseline
+
+
+def _fmt(value, metric: str) -> str:
+    if value is None:
+        return "-"
+    if metric == "error_rate":
+        return f"{value:.2%}"
+    if metric == "rps":
+        return f"{value:.2f}"
+    return f"{value:.0f}"
+
+
+def render_markdown(current: dict, verdict: dict, run_args: dict | None = None) -> str:
+    lines = [
+        "# PERF-REPORT (Locust SLO gate)",
+        "",
+        f"- Generated (UTC): {current.get('generated_at_utc', '-')}",
+        f"- Duration: {current.get('duration_s', 0):.0f}s",
+    ]
+    if run_args:
+        lines.append(f"- Load: {', '.join(f'{k}={v}' for k, v in run_args.items())}")
+    lines.append(f"- Verdict: **{'REGRESSION' if verdict['regressions'] else 'PASS'}**")
+    lines += ["", "## Endpoints", "",
+              "| Endpoint | Samples | RPS | P50 (ms) | P95 (ms) | P99 (ms) | Errors |",
+              "|---|---:|---:|---:|---:|---:|---:|"]
+    for key, ep in current["endpoints"].items():
+        err = ep["num_failures"] / ep["num_requests"] if ep["num_requests"] else 0.0
+        lines.append(
+            f"| `{key}` | {ep['num_requests']} | {ep['rps']:.2f} | {_fmt(ep['p50_ms'], 'p50_ms')} | "
+            f"{_fmt(ep['p95_ms'], 'p95_ms')} | {_fmt(ep['p99_ms'], 'p99_ms')} | {err:.2%} |"
+        )
+
+    lines += ["", "## SLO checks", "",
+              "| Endpoint | Metric | Observed | CI | Budget | Baseline | Result |",
+              "|---|---|---:|---|---:|---:|---|"]
+    for r in verdict["results"]:
+        if not r["checks"]:
+            lines.append(f"| `{r['endpoint']}` | - | - | - | - | - | {r['status']} |")
+            continue
+        for c in r["checks"]:
+            ci = f"{_fmt(c['ci'][0], c['metric'])}–{_fmt(c['ci'][1], c['metric'])}" if c["ci"] else "-"
+            lines.append(
+                f"| `{r['endpoint']}` | {c['metric']} | {_fmt(c['observed'], c['metric'])} | {ci} | "
+                f"{_fmt(c['budget'], c['metric'])} | {_fmt(c['baseline'], c['metric'])} | "
+                f"{'❌ regressed' if c['regressed'] else '✅'} |"
+            )
+    if verdict["untracked"]:
+        lines += ["", "Endpoints without a baseline entry: " + ", ".join(f"`{k}`" for k in verdict["untracked"])]
+    return "\n".join(lines) + "\n"
+
+
+def run_locust(args, export_path: str) -> int:
+    cmd = [
+        sys.executable, "-m", "locust",
+        "-f", os.path.join(PERF_DIR, "locustfile.py"),
+        "--headless", "--only-summary",
+        # Failed requests are judged by the error-rate budgets; a non-zero exit means the run itself failed.
+        "--exit-code-on-error", "0",
+        "-u", str(args.users), "-r", str(args.spawn_rate),
+        "--run-time", args.run_time, "--host", args.host,
+    ]
+    env = {**os.environ, "PERF_EXPORT_PATH": export_path}
+    print(f"[SLO] Running: {' '.join(cmd)}")
+    return subprocess.run(cmd, env=env).returncode
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Locust SLO regression gate")
+    parser.add_argument("--host", default=os.getenv("API_BASE", "http://localhost:5200"))
+    parser.add_argument("-u", "--users", type=int, default=20)
+    parser.add_argument("-r", "--spawn-rate", type=float, default=5)
+    parser.add_argument("--run-time", default="2m")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--export", default=DEFAULT_EXPORT)
+    parser.add_argument("--report", default=DEFAULT_REPORT)
+    parser.add_argument("--compare-only", metavar="EXPORT_JSON", help="skip the run and gate an existing export")
+    parser.add_argument("--update-baseline", action="store_true", help="record this run as the new baseline")
+    parser.add_argument("--allow-missing", action="store_true",
+                        help="do not fail on baseline endpoints that are missing or below min_samples")
+    args = parser.parse_args(argv)
+
+    export_path = args.compare_only or args.export
+    run_args = None
+    if not args.compare_only:
+        run_args = {"users": args.users, "spawn_rate": args.spawn_rate, "run_time": args.run_time}
+        # Never gate a previous run's export if this one crashes before writing its own.
+        if os.path.exists(export_path):
+            os.remove(export_path)
+        started = datetime.now(timezone.utc).timestamp()
+        code = run_locust(args, export_path)
+        print(f"[SLO] Locust exited with {code}")
+        if code != 0:
+            print("[SLO] Locust run failed; not gating")
+            return 2
+        if os.path.exists(export_path) and os.path.getmtime(export_path) < started:
+            print(f"[SLO] Export is older than this run: {export_path}")
+            return 2
+    if not os.path.exists(export_path):
+        print(f"[SLO] Export not found: {export_path}")
+        return 2
+
+    with open(export_path, encoding="utf-8") as f:
+        current = json.load(f)
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+
+    verdict = compare(current, baseline, allow_missing=args.allow_missing)
+    os.makedirs(os.path.dirname(args.report) or ".", exist_ok=True)
+    with open(args.report, "w", encoding="utf-8") as f:
+        f.write(render_markdown(current, verdict, run_args))
+    print(f"[SLO] Report written: {args.report}")
+
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(update_baseline(current, baseline), f, ensure_ascii=False, indent=2)
+            f.write("\n")
+        print(f"[SLO] Baseline updated: {args.baseline}")
+        return 0
+
+    status = {r["endpoint"]: r["status"] for r in verdict["results"]}
+    for key in verdict["regressions"]:
+        print(f"[SLO] Regression: {key} ({status.get(key)})")
+    return 1 if verdict["regressions"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
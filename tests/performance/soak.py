@@ -0,0 +1,188 @@
+"""
+Soak-test resource tracking for the Locust suite.
+
+Samples the API process memory (/api/system/info working set, managed heap size and gen0/1/2
+collection counts, optionally the OS-level RSS of a local API process) and the number of loaded
+dynamic entity assemblies (/api/entity-definitions/loaded-entities) over a long run, then reports
+the growth slope per hour. A steadily positive slope under a compile/unload cycle points to leaked
+AssemblyLoadContexts; a growing heap with a rising gen2 rate points to long-lived allocations.
+
+Enable with PERF_PROFILE=soak, e.g.:
+    PERF_PROFILE=soak locust -f tests/performance/locustfile.py --headless -u 30 -r 2 --run-time 4h \\
+        --host http://localhost:5200
+"""
+import json
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+import requests
+
+MB = 1024 * 1024
+# /api/system/info field -> sample key
+GC_FIELDS = {
+    "gcHeapSizeBytes": "gc_heap_bytes",
+    "gen0Collections": "gen0_collections",
+    "gen1Collections": "gen1_collections",
+    "gen2Collections": "gen2_collections",
+}
+
+
+def linear_slope(xs: list[float], ys: list[float]) -> float:
+    """Least-squares slope of ys over xs (0 when undefined)."""
+    n = len(xs)
+    if n < 2:
+        return 0.0
+    mean_x = sum(xs) / n
+    mean_y = sum(ys) / n
+    var_x = sum((x - mean_x) ** 2 for x in xs)
+    if var_x == 0:
+        return 0.0
+    cov = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+    return cov / var_x
+
+
+def read_process_rss_bytes(pid: int) -> int | None:
+    """RSS of a local process: psutil when installed, /proc otherwise (Linux)."""
+    try:
+        import psutil  # optional
+
+        return int(psutil.Process(pid).memory_info().rss)
+    except ImportError:
+        pass
+    except Exception:
+        return None
+
+    try:
+        with open(f"/proc/{pid}/status", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        return None
+    return None
+
+
+class ApiResourceProbe:
+    """Background sampler of API memory and loaded dynamic assemblies."""
+
+    def __init__(self, api_base: str, username: str = "admin", password: str = "Admin@12345",
+                 interval_s: float = 30.0, pid: int | None = None):
+        self.api_base = api_base.rstrip("/")
+        self.username = username
+        self.password = password
+        self.interval_s = interval_s
+        self.pid = pid
+        self.samples: list[dict] = []
+        self._token = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _headers(self) -> dict:
+        if self._token is None:
+            resp = requests.post(
+                f"{self.api_base}/api/auth/login",
+                json={"username": self.username, "password": self.password},
+                timeout=30,
+            )
+            resp.raise_for_status()
+            self._token = resp.json()["data"]["accessToken"]
+        return {"Authorization": f"Bearer {self._token}"}
+
+    def _get_data(self, path: str) -> dict:
+        resp = requests.get(f"{self.api_base}{path}", headers=self._headers(), timeout=30)
+        if resp.status_code == 401:
+            # Token expired during a multi-hour run: log in again once.
+            self._token = None
+            resp = requests.get(f"{self.api_base}{path}", headers=self._headers(), timeout=30)
+        resp.raise_for_status()
+        return resp.json().get("data") or {}
+
+    def sample_once(self) -> dict:
+        sample = {"ts": time.time(), "working_set_bytes": None, "rss_bytes": None, "loaded_entities": None}
+        sample.update({key: None for key in GC_FIELDS.values()})
+        try:
+            info = self._get_data("/api/system/info")
+            sample["working_set_bytes"] = int(info.get("workingSetBytes") or 0)
+            for field, key in GC_FIELDS.items():
+                # Older API builds do not report GC stats: leave them None instead of 0.
+                if info.get(field) is not None:
+                    sample[key] = int(info[field])
+        except Exception as ex:
+            print(f"[SOAK] /api/system/info failed: {ex}")
+        try:
+            sample["loaded_entities"] = int(self._get_data("/api/entity-definitions/loaded-entities").get("count") or 0)
+        except Exception as ex:
+            print(f"[SOAK] loaded-entities failed: {ex}")
+        if self.pid:
+            sample["rss_bytes"] = read_process_rss_bytes(self.pid)
+        self.samples.append(sample)
+        return sample
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.sample_once()
+            self._stop.wait(self.interval_s)
+
+    def start(self):
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="soak-probe", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join(timeout=60)
+            self._thread = None
+        return self
+
+    def _slope_per_hour(self, key: str, scale: float = 1.0) -> float | None:
+        points = [(s["ts"], s[key]) for s in self.samples if s.get(key) is not None]
+        if len(points) < 2:
+            return None
+        t0 = points[0][0]
+        xs = [(t - t0) / 3600.0 for t, _ in points]
+        ys = [v / scale for _, v in points]
+        return linear_slope(xs, ys)
+
+    def report(self) -> dict:
+        duration_h = (self.samples[-1]["ts"] - self.samples[0]["ts"]) / 3600.0 if len(self.samples) > 1 else 0.0
+        first = self.samples[0] if self.samples else {}
+        last = self.samples[-1] if self.samples else {}
+        return {
+            "duration_h": duration_h,
+            "samples": len(self.samples),
+            "working_set_mb": {"first": _mb(first.get("working_set_bytes")), "last": _mb(last.get("working_set_bytes"))},
+            "rss_mb": {"first": _mb(first.get("rss_bytes")), "last": _mb(last.get("rss_bytes"))},
+            "gc_heap_mb": {"first": _mb(first.get("gc_heap_bytes")), "last": _mb(last.get("gc_heap_bytes"))},
+            "gc_collections": {
+                gen: {"first": first.get(f"{gen}_collections"), "last": last.get(f"{gen}_collections")}
+                for gen in ("gen0", "gen1", "gen2")
+            },
+            "loaded_entities": {"first": first.get("loaded_entities"), "last": last.get("loaded_entities")},
+            "slopes": {
+                "working_set_mb_per_h": self._slope_per_hour("working_set_bytes", MB),
+                "rss_mb_per_h": self._slope_per_hour("rss_bytes", MB),
+                "gc_heap_mb_per_h": self._slope_per_hour("gc_heap_bytes", MB),
+                "gen2_collections_per_h": self._slope_per_hour("gen2_collections"),
+                "loaded_entities_per_h": self._slope_per_hour("loaded_entities"),
+            },
+        }
+
+    def write_report(self, path: str) -> str:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        payload = {
+            "generated_at_utc": datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ"),
+            "report": self.report(),
+            "samples": self.samples,
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False, indent=2)
+        return path
+
+
+def _mb(value) -> float | None:
+    return round(value / MB, 1) if value else None
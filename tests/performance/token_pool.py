@@ -0,0 +1,194 @@
+"""
+Pre-minted token pool for the Locust suite.
+
+Logging every simulated user in during on_start turns the ramp-up into a burst of password-hash
+checks and makes every user the same admin. Instead, the pool seeds perf users across the
+configured roles (created once via /api/users, reused afterwards), logs each of them in before
+the run and hands the tokens out round-robin. Login/refresh throughput is measured separately by
+the auth profile (PERF_PROFILE=auth).
+
+Settings:
+    PERF_POOL_USERS_PER_ROLE  seeded users per role (default 5)
+    PERF_POOL_ROLES           comma-separated role codes (default: every enabled role)
+    PERF_POOL_PASSWORD        password for seeded perf users (default Perf@12345)
+    PERF_TOKEN_RENEW_MARGIN_S renew access tokens this long before they expire (default 300)
+
+Access tokens live Jwt:AccessMinutes (60 by default), so multi-hour runs renew them in place with the
+stored refresh token (renew_tokens / TokenPool.renew), falling back to a password login when the
+refresh token was rotated or revoked.
+"""
+import base64
+import itertools
+import json
+import os
+import threading
+import time
+
+import requests
+
+PERF_POOL_USERS_PER_ROLE = int(os.getenv("PERF_POOL_USERS_PER_ROLE", "5"))
+PERF_POOL_ROLES = [r.strip() for r in os.getenv("PERF_POOL_ROLES", "").split(",") if r.strip()]
+PERF_POOL_PASSWORD = os.getenv("PERF_POOL_PASSWORD", "Perf@12345")
+PERF_POOL_USER_PREFIX = "perf_"
+PERF_TOKEN_RENEW_MARGIN_S = float(os.getenv("PERF_TOKEN_RENEW_MARGIN_S", "300"))
+
+
+def token_expiry(access_token: str | None) -> float | None:
+    """`exp` (unix seconds) of a JWT, read without verifying the signature."""
+    try:
+        payload = access_token.split(".")[1]
+        claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+        return float(claims["exp"])
+    except (AttributeError, IndexError, KeyError, TypeError, ValueError):
+        return None
+
+
+def renew_tokens(api_base: str, identity: dict, stale_token: str | None = None,
+                 margin_s: float = PERF_TOKEN_RENEW_MARGIN_S) -> bool:
+    """
+    Renew identity's tokens in place when the access token expires within margin_s, or when
+    stale_token (a token the API just rejected with 401) is still the current one.
+    Returns True when the tokens changed.
+    """
+    token = identity.get("accessToken")
+    if stale_token is not None:
+        if token != stale_token:
+            return False  # someone sharing the identity renewed it already
+    else:
+        expiry = token_expiry(token)
+        if expiry is None or expiry - time.time() > margin_s:
+            return False  # no (readable) token: wait for a 401 instead of renewing on every request
+
+    api_base = api_base.rstrip("/")
+    tokens = None
+    if identity.get("refreshToken"):
+        resp = requests.post(f"{api_base}/api/auth/refresh", json={"refreshToken": identity["refreshToken"]}, timeout=30)
+        if resp.status_code == 200:
+            tokens = resp.json().get("data") or None
+    if tokens is None:
+        tokens = _login(api_base, identity["username"], identity["password"])
+    if tokens is None:
+        print(f"[POOL] Token renewal failed for {identity['username']}")
+        return False
+    identity["accessToken"] = tokens["accessToken"]
+    identity["refreshToken"] = tokens.get("refreshToken")
+    return True
+
+
+class TokenPool:
+    """Thread/greenlet-safe round-robin pool of identities: {username, password, role, tokens...}."""
+
+    def __init__(self, identities: list[dict]):
+        self.identities = identities
+        self._cycle = itertools.cycle(identities) if identities else None
+        self._lock = threading.Lock()
+        self._renew_lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.identities)
+
+    def acquire(self) -> dict | None:
+        if self._cycle is None:
+            return None
+        with self._lock:
+            return next(self._cycle)
+
+    def renew(self, api_base: str, identity: dict, stale_token: str | None = None) -> bool:
+        """renew_tokens for a pooled identity; refresh tokens rotate, so users sharing it renew once."""
+        with self._renew_lock:
+            return renew_tokens(api_base, identity, stale_token)
+
+    def by_role(self) -> dict[str, int]:
+        counts: dict[str, int] = {}
+        for ident in self.identities:
+            counts[ident["role"]] = counts.get(ident["role"], 0) + 1
+        return counts
+
+
+def _login(api_base: str, username: str, password: str) -> dict | None:
+    resp = requests.post(
+        f"{api_base}/api/auth/login",
+        json={"username": username, "password": password},
+        timeout=30,
+    )
+    if resp.status_code != 200:
+        return None
+    return resp.json().get("data") or None
+
+
+def _ensure_user(api_base: str, admin_headers: dict, username: str, role_id: str) -> None:
+    resp = requests.post(
+        f"{api_base}/api/users",
+        json={
+            "userName": username,
+            "email": f"{username}@perf.local",
+            "password": PERF_POOL_PASSWORD,
+            "emailConfirmed": True,
+            "roles": [{"roleId": role_id, "organizationId": None}],
+        },
+        headers=admin_headers,
+        timeout=30,
+    )
+    # 400 means the user already exists from a previous run; the login below decides.
+    if resp.status_code not in (200, 400):
+        print(f"[POOL] Create user {username} failed: {resp.status_code} {resp.text[:200]}")
+
+
+def mint_token_pool(api_base: str, admin_user: str = "admin", admin_password: str = "Admin@12345",
+                    users_per_role: int = PERF_POOL_USERS_PER_ROLE,
+                    role_codes: list[str] | None = None) -> TokenPool:
+    """Seed perf users per role, log each in once and return the pool (admin always included)."""
+    api_base = api_base.rstrip("/")
+    admin = _login(api_base, admin_user, admin_password)
+    if admin is None:
+        raise RuntimeError("Token pool: admin login failed")
+    admin_headers = {"Authorization": f"Bearer {admin['accessToken']}"}
+
+    identities = [{
+        "username": admin_user,
+        "password": admin_password,
+        "role": "admin",
+        "accessToken": admin["accessToken"],
+        "refreshToken": admin.get("refreshToken"),
+    }]
+
+    roles_resp = requests.get(f"{api_base}/api/access/roles", headers=admin_headers, timeout=30)
+    roles_resp.raise_for_status()
+    wanted = set(role_codes if role_codes is not None else PERF_POOL_ROLES)
+    roles = [
+        r for r in roles_resp.json().get("data") or []
+        if r.get("isEnabled", True) and (not wanted or r.get("code") in wanted)
+    ]
+
+    for role in roles:
+        code = str(role.get("code"))
+        for n in range(1, users_per_role + 1):
+            username = f"{PERF_POOL_USER_PREFIX}{code.lower()}_{n}"
+            _ensure_user(api_base, admin_headers, username, role["id"])
+            tokens = _login(api_base, username, PERF_POOL_PASSWORD)
+            if tokens is None:
+                print(f"[POOL] Login failed for {username}; skipped")
+                continue
+            identities.append({
+                "username": username,
+                "password": PERF_POOL_PASSWORD,
+                "role": code,
+                "accessToken": tokens["accessToken"],
+                "refreshToken": tokens.get("refreshToken"),
+            })
+
+    # Probe once per role which read endpoints are permitted, so users only run allowed tasks.
+    probed: dict[str, bool] = {}
+    for ident in identities:
+        if ident["role"] not in probed:
+            resp = requests.get(
+                f"{api_base}/api/users",
+                headers={"Authorization": f"Bearer {ident['accessToken']}"},
+                timeout=30,
+            )
+            probed[ident["role"]] = resp.status_code == 200
+        ident["can_list_users"] = probed[ident["role"]]
+
+    pool = TokenPool(identities)
+    print(f"[POOL] Minted {len(pool)} tokens: {pool.by_role()}")
+    return pool
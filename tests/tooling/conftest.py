@@ -0,0 +1,14 @@
+"""
+Unit tests for the Python test tooling (e2e utils, performance scripts, scripts/*.py).
+
+They need neither a running stack nor Playwright; run from the repo root:
+    python -m pytest tests/tooling -q
+"""
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+for path in (os.path.join(ROOT, "tests", "e2e"), os.path.join(ROOT, "tests", "performance"), os.path.join(ROOT, "scripts")):
+    if path not in sys.path:
+        sys.path.insert(0, path)
@@ -0,0 +1,34 @@
+from utils.duration_history import DurationHistory
+
+NODEID = "tests/e2e/cases/01_auth/test_login.py::test_login"
+
+
+def _record(history: DurationHistory, seconds: float) -> int:
+    return history.record_run([{"nodeid": NODEID, "outcome": "passed", "call_s": seconds}])
+
+
+def test_regressions_ignore_runs_older_than_the_baseline_window(tmp_path):
+    history = DurationHistory(str(tmp_path / "history.sqlite"))
+    try:
+        for seconds in (30.0, 30.0, 30.0):  # outside recent_runs + baseline_runs
+            _record(history, seconds)
+        for seconds in (2.0, 2.0):  # baseline
+            _record(history, seconds)
+        _record(history, 5.0)  # recent
+
+        found = history.regressions(recent_runs=1, baseline_runs=2)
+
+        assert [r["nodeid"] for r in found] == [NODEID]
+        assert found[0]["baseline_s"] == 2.0
+        assert found[0]["recent_s"] == 5.0
+    finally:
+        history.close()
+
+
+def test_regressions_need_a_baseline(tmp_path):
+    history = DurationHistory(str(tmp_path / "history.sqlite"))
+    try:
+        _record(history, 5.0)
+        assert history.regressions(recent_runs=1, baseline_runs=2) == []
+    finally:
+        history.close()
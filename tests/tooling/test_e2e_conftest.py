@@ -0,0 +1,83 @@
+"""
+Runs pieces of the e2e conftest: the option and plugin-registration hooks in a pytester session,
+and small helpers directly.
+
+The conftest itself needs Playwright and a running stack, so only the functions under test, the
+module constants they read and the imports that bind their names are lifted out of it. A name a
+lifted function uses without importing it fails here as a NameError.
+"""
+import ast
+import os
+
+import pytest
+
+from conftest import ROOT
+
+pytest_plugins = "pytester"
+
+E2E_CONFTEST = os.path.join(ROOT, "tests", "e2e", "conftest.py")
+HOOKS = ("pytest_addoption", "pytest_configure")
+
+
+def _lift(*names: str) -> str:
+    module = ast.parse(open(E2E_CONFTEST, encoding="utf-8").read())
+    hooks = [n for n in module.body if isinstance(n, ast.FunctionDef) and n.name in names]
+    used = {n.id for hook in hooks for n in ast.walk(hook) if isinstance(n, ast.Name)}
+    kept = []
+    for node in module.body:
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            if any((alias.asname or alias.name).split(".")[0] in used for alias in node.names):
+                kept.append(node)
+        elif isinstance(node, ast.Assign):
+            if any(isinstance(t, ast.Name) and t.id in used for t in node.targets):
+                kept.append(node)
+    return ast.unparse(ast.Module(body=kept + hooks, type_ignores=[]))
+
+
+def test_harness_profile_option_registers_plugin(pytester, monkeypatch):
+    monkeypatch.setenv("E2E_FIXTURE_TIMING", "0")
+    pytester.makeconftest(_lift(*HOOKS))
+    pytester.makepyfile(test_sample="""
+        import time
+
+        def test_sleeps():
+            time.sleep(0.02)
+    """)
+
+    result = pytester.runpytest_inprocess("--harness-profile", "--harness-profile-interval-ms", "1")
+
+    result.assert_outcomes(passed=1)
+    result.stdout.fnmatch_lines(["*E2E harness profile*", "*Harness profile written*"])
+    reports = pytester.path / "tests" / "e2e" / "reports"
+    assert (reports / "harness_profile_latest.json").is_file()
+    assert list((reports / "flamegraphs").glob("*.speedscope.json"))
+
+
+def test_harness_profile_is_off_by_default(pytester, monkeypatch):
+    monkeypatch.setenv("E2E_FIXTURE_TIMING", "0")
+    monkeypatch.delenv("E2E_HARNESS_PROFILE", raising=False)
+    pytester.makeconftest(_lift(*HOOKS))
+    pytester.makepyfile(test_sample="def test_ok():\n    pass\n")
+
+    result = pytester.runpytest_inprocess()
+
+    result.assert_outcomes(passed=1)
+    assert not (pytester.path / "tests" / "e2e" / "reports").exists()
+
+
+@pytest.fixture(scope="module")
+def parse_shard():
+    namespace = {}
+    exec(_lift("_parse_shard"), namespace)
+    return namespace["_parse_shard"]
+
+
+def test_parse_shard_accepts_i_of_n(parse_shard):
+    assert parse_shard("1/4") == (1, 4)
+    assert parse_shard("4/4") == (4, 4)
+
+
+@pytest.mark.parametrize("value", ["0/4", "5/4", "-1/4", "1/0", "2", "a/b", "1/4/2", ""])
+def test_parse_shard_rejects_out_of_range_or_malformed(parse_shard, value):
+    with pytest.raises(pytest.UsageError, match="i/N"):
+        parse_shard(value)
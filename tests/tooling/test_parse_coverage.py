@@ -0,0 +1,152 @@
+import os
+import xml.etree.ElementTree as ET
+
+import pytest
+
+import parse_coverage
+
+from conftest import ROOT
+
+# Checked-in coverlet output: coverlet writes branch="True", not the Cobertura DTD's "true".
+COVERLET_REPORT = os.path.join(
+    ROOT, "tests", "BobCrm.Api.Tests", "TestResults", "49739da6-e613-4277-b24d-f89eebbd8b16", "coverage.cobertura.xml"
+)
+
+
+@pytest.fixture
+def in_repo_root(monkeypatch):
+    # Report filenames are resolved against the working directory.
+    monkeypatch.chdir(ROOT)
+
+
+def coverlet_report(path, source: str, classes: dict) -> str:
+    """Write a coverlet-shaped report: one <source> root, filenames relative to it, branch="True"."""
+    package = source.rstrip("\\").rsplit("\\", 1)[-1]
+    class_xml = []
+    for name, (filename, hits) in classes.items():
+        lines = "".join(f'<line number="{n}" hits="{h}" branch="False" />' for n, h in hits.items())
+        class_xml.append(f'<class name="{name}" filename="{filename}" line-rate="0" branch-rate="0" complexity="1">'
+                         f"<methods /><lines>{lines}</lines></class>")
+    path.write_text(
+        '<?xml version="1.0" encoding="utf-8"?>\n'
+        '<coverage line-rate="0" branch-rate="0" version="1.9" timestamp="1761740076">\n'
+        f"  <sources><source>{source}</source></sources>\n"
+        f'  <packages><package name="{package}"><classes>{"".join(class_xml)}</classes></package></packages>\n'
+        "</coverage>\n",
+        encoding="utf-8",
+    )
+    return str(path)
+
+
+def test_coverlet_branches_are_parsed(in_repo_root):
+    files = parse_coverage.parse_report(COVERLET_REPORT, include=["*"], exclude=[])
+
+    assert files["src/BobCrm.Api/Program.cs"]["branches"][576] == (0, 6)
+
+    expected = {
+        ("src/BobCrm.Api/" + parse_coverage.normalize_path(cls.get("filename")), int(line.get("number")))
+        for cls in ET.parse(COVERLET_REPORT).iter("class")
+        for line in cls.findall("lines/line")
+        if line.get("branch") == "True"
+    }
+    parsed = {(name, number) for name, entry in files.items() for number in entry["branches"]}
+    assert parsed == expected
+
+
+def test_coverlet_line_totals_match_report_header(in_repo_root):
+    files = parse_coverage.parse_report(COVERLET_REPORT, include=["*"], exclude=[])
+    totals = [parse_coverage.file_totals(entry) for entry in files.values()]
+    header = ET.parse(COVERLET_REPORT).getroot()
+
+    assert sum(t["lines"] for t in totals) == int(header.get("lines-valid"))
+    assert sum(t["covered"] for t in totals) == int(header.get("lines-covered"))
+    assert sum(t["branches"] for t in totals) > 0
+
+
+def test_missing_report_is_a_one_line_error(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+
+    for extra in ([], ["--no-cache"]):
+        assert parse_coverage.main(["missing/coverage.cobertura.xml", *extra]) == 1
+        out = capsys.readouterr().out
+        assert out.startswith("Error reading report:") and "missing/coverage.cobertura.xml" in out
+
+
+def _two_project_reports(tmp_path):
+    api = coverlet_report(tmp_path / "api.xml", "C:\\ci\\bobcrm\\src\\BobCrm.Api\\", {
+        "Program": ("Program.cs", {1: 1, 2: 1, 3: 0}),
+        "BobCrm.Api.Services.Mailer": ("Services\\Mailer.cs", {10: 1}),
+    })
+    app = coverlet_report(tmp_path / "app.xml", "C:\\ci\\bobcrm\\src\\BobCrm.App\\", {
+        "Program": ("Program.cs", {1: 0, 2: 0, 3: 0, 4: 0}),
+    })
+    return api, app
+
+
+def test_merge_keeps_same_relative_paths_of_two_projects_apart(tmp_path, monkeypatch):
+    api, app = _two_project_reports(tmp_path)
+    repo = tmp_path / "repo"
+    for project in ("BobCrm.Api", "BobCrm.App"):
+        (repo / "src" / project).mkdir(parents=True)
+    monkeypatch.chdir(repo)
+
+    merged = parse_coverage.merge_reports(parse_coverage.parse_report(r, ["*"], []) for r in (api, app))
+
+    assert sorted(merged) == ["src/BobCrm.Api/Program.cs", "src/BobCrm.Api/Services/Mailer.cs", "src/BobCrm.App/Program.cs"]
+    assert parse_coverage.file_totals(merged["src/BobCrm.Api/Program.cs"])["covered"] == 2
+    assert parse_coverage.file_totals(merged["src/BobCrm.App/Program.cs"]) == {
+        "lines": 4, "covered": 0, "branches": 0, "branches_covered": 0,
+    }
+    projects = parse_coverage.group_totals(merged, "project")
+    assert (projects["BobCrm.Api"]["lines"], projects["BobCrm.App"]["lines"]) == (4, 4)
+
+
+def test_merge_without_local_checkout_keys_by_project_directory(tmp_path, monkeypatch):
+    api, app = _two_project_reports(tmp_path)
+    monkeypatch.chdir(tmp_path)
+
+    merged = parse_coverage.merge_reports(parse_coverage.parse_report(r, ["*"], []) for r in (api, app))
+
+    assert sorted(merged) == ["BobCrm.Api/Program.cs", "BobCrm.Api/Services/Mailer.cs", "BobCrm.App/Program.cs"]
+
+
+CHANGED = {"src/BobCrm.Api/Program.cs": {2, 3, 9}, "src/BobCrm.App/Program.cs": {1}, "README.md": {1}}
+
+
+def test_changed_lines_coverage_on_coverlet_reports(tmp_path, monkeypatch):
+    api, app = _two_project_reports(tmp_path)
+    repo = tmp_path / "repo"
+    for project in ("BobCrm.Api", "BobCrm.App"):
+        (repo / "src" / project).mkdir(parents=True)
+    monkeypatch.chdir(repo)
+    merged = parse_coverage.merge_reports(parse_coverage.parse_report(r, ["*"], []) for r in (api, app))
+
+    rows = parse_coverage.changed_lines_coverage(merged, CHANGED)
+
+    # Line 9 is not in the report (not coverable); README.md is not covered code at all.
+    assert rows == [
+        {"file": "src/BobCrm.Api/Program.cs", "lines": 2, "covered": 1, "uncovered": [3]},
+        {"file": "src/BobCrm.App/Program.cs", "lines": 1, "covered": 0, "uncovered": [1]},
+    ]
+
+
+def test_changed_lines_match_keys_shorter_than_the_git_path(tmp_path, monkeypatch):
+    # Source roots that do not exist locally leave keys like BobCrm.Api/Program.cs.
+    api, app = _two_project_reports(tmp_path)
+    monkeypatch.chdir(tmp_path)
+    merged = parse_coverage.merge_reports(parse_coverage.parse_report(r, ["*"], []) for r in (api, app))
+
+    assert parse_coverage._match_report_file(merged, "src/BobCrm.Api/Program.cs") == "BobCrm.Api/Program.cs"
+    assert parse_coverage._match_report_file(merged, "src/BobCrm.App/Program.cs") == "BobCrm.App/Program.cs"
+    assert parse_coverage._match_report_file(merged, "src/Other/Program.cs") is None
+    assert [r["file"] for r in parse_coverage.changed_lines_coverage(merged, CHANGED)] == [
+        "src/BobCrm.Api/Program.cs", "src/BobCrm.App/Program.cs",
+    ]
+
+
+def test_changed_lines_on_checked_in_report(in_repo_root):
+    merged = parse_coverage.merge_reports([parse_coverage.parse_report(COVERLET_REPORT, ["*"], [])])
+
+    assert parse_coverage._match_report_file(merged, "src/BobCrm.Api/Program.cs") == "src/BobCrm.Api/Program.cs"
+    rows = parse_coverage.changed_lines_coverage(merged, {"src/BobCrm.Api/Program.cs": {575, 576}})
+    assert rows == [{"file": "src/BobCrm.Api/Program.cs", "lines": 2, "covered": 0, "uncovered": [575, 576]}]
@@ -0,0 +1,54 @@
+import http.client
+import json
+
+from utils.tracing import SpanCollector
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+
+
+def _export(*names: str) -> bytes:
+    spans = [
+        {"traceId": TRACE_ID, "spanId": f"{i:016x}", "name": name, "startTimeUnixNano": "1000000", "endTimeUnixNano": "3000000"}
+        for i, name in enumerate(names, start=1)
+    ]
+    return json.dumps({"resourceSpans": [{
+        "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": "BobCrm.Api"}}]},
+        "scopeSpans": [{"scope": {"name": "test"}, "spans": spans}],
+    }]}).encode("utf-8")
+
+
+def _post(collector: SpanCollector, body, headers: dict, chunked: bool = False) -> int:
+    host, port = collector._server.server_address[:2]
+    conn = http.client.HTTPConnection(host, port, timeout=5)
+    try:
+        conn.request("POST", "/v1/traces", body=body, headers=headers, encode_chunked=chunked)
+        return conn.getresponse().status
+    finally:
+        conn.close()
+
+
+def test_collector_accepts_chunked_export():
+    collector = SpanCollector(port=0).start()
+    try:
+        body = _export("GET /api/customers", "SELECT customers")
+        # Split mid-document so the body only parses once every chunk is joined.
+        chunks = iter([body[:17], body[17:90], body[90:]])
+
+        status = _post(collector, chunks, {"Content-Type": "application/json"}, chunked=True)
+
+        assert status == 200
+        assert collector.received == 2
+        assert [s["name"] for s in collector.spans_for([TRACE_ID])] == ["GET /api/customers", "SELECT customers"]
+    finally:
+        collector.stop()
+
+
+def test_collector_accepts_content_length_export():
+    collector = SpanCollector(port=0).start()
+    try:
+        status = _post(collector, _export("GET /api/customers"), {"Content-Type": "application/json"})
+
+        assert status == 200
+        assert collector.received == 1
+    finally:
+        collector.stop()